@@ -0,0 +1,190 @@
+"""Benchmarks exporting a games analysis to the database - the previous export (a new
+connection, `to_sql` and commit per move into a full width `bench_move_data` table)
+against the buffered export (one `executemany` of compact `moves` rows per game in a
+single transaction).
+
+Usage:
+    python -m benchmarks.bench_export [num_games] [moves_per_game]
+
+SQLite always runs against a temporary database. MySQL runs as well when `DB_TYPE`
+is `mysql` in `.env`; its benchmark rows are written to the configured database under
+the username `bench_export` with negative game numbers, so they never share a key with
+a stored game, and deleted afterwards. The buffered export borrows its connection
+from a `Database` pool.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import mysql.connector
+import pandas as pd
+from sqlalchemy import create_engine
+
+from betterchess.core.game import Game
+from betterchess.core.records import GameRecord, MoveRecord
+from betterchess.utils.database import Database
+from betterchess.utils.handlers import EnvHandler
+
+BENCH_USERNAME = "bench_export"
+BENCH_FIRST_GAME = -1_000_000
+BASELINE_MOVE_TABLE = "bench_move_data"
+SQL_DIR = os.path.join(os.path.dirname(__file__), "../betterchess/utils/sql")
+
+
+def move_values(game_num: int, move_num: int) -> dict:
+    """Column values of a typical `move_data` row."""
+    return {
+        "Username": BENCH_USERNAME,
+        "Game_date": datetime(2020, 10, 10),
+        "Engine_depth": 8,
+        "Game_number": game_num,
+        "Move_number": move_num,
+        "Move": "e2e4",
+        "Move_eval": 30,
+        "Best_move": "d2d4",
+        "Best_move_eval": 35,
+        "Move_eval_diff": -5,
+        "Move_accuracy": 98.5,
+        "Move_type": 1,
+        "Piece": "pawn",
+        "Move_colour": "white",
+        "Castling_type": None,
+        "White_castle_num": 0,
+        "Black_castle_num": 0,
+        "Move_time": 1.5,
+    }
+
+
+def move_row(game_num: int, move_num: int) -> pd.DataFrame:
+    """Creates a one row move dataframe as the previous `Move.create_move_df` did."""
+    return pd.DataFrame(move_values(game_num, move_num), index=[0])
+
+
+def game_row(game_num: int) -> pd.DataFrame:
+    """Creates a minimal game dataframe."""
+    return pd.DataFrame({"Username": BENCH_USERNAME, "Game_number": game_num}, index=[0])
+
+
+def game_record(game_num: int) -> GameRecord:
+    """Creates a minimal game record."""
+    values = dict.fromkeys(GameRecord._fields)
+    values.update(Username=BENCH_USERNAME, Game_number=game_num)
+    return GameRecord(**values)
+
+
+def per_move_export(connect, to_sql_con, num_games: int, moves_per_game: int) -> None:
+    """Previous export: connects, appends and commits once per move and per game."""
+    for game_num in range(BENCH_FIRST_GAME, BENCH_FIRST_GAME + num_games):
+        for move_num in range(moves_per_game):
+            conn = connect()
+            move_row(game_num, move_num).to_sql(
+                BASELINE_MOVE_TABLE, to_sql_con(conn), if_exists="append", index=False
+            )
+            conn.commit()
+            conn.close()
+        conn = connect()
+        game_row(game_num).to_sql(
+            "game_data", to_sql_con(conn), if_exists="append", index=False
+        )
+        conn.commit()
+        conn.close()
+
+
+def buffered_export(database: Database, num_games: int, moves_per_game: int) -> None:
+    """Buffered export: one transaction per game via `Game.export_game_data`, numbered
+    after the per move exports games so they do not collide with its keys."""
+    game = Game(None, None, None, None, {})
+    checkpoint = MagicMock()
+    first_game = BENCH_FIRST_GAME + num_games
+    for game_num in range(first_game, first_game + num_games):
+        move_rows = [
+            MoveRecord(**move_values(game_num, move_num))
+            for move_num in range(moves_per_game)
+        ]
+        game.export_game_data(game_record(game_num), move_rows, database, checkpoint)
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def report(db_type: str, num_rows: int, per_move: float, buffered: float) -> None:
+    print(
+        f"{db_type:<7}| per move: {num_rows / per_move:>10,.0f} rows/s"
+        f" | buffered: {num_rows / buffered:>10,.0f} rows/s"
+        f" | speedup: {per_move / buffered:.1f}x"
+    )
+
+
+def bench_sqlite(num_games: int, moves_per_game: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_database = os.path.join(tmp_dir, "bench.db")
+        conn = sqlite3.connect(path_database)
+        for table in ("move", "game"):
+            with open(os.path.join(SQL_DIR, f"sqlite/create_{table}_table.sql")) as f:
+                conn.execute(f.read())
+        conn.close()
+        database = Database(MagicMock(db_type="sqlite"), path_database)
+        per_move = timed(
+            per_move_export,
+            lambda: sqlite3.connect(path_database),
+            lambda conn: conn,
+            num_games,
+            moves_per_game,
+        )
+        buffered = timed(buffered_export, database, num_games, moves_per_game)
+        database.close()
+    report("sqlite", num_games * (moves_per_game + 1), per_move, buffered)
+
+
+def bench_mysql(env_handler: EnvHandler, num_games: int, moves_per_game: int) -> None:
+    def connect():
+        return mysql.connector.connect(
+            host=env_handler.mysql_host,
+            user=env_handler.mysql_user,
+            database=env_handler.mysql_db,
+            password=env_handler.mysql_password,
+        )
+
+    def to_sql_con(_):
+        return create_engine(
+            f"{env_handler.mysql_driver}://{env_handler.mysql_user}:{env_handler.mysql_password}@{env_handler.mysql_host}/{env_handler.mysql_db}"
+        )
+
+    def cleandown():
+        conn = connect()
+        curs = conn.cursor()
+        curs.execute(f"DROP TABLE IF EXISTS {BASELINE_MOVE_TABLE}")
+        curs.execute(
+            "DELETE FROM moves WHERE game_id IN (SELECT Game_number FROM game_data WHERE Username = %s)",
+            (BENCH_USERNAME,),
+        )
+        curs.execute("DELETE FROM game_data WHERE Username = %s", (BENCH_USERNAME,))
+        conn.commit()
+        conn.close()
+
+    database = Database(env_handler, "")
+    try:
+        per_move = timed(
+            per_move_export, connect, to_sql_con, num_games, moves_per_game
+        )
+        buffered = timed(buffered_export, database, num_games, moves_per_game)
+    finally:
+        database.close()
+        cleandown()
+    report("mysql", num_games * (moves_per_game + 1), per_move, buffered)
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    moves_per_game = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    bench_sqlite(num_games, moves_per_game)
+    env_handler = EnvHandler()
+    if env_handler.db_type == "mysql":
+        bench_mysql(env_handler, num_games, moves_per_game)
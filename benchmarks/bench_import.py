@@ -0,0 +1,63 @@
+"""Benchmarks importing a gzip compressed pgn file with `PgnImporter` - time and peak
+python memory for increasing file sizes, which should stay flat.
+
+Usage:
+    python -m benchmarks.bench_import [num_games ...]
+"""
+import gzip
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+from betterchess.utils.database import Database
+from betterchess.utils.pgn_import import PgnImporter
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), "../betterchess/utils/sql")
+MOVETEXT = " ".join(
+    f"{num}. e4 {{[%clk 0:09:59.2]}} {num}... e5 {{[%clk 0:09:56.8]}}"
+    for num in range(1, 41)
+)
+
+
+def write_pgn(path: str, num_games: int) -> None:
+    """Writes a gzip compressed pgn file of 80 ply games."""
+    with gzip.open(path, "wt") as pgn_file:
+        for game_num in range(num_games):
+            pgn_file.write(
+                f'[Event "Live Chess"]\n[Site "Chess.com"]\n[Date "2021.02.{game_num % 28 + 1:02}"]\n'
+                f'[White "bench_import"]\n[Black "opponent{game_num}"]\n[Result "1-0"]\n\n'
+                f"{MOVETEXT} 1-0\n\n"
+            )
+
+
+def run_import(tmp_dir: str, path_pgn: str) -> tuple:
+    """Imports the file into a new sqlite database, returning seconds and peak bytes."""
+    path_db = os.path.join(tmp_dir, f"{time.perf_counter_ns()}.db")
+    database = Database(MagicMock(db_type="sqlite"), path_db)
+    with open(f"{SQL_DIR}/sqlite/create_pgn_table.sql") as sql:
+        with database.connection() as conn:
+            conn.execute(sql.read())
+    tracemalloc.start()
+    start = time.perf_counter()
+    num_games = PgnImporter(database).import_file(path_pgn, "bench_import")
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    database.close()
+    return num_games, seconds, peak
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_games in sizes:
+            path_pgn = os.path.join(tmp_dir, f"{num_games}.pgn.gz")
+            write_pgn(path_pgn, num_games)
+            imported, seconds, peak = run_import(tmp_dir, path_pgn)
+            print(
+                f"{imported:>9,} games | {os.path.getsize(path_pgn) / 2**20:>7.1f} MiB gz"
+                f" | {seconds:>6.2f} s | peak {peak / 2**20:>6.2f} MiB"
+            )
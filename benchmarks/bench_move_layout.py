@@ -0,0 +1,119 @@
+"""Benchmarks the storage of analysed moves in sqlite - the previous full width
+`move_data` table against the compact `moves` table, read back through the
+`move_data` view.
+
+Usage:
+    python -m benchmarks.bench_move_layout [num_games] [moves_per_game]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import chess
+
+from betterchess.core.records import MoveRecord
+from betterchess.utils.move_codes import compact_move
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), "../betterchess/utils/sql/sqlite")
+WIDE_TABLE = """CREATE TABLE move_data (
+    Username TEXT, Game_date TEXT, Engine_depth INT, Game_number INT,
+    Move_number INT, Move TEXT, Move_eval INT, Best_move TEXT, Best_move_eval INT,
+    Move_eval_diff INT, Move_accuracy REAL, Move_type TEXT, Piece TEXT,
+    Move_colour TEXT, Castling_type TEXT, White_castle_num INT,
+    Black_castle_num INT, Move_time REAL,
+    PRIMARY KEY (Username, Game_number, Move_number)
+)"""
+SCAN_QUERY = "SELECT Move_type, AVG(Move_accuracy), COUNT(*) FROM move_data WHERE Username = 'Ainceer' GROUP BY Move_type"
+
+
+def random_moves(rng: random.Random, num_games: int, moves_per_game: int) -> list:
+    """Creates the move records of random games."""
+    squares = [chess.square_name(square) for square in chess.SQUARES]
+    pieces = ["pawn", "knight", "bishop", "rook", "queen", "king"]
+    records = []
+    for game_num in range(1, num_games + 1):
+        game_date = str(datetime(2022, 1, 1) + timedelta(hours=game_num))
+        for move_num in range(moves_per_game):
+            records.append(
+                MoveRecord(
+                    Username="Ainceer",
+                    Game_date=game_date,
+                    Engine_depth=8,
+                    Game_number=game_num,
+                    Move_number=move_num,
+                    Move="".join(rng.sample(squares, 2)),
+                    Move_eval=rng.randint(-900, 900),
+                    Best_move="".join(rng.sample(squares, 2)),
+                    Best_move_eval=rng.randint(-900, 900),
+                    Move_eval_diff=rng.randint(-300, 0),
+                    Move_accuracy=rng.uniform(0, 100),
+                    Move_type=str(rng.randint(-2, 2)),
+                    Piece=rng.choice(pieces),
+                    Move_colour="white" if move_num % 2 == 0 else "black",
+                    Castling_type=None,
+                    White_castle_num=0,
+                    Black_castle_num=0,
+                    Move_time=rng.uniform(0, 30),
+                )
+            )
+    return records
+
+
+def read_sql_file(name: str) -> str:
+    with open(os.path.join(SQL_DIR, f"{name}.sql")) as sql_file:
+        return sql_file.read()
+
+
+def build(path_database: str, records: list, compact: bool) -> None:
+    """Creates a database holding the moves in one of the two layouts."""
+    conn = sqlite3.connect(path_database)
+    if compact:
+        for name in ("create_game_table", "create_move_table", "create_move_view"):
+            conn.execute(read_sql_file(name))
+        games = {(record.Game_number, record.Game_date) for record in records}
+        conn.executemany(
+            "INSERT INTO game_data (Username, Game_number, Game_date) VALUES ('Ainceer', ?, ?)",
+            games,
+        )
+        rows = [tuple(compact_move(record)) for record in records]
+    else:
+        conn.execute(WIDE_TABLE)
+        rows = [tuple(record) for record in records]
+    conn.executemany(
+        f"INSERT INTO {'moves' if compact else 'move_data'} VALUES ({', '.join('?' * len(rows[0]))})",
+        rows,
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def scan(path_database: str, repeats: int = 5) -> float:
+    """Best time of a per user aggregate over every move."""
+    conn = sqlite3.connect(path_database)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        conn.execute(SCAN_QUERY).fetchall()
+        best = min(best, time.perf_counter() - start)
+    conn.close()
+    return best
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    moves_per_game = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    records = random_moves(random.Random(0), num_games, moves_per_game)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, compact in (("wide", False), ("compact", True)):
+            path_database = os.path.join(tmp_dir, f"{label}.db")
+            build(path_database, records, compact)
+            num_bytes = os.path.getsize(path_database)
+            print(
+                f"{label:<8}| {num_bytes / len(records):>6.1f} bytes/move"
+                f" | scan: {scan(path_database) * 1000:>7.1f} ms"
+            )
@@ -0,0 +1,52 @@
+"""Benchmarks building the `move_data` rows for analysed plies - one pandas DataFrame per
+ply (concatenated and converted for the database writer) against one `MoveRecord` per
+ply.
+
+Usage:
+    python -m benchmarks.bench_records [num_plies]
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.bench_export import move_values
+from betterchess.core.records import MoveRecord
+from betterchess.utils.database import Database
+
+
+def dataframe_rows(num_plies: int) -> list:
+    """Previous rows: a DataFrame per ply, concatenated per game for `executemany`."""
+    move_rows = [pd.DataFrame(move_values(0, ply), index=[0]) for ply in range(num_plies)]
+    return Database.df_rows(pd.concat(move_rows, ignore_index=True))
+
+
+def record_rows(num_plies: int) -> list:
+    """Current rows: a `MoveRecord` per ply passed straight to `executemany`."""
+    move_rows = [MoveRecord(**move_values(0, ply)) for ply in range(num_plies)]
+    return [Database.record_values(record) for record in move_rows]
+
+
+def measure(func, num_plies: int) -> tuple:
+    """Returns the seconds taken and peak bytes allocated building the rows - timed
+    without tracing as tracemalloc slows allocation heavy code down considerably.
+    """
+    start = time.perf_counter()
+    func(num_plies)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func(num_plies)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+if __name__ == "__main__":
+    num_plies = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    for name, func in (("dataframe", dataframe_rows), ("record", record_rows)):
+        seconds, peak = measure(func, num_plies)
+        print(
+            f"{name:<10}| {num_plies:,} plies | {seconds * 1000:>8.1f} ms"
+            f" | peak {peak / 2**20:>7.2f} MiB"
+        )
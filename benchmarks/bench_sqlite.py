@@ -0,0 +1,87 @@
+"""Benchmarks several processes exporting analysed games to one sqlite database - the
+default sqlite settings (rollback journal, full sync) against `SQLITE_PRAGMAS`.
+
+Usage:
+    python -m benchmarks.bench_sqlite [num_processes] [games_per_process] [moves_per_game]
+
+Each process exports its games through `Game.export_game_data`, one transaction per
+game, to a temporary database. Failed processes (e.g. "database is locked") are
+reported.
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+from betterchess.core.game import Game
+from betterchess.core.records import MoveRecord
+from betterchess.utils import database as database_module
+from betterchess.utils.checkpoint import Checkpoint
+from betterchess.utils.database import Database
+
+from benchmarks.bench_export import game_record, move_values
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), "../betterchess/utils/sql/sqlite")
+# sqlite3's own defaults - only its 5 second busy timeout is set.
+DEFAULT_PRAGMAS = {"busy_timeout": 5000}
+
+
+def export_games(
+    path_database: str, pragmas: dict, first_game: int, num_games: int, moves: int
+) -> None:
+    """Exports `num_games` games from a process with its own connection pool."""
+    database_module.SQLITE_PRAGMAS = pragmas
+    database = Database(MagicMock(db_type="sqlite"), path_database, 1)
+    checkpoint = Checkpoint(database)
+    game = Game(None, None, None, None, {})
+    for game_num in range(first_game, first_game + num_games):
+        move_rows = [
+            MoveRecord(**move_values(game_num, move_num)) for move_num in range(moves)
+        ]
+        game.export_game_data(game_record(game_num), move_rows, database, checkpoint)
+    database.close()
+
+
+def bench(pragmas: dict, num_processes: int, num_games: int, moves: int) -> tuple:
+    """Times the processes exporting to a new database with the given settings."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_database = os.path.join(tmp_dir, "bench.db")
+        database_module.SQLITE_PRAGMAS = pragmas
+        database = Database(MagicMock(db_type="sqlite"), path_database, 1)
+        with database.connection() as conn:
+            for table in ("move", "game", "checkpoint"):
+                with open(os.path.join(SQL_DIR, f"create_{table}_table.sql")) as sql:
+                    conn.execute(sql.read())
+        database.close()
+        processes = [
+            multiprocessing.Process(
+                target=export_games,
+                args=(path_database, pragmas, num * num_games, num_games, moves),
+            )
+            for num in range(num_processes)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+    failed = sum(process.exitcode != 0 for process in processes)
+    return elapsed, failed
+
+
+if __name__ == "__main__":
+    num_processes = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    num_games = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    moves = int(sys.argv[3]) if len(sys.argv) > 3 else 80
+    tuned_pragmas = dict(database_module.SQLITE_PRAGMAS)
+    num_rows = num_processes * num_games * (moves + 1)
+    for name, pragmas in (("default", DEFAULT_PRAGMAS), ("tuned", tuned_pragmas)):
+        elapsed, failed = bench(pragmas, num_processes, num_games, moves)
+        print(
+            f"{name:<8}| {num_processes} processes | {num_rows / elapsed:>10,.0f} rows/s"
+            f" | {num_processes * num_games / elapsed:>8,.0f} games/s"
+            f" | failed processes: {failed}"
+        )
@@ -1,21 +1,24 @@
 """_summary_
 """
-import sqlite3
+import io
 import time
 from dataclasses import dataclass
 from datetime import date, datetime
+from typing import Optional
 
 import chess
 import chess.engine
 import chess.pgn
-import mysql.connector
 import numpy as np
-import pandas as pd
-from sqlalchemy import create_engine
 
 from betterchess.core.headers import Headers
 from betterchess.core.move import Move
+from betterchess.core.records import GameRecord
+from betterchess.core.stats import BLACK, WHITE, GameStats
+from betterchess.utils.checkpoint import Checkpoint
+from betterchess.utils.database import Database
 from betterchess.utils.handlers import EnvHandler, FileHandler, InputHandler, RunHandler
+from betterchess.utils.move_codes import compact_move
 from betterchess.utils.progress import Progress
 
 
@@ -32,126 +35,85 @@ class Game:
     def run_game_analysis(self) -> None:
         """Sets up a game and runs the analysis for a game."""
         prepare = Prepare()
-        log_dt = prepare.all_games(self.file_handler.path_userlogfile)
         self.game_metadata = prepare.current_game_analysis(
             self.input_handler,
             self.file_handler,
             self.run_handler,
             self.iter_metadata,
         )
-        if (
-            self.game_metadata["game_datetime"] >= log_dt
-            and self.game_metadata["game_datetime"] >= self.input_handler.start_date
+        start_time = time.perf_counter()
+        self.run_handler.logger.info(
+            f'| {self.input_handler.username} | {self.game_metadata["game_datetime"]} | {self.iter_metadata["game_num"]}'
+        )
+        for move_num, move in enumerate(
+            self.game_metadata["chess_game"].mainline_moves()
         ):
-            start_time = time.perf_counter()
-            self.run_handler.logger.info(
-                f'| {self.input_handler.username} | {self.game_metadata["game_datetime"]} | {self.iter_metadata["game_num"]}'
-            )
-            for move_num, move in enumerate(
-                self.game_metadata["chess_game"].mainline_moves()
-            ):
-                move_metadata = {"move": move, "move_num": move_num}
-                chess_move = Move(
-                    self.input_handler,
-                    self.file_handler,
-                    self.run_handler,
-                    self.env_handler,
-                    self.iter_metadata,
-                    self.game_metadata,
-                    move_metadata,
-                )
-                chess_move.analyse()
-                del chess_move
-            try:
-                total_moves = move_num
-            except UnboundLocalError:
-                total_moves = 0
-            self.analyse_game(
-                self.game_metadata["game_lists_dict"]["move_type_list"],
-                total_moves,
+            move_metadata = {"move": move, "move_num": move_num}
+            chess_move = Move(
+                self.input_handler,
+                self.file_handler,
+                self.run_handler,
                 self.env_handler,
+                self.iter_metadata,
+                self.game_metadata,
+                move_metadata,
             )
-            end_time = time.perf_counter()
-            progress = Progress()
-            progress.bar(
-                self.iter_metadata["game_num"],
-                self.iter_metadata["tot_games"],
-                start_time,
-                end_time,
-            )
+            chess_move.analyse()
+            del chess_move
+        try:
+            total_moves = move_num
+        except UnboundLocalError:
+            total_moves = 0
+        self.analyse_game(total_moves)
+        end_time = time.perf_counter()
+        progress = Progress()
+        progress.bar(
+            self.iter_metadata["game_idx"],
+            self.iter_metadata["tot_games"],
+            start_time,
+            end_time,
+        )
 
-    def analyse_game(
-        self, move_type_list: dict, total_moves: int, env_handler: EnvHandler
-    ) -> None:
+    def analyse_game(self, total_moves: int) -> None:
         """Consolidates game analysis data and exports it to db.
 
         Args:
-            move_type_list (dict): List of move types e.g. no. blunders.
             total_moves (int): Total number of moves in a game.
         """
-        move_dict = self.sum_move_types(move_type_list)
-        game_df = self.user_game_data(
-            move_dict,
+        game_stats = GameStats.from_game_lists(
+            self.game_metadata["game_lists_dict"], total_moves
+        )
+        game_record = self.user_game_data(
+            game_stats,
             self.game_metadata["game_datetime"],
-            self.game_metadata["game_lists_dict"]["gm_mv_ac"],
-            self.game_metadata["game_lists_dict"]["w_castle_num"],
-            self.game_metadata["game_lists_dict"]["b_castle_num"],
             total_moves,
             self.game_metadata["headers"],
             self.input_handler.username,
             self.input_handler.edepth,
             self.iter_metadata["game_num"],
         )
-        self.export_game_data(game_df, env_handler)
-
-    def sum_move_types(self, move_type_list: list) -> dict:
-        """Calculated the number of a specific type of moves for black and
-        white in a chess game.
-
-        Args:
-            move_type_list (list): List of move types.
-
-        Returns:
-            dict: Dictionary of moves type lists.
-        """
-        return {
-            "Num_w_best": move_type_list[::2].count(2),
-            "Num_b_best": move_type_list[1::2].count(2),
-            "Num_w_excl": move_type_list[::2].count(1),
-            "Num_b_excl": move_type_list[1::2].count(1),
-            "Num_w_good": move_type_list[::2].count(0),
-            "Num_b_good": move_type_list[1::2].count(0),
-            "Num_w_inac": move_type_list[::2].count(-1),
-            "Num_b_inac": move_type_list[1::2].count(-1),
-            "Num_w_mist": move_type_list[::2].count(-2),
-            "Num_b_mist": move_type_list[1::2].count(-2),
-            "Num_w_blun": move_type_list[::2].count(-3),
-            "Num_b_blun": move_type_list[1::2].count(-3),
-            "Num_w_misw": move_type_list[::2].count(-4),
-            "Num_b_misw": move_type_list[1::2].count(-4),
-        }
+        self.export_game_data(
+            game_record,
+            self.game_metadata["move_rows"],
+            self.run_handler.database,
+            self.run_handler.checkpoint,
+        )
 
     def user_game_data(
         self,
-        move_dict: dict,
+        game_stats: GameStats,
         game_datetime: str,
-        game_move_acc: list,
-        w_castle_num: list,
-        b_castle_num: list,
         total_moves: int,
         headers: dict,
         username: str,
         edepth: int,
         game_num: int,
-    ) -> pd.DataFrame:
-        """Creates the game data dataframe.
+    ) -> GameRecord:
+        """Creates the game data record.
 
         Args:
-            move_dict (dict):  Dictionary of moves type lists.
+            game_stats (GameStats): Aggregates of the game.
             game_datetime (str): Datetime of the game.
-            game_move_acc (list): List of move accuracies.
-            w_castle_num (list): Point at which white castles.
-            b_castle_num (list): Point at which black castles.
             total_moves (int): Total number of moves.
             headers (dict): Game header dictionary.
             username (str): Username.
@@ -159,37 +121,22 @@ class Game:
             game_num (int): Game number of user.
 
         Returns:
-            pd.DataFrame: dataframe of game data.
+            GameRecord: Row of `game_data`.
         """
 
         self.time_of_day = self.game_time_of_day(game_datetime)
         self.day_of_week = self.game_day_of_week(game_datetime)
-        self.game_pgn = self.get_curr_game_pgn(self.file_handler.path_temp)
-
-        if username == headers["White_player"]:
-            self.collect_white_player_data(
-                move_dict,
-                game_move_acc,
-                w_castle_num,
-                b_castle_num,
-                total_moves,
-                headers,
-            )
-        elif username == headers["Black_player"]:
-            self.collect_black_player_data(
-                move_dict,
-                game_move_acc,
-                w_castle_num,
-                b_castle_num,
-                total_moves,
-                headers,
-            )
 
-        return self.create_game_data_df(
+        if headers["User_Colour"] == "White":
+            self.collect_white_player_data(game_stats, headers)
+        else:
+            self.collect_black_player_data(game_stats, headers)
+
+        return self.create_game_record(
             game_datetime, total_moves, headers, username, edepth, game_num
         )
 
-    def create_game_data_df(
+    def create_game_record(
         self,
         game_datetime: str,
         total_moves: int,
@@ -197,159 +144,177 @@ class Game:
         username: str,
         edepth: int,
         game_num: int,
-    ):
-        return pd.DataFrame(
-            {
-                "Username": username,
-                "Game_date": game_datetime,
-                "Game_time_of_day": self.time_of_day,
-                "Game_weekday": self.day_of_week,
-                "Engine_depth": edepth,
-                "Game_number": game_num,
-                "Game_type": headers["Time_control"],
-                "White_player": headers["White_player"],
-                "White_rating": headers["White_rating"],
-                "Black_player": headers["Black_player"],
-                "Black_rating": headers["Black_rating"],
-                "User_colour": headers["User_Colour"],
-                "User_rating": headers["User_rating"],
-                "Opponent_rating": headers["Opponent_rating"],
-                "User_win_percent": self.user_win_percent,
-                "Opp_win_percent": self.opp_win_percent,
-                "User_winner": headers["User_winner"],
-                "Opening_name": headers["Opening_name"],
-                "Opening_class": headers["Opening_class"],
-                "Termination": headers["Termination"],
-                "End_type": headers["Win_draw_loss"],
-                "Number_of_moves": total_moves,
-                "Accuracy": self.game_acc,
-                "Opening_accuracy": self.opn_acc,
-                "Mid_accuracy": self.mid_acc,
-                "End_accuracy": self.end_acc,
-                "No_best": self.num_best_mv,
-                "No_excellent": self.num_excl_mv,
-                "No_good": self.num_good_mv,
-                "No_inaccuracy": self.num_inac_mv,
-                "No_mistake": self.num_mist_mv,
-                "No_blunder": self.num_blun_mv,
-                "No_missed_win": self.num_misw_mv,
-                "Improvement": self.sec_improve,
-                "User_castle_num": self.user_castle_mv,
-                "Opp_castle_num": self.opp_castle_mv,
-                "User_castled": self.user_castled,
-                "Opp_castled": self.opp_castled,
-                "User_castle_phase": self.user_castle_phase,
-                "Opp_castle_phase": self.opp_castle_phase,
-                "Game_pgn": self.game_pgn,
-            },
-            index=[0],
+    ) -> GameRecord:
+        """Creates the game record.
+
+        Returns:
+            GameRecord: Row of `game_data`.
+        """
+        return GameRecord(
+            Username=username,
+            Game_date=game_datetime,
+            Game_time_of_day=self.time_of_day,
+            Game_weekday=self.day_of_week,
+            Engine_depth=edepth,
+            Game_number=game_num,
+            Game_type=headers["Time_control"],
+            White_player=headers["White_player"],
+            White_rating=headers["White_rating"],
+            Black_player=headers["Black_player"],
+            Black_rating=headers["Black_rating"],
+            User_colour=headers["User_Colour"],
+            User_rating=headers["User_rating"],
+            Opponent_rating=headers["Opponent_rating"],
+            User_win_percent=self.user_win_percent,
+            Opp_win_percent=self.opp_win_percent,
+            User_winner=headers["User_winner"],
+            Opening_name=headers["Opening_name"],
+            Opening_class=headers["Opening_class"],
+            Termination=headers["Termination"],
+            End_type=headers["Win_draw_loss"],
+            Number_of_moves=total_moves,
+            Accuracy=self.game_acc,
+            Opening_accuracy=self.opn_acc,
+            Mid_accuracy=self.mid_acc,
+            End_accuracy=self.end_acc,
+            No_best=self.num_best_mv,
+            No_excellent=self.num_excl_mv,
+            No_good=self.num_good_mv,
+            No_inaccuracy=self.num_inac_mv,
+            No_mistake=self.num_mist_mv,
+            No_blunder=self.num_blun_mv,
+            No_missed_win=self.num_misw_mv,
+            Improvement=self.sec_improve,
+            User_castle_num=self.user_castle_mv,
+            Opp_castle_num=self.opp_castle_mv,
+            User_castled=self.user_castled,
+            Opp_castled=self.opp_castled,
+            User_castle_phase=self.user_castle_phase,
+            Opp_castle_phase=self.opp_castle_phase,
         )
 
     def collect_white_player_data(
-        self,
-        move_dict: dict,
-        game_move_acc: list,
-        w_castle_num: list,
-        b_castle_num: list,
-        total_moves: int,
-        headers: dict,
-    ):
-        self.game_acc = self.game_w_acc(game_move_acc)
-        self.opn_acc = self.op_w_acc(game_move_acc)
-        self.mid_acc = self.mid_w_acc(game_move_acc)
-        self.end_acc = self.end_w_acc(game_move_acc)
-        self.num_best_mv = move_dict["Num_w_best"]
-        self.num_excl_mv = move_dict["Num_w_excl"]
-        self.num_good_mv = move_dict["Num_w_good"]
-        self.num_inac_mv = move_dict["Num_w_inac"]
-        self.num_mist_mv = move_dict["Num_w_mist"]
-        self.num_blun_mv = move_dict["Num_w_blun"]
-        self.num_misw_mv = move_dict["Num_w_misw"]
-        self.sec_improve = self.w_sec_imp(self.opn_acc, self.mid_acc, self.end_acc)
-        self.user_castle_mv = self.white_castle_move_num(w_castle_num)
-        self.opp_castle_mv = self.black_castle_move_num(b_castle_num)
-        self.user_castled = self.has_white_castled(w_castle_num)
-        self.opp_castled = self.has_black_castled(b_castle_num)
-        self.user_castle_phase = self.white_castle_phase(w_castle_num, total_moves)
-        self.opp_castle_phase = self.black_castle_phase(b_castle_num, total_moves)
-        self.user_win_percent = self.get_predicted_win_percentage(
-            headers["White_rating"], headers["Black_rating"]
-        )
-        self.opp_win_percent = self.get_predicted_win_percentage(
-            headers["Black_rating"], headers["White_rating"]
+        self, game_stats: GameStats, headers: dict
+    ) -> None:
+        """Collects the game aggregates when the user played white.
+
+        Args:
+            game_stats (GameStats): Aggregates of the game.
+            headers (dict): Game header dictionary.
+        """
+        self.collect_player_data(
+            game_stats.player_summary(WHITE),
+            headers["White_rating"],
+            headers["Black_rating"],
         )
 
     def collect_black_player_data(
-        self,
-        move_dict: dict,
-        game_move_acc: list,
-        w_castle_num: list,
-        b_castle_num: list,
-        total_moves: int,
-        headers: dict,
-    ):
-        self.game_acc = self.game_b_acc(game_move_acc)
-        self.opn_acc = self.op_b_acc(game_move_acc)
-        self.mid_acc = self.mid_b_acc(game_move_acc)
-        self.end_acc = self.end_b_acc(game_move_acc)
-        self.num_best_mv = move_dict["Num_b_best"]
-        self.num_excl_mv = move_dict["Num_b_excl"]
-        self.num_good_mv = move_dict["Num_b_good"]
-        self.num_inac_mv = move_dict["Num_b_inac"]
-        self.num_mist_mv = move_dict["Num_b_mist"]
-        self.num_blun_mv = move_dict["Num_b_blun"]
-        self.num_misw_mv = move_dict["Num_b_misw"]
-        self.sec_improve = self.b_sec_imp(self.opn_acc, self.mid_acc, self.end_acc)
-        self.user_castle_mv = self.black_castle_move_num(b_castle_num)
-        self.opp_castle_mv = self.white_castle_move_num(w_castle_num)
-        self.user_castled = self.has_black_castled(b_castle_num)
-        self.opp_castled = self.has_white_castled(w_castle_num)
-        self.user_castle_phase = self.black_castle_phase(b_castle_num, total_moves)
-        self.opp_castle_phase = self.white_castle_phase(w_castle_num, total_moves)
+        self, game_stats: GameStats, headers: dict
+    ) -> None:
+        """Collects the game aggregates when the user played black.
+
+        Args:
+            game_stats (GameStats): Aggregates of the game.
+            headers (dict): Game header dictionary.
+        """
+        self.collect_player_data(
+            game_stats.player_summary(BLACK),
+            headers["Black_rating"],
+            headers["White_rating"],
+        )
+
+    def collect_player_data(
+        self, player_summary: dict, user_rating: int, opp_rating: int
+    ) -> None:
+        """Sets the users game aggregates.
+
+        Args:
+            player_summary (dict): Aggregates of the game for the user.
+            user_rating (int): Users rating.
+            opp_rating (int): Opponents rating.
+        """
+        self.game_acc = player_summary["accuracy"]
+        self.opn_acc = player_summary["opening_accuracy"]
+        self.mid_acc = player_summary["mid_accuracy"]
+        self.end_acc = player_summary["end_accuracy"]
+        (
+            self.num_best_mv,
+            self.num_excl_mv,
+            self.num_good_mv,
+            self.num_inac_mv,
+            self.num_mist_mv,
+            self.num_blun_mv,
+            self.num_misw_mv,
+        ) = player_summary["move_type_counts"]
+        self.sec_improve = player_summary["improvement"]
+        self.user_castle_mv = player_summary["castle_move"]
+        self.opp_castle_mv = player_summary["opp_castle_move"]
+        self.user_castled = player_summary["castled"]
+        self.opp_castled = player_summary["opp_castled"]
+        self.user_castle_phase = player_summary["castle_phase"]
+        self.opp_castle_phase = player_summary["opp_castle_phase"]
         self.user_win_percent = self.get_predicted_win_percentage(
-            headers["Black_rating"], headers["White_rating"]
+            user_rating, opp_rating
         )
         self.opp_win_percent = self.get_predicted_win_percentage(
-            headers["White_rating"], headers["Black_rating"]
+            opp_rating, user_rating
         )
 
-    def export_game_data(self, game_df: pd.DataFrame, env_handler: EnvHandler):
-        """Exports game data to database depending on `.env` parameter `DB_TYPE`.
+    def export_game_data(
+        self,
+        game_record: GameRecord,
+        move_rows: list,
+        database: Database,
+        checkpoint: Checkpoint,
+    ) -> None:
+        """Exports the games move data, game data and checkpoint to the database in a
+        single transaction - a game interrupted before the commit leaves no rows. The
+        moves are written to the compact `moves` table behind the `move_data` view.
+        Rows from an earlier analysis of the game, e.g. at a lower engine depth, are
+        replaced.
 
         Args:
-            game_df (pd.Dataframe): dataframe of game data
-        """
-        if env_handler.db_type == "mysql":
-            conn = mysql.connector.connect(
-                host=self.env_handler.mysql_host,
-                user=self.env_handler.mysql_user,
-                database=self.env_handler.mysql_db,
-                password=self.env_handler.mysql_password,
+            game_record (GameRecord): Row of game data.
+            move_rows (list): Move records of every move in the game.
+            database (Database): Pooled database connections.
+            checkpoint (Checkpoint): Analysis checkpoint.
+        """
+        placeholder = database.placeholder
+        with database.connection() as conn:
+            curs = conn.cursor()
+            curs.execute(
+                f"DELETE FROM moves WHERE game_id = {placeholder}",
+                (game_record.Game_number,),
             )
-            mysql_engine = create_engine(
-                f"{self.env_handler.mysql_driver}://{self.env_handler.mysql_user}:{self.env_handler.mysql_password}@{self.env_handler.mysql_host}/{self.env_handler.mysql_db}"
+            curs.execute(
+                f"DELETE FROM game_data WHERE Username = {placeholder} AND Game_number = {placeholder}",
+                (game_record.Username, game_record.Game_number),
             )
-            game_df.to_sql("game_data", mysql_engine, if_exists="append", index=False)
-            conn.commit()
-            conn.close()
-        elif env_handler.db_type == "sqlite":
-            conn = sqlite3.connect(
-                FileHandler(self.input_handler.username).path_database
+            curs.close()
+            if move_rows:
+                compact_rows = [compact_move(move_row) for move_row in move_rows]
+                database.insert_records(conn, "moves", compact_rows)
+            database.insert_records(conn, "game_data", [game_record])
+            checkpoint.finish(
+                conn,
+                game_record.Username,
+                game_record.Game_number,
+                game_record.Engine_depth,
             )
-            game_df.to_sql("game_data", conn, if_exists="append", index=False)
-            conn.commit()
-            conn.close()
 
     @staticmethod
-    def game_time_of_day(game_datetime: datetime) -> str:
+    def game_time_of_day(game_datetime: Optional[datetime]) -> Optional[str]:
         """Returns the time segment of the day.
 
         Args:
-            game_datetime (datetime): Datetime of the game.
+            game_datetime (Optional[datetime]): Datetime of the game.
 
         Returns:
-            str: Game time section e.g. Morning/Evening.
+            Optional[str]: Game time section e.g. Morning/Evening, None if the date
+                of the game is unknown.
         """
+        if game_datetime is None:
+            return None
         day_hour = int(date.strftime(game_datetime, "%H"))
         if day_hour <= 6:
             time_of_day = "Night"
@@ -362,15 +327,17 @@ class Game:
         return time_of_day
 
     @staticmethod
-    def game_day_of_week(game_datetime: datetime) -> str:
+    def game_day_of_week(game_datetime: Optional[datetime]) -> Optional[str]:
         """Returns the weekday which the game was played.
 
         Args:
-            game_datetime (datetime): Datetime of the game.
+            game_datetime (Optional[datetime]): Datetime of the game.
 
         Returns:
-            str: Day of the week.
+            Optional[str]: Day of the week, None if the date of the game is unknown.
         """
+        if game_datetime is None:
+            return None
         week_num_base = int(date.isoweekday(game_datetime))
         weekday_num = week_num_base - 1
         weekdays = [
@@ -385,287 +352,23 @@ class Game:
         return weekdays[weekday_num]
 
     @staticmethod
-    def game_w_acc(game_move_acc: list) -> float:
-        """game accuracy of white player (Out of 100).
-
-        Args:
-            game_move_acc (list): Game accuracy list.
-
-        Returns:
-            float: Game accuracy of white player.
-        """
-        w_list = game_move_acc[::2]
-        list_len = len(game_move_acc[::2])
-        return 0 if list_len == 0 else round(sum(w_list) / list_len, 2)
-
-    @staticmethod
-    def game_b_acc(game_move_acc: list) -> float:
-        """game accuracy of black player (Out of 100).
-
-        Args:
-            game_move_acc (list): Game accuracy list.
-
-        Returns:
-            float: Game accuracy of black player.
-        """
-        b__list = game_move_acc[1::2]
-        list_len = len(game_move_acc[1::2])
-        return 0 if list_len == 0 else round(sum(b__list) / list_len, 2)
-
-    @staticmethod
-    def op_w_acc(game_move_acc: list) -> float:
-        """Opening game accuracy for white.
-
-        Args:
-            game_move_acc (list):  Game accuracy list.
-
-        Returns:
-            float: Opening accuracy of white player.
-        """
-        list_w = game_move_acc[::2]
-        op_list_w = np.array_split(list_w, 3)[0]
-        sep_len = len(op_list_w)
-        return 0 if sep_len == 0 else round(sum(op_list_w) / (sep_len), 2)
-
-    @staticmethod
-    def mid_w_acc(game_move_acc: list) -> float:
-        """Midgame accuracy for white.
-
-        Args:
-            game_move_acc (list):  Game accuracy list.
-
-        Returns:
-            float: Midgame accuracy of white player.
-        """
-        list_w = game_move_acc[::2]
-        mid_list_w = np.array_split(list_w, 3)[1]
-        sep_len = len(mid_list_w)
-        return 0 if sep_len == 0 else round(sum(mid_list_w) / (sep_len), 2)
-
-    @staticmethod
-    def end_w_acc(game_move_acc: list) -> float:
-        # sourcery skip: assign-if-exp, inline-immediately-returned-variable
-        """Endgame accuracy for white.
-
-        Args:
-            game_move_acc (list):  Game accuracy list.
-
-        Returns:
-            float: Endgame accuracy of white player.
-        """
-        list_w = game_move_acc[::2]
-        end_list_w = np.array_split(list_w, 3)[2]
-        sep_len = len(end_list_w)
-        if sep_len == 0:
-            return 0
-        else:
-            return round(sum(end_list_w) / (sep_len), 2)
-
-    @staticmethod
-    def op_b_acc(game_move_acc: list) -> float:
-        """Opening accuracy for black.
-
-        Args:
-            game_move_acc (list):  Game accuracy list.
-
-        Returns:
-            float: Opening accuracy of black player.
-        """
-        list_b = game_move_acc[1::2]
-        op_list_b = np.array_split(list_b, 3)[0]
-        sep_len = len(op_list_b)
-        return 0 if sep_len == 0 else round(sum(op_list_b) / (sep_len), 2)
-
-    @staticmethod
-    def mid_b_acc(game_move_acc: list) -> float:
-        """Midgame accuracy for black.
-
-        Args:
-            game_move_acc (list):  Game accuracy list.
-
-        Returns:
-            float: Midgame accuracy of black player.
-        """
-        list_b = game_move_acc[1::2]
-        mid_list_b = np.array_split(list_b, 3)[1]
-        sep_len = len(mid_list_b)
-        return 0 if sep_len == 0 else round(sum(mid_list_b) / (sep_len), 2)
-
-    @staticmethod
-    def end_b_acc(game_move_acc: list) -> float:
-        """Endgame accuracy for black.
-
-        Args:
-            game_move_acc (list):  Game accuracy list.
-
-        Returns:
-            float: Endgame accuracy of black player.
-        """
-        list_b = game_move_acc[1::2]
-        end_list_b = np.array_split(list_b, 3)[2]
-        sep_len = len(end_list_b)
-        return 0 if sep_len == 0 else round(sum(end_list_b) / (sep_len), 2)
-
-    @staticmethod
-    def w_sec_imp(ow: float, mw: float, ew: float) -> str:
-        """Whites area of lowest accuracy.
-
-        Args:
-            ow (float): Opening accuracy.
-            mw (float): Midgame accuracy.
-            ew (float): Endgame accuracy.
-
-        Returns:
-            str: Game section.
-        """
-        if ow < ew and ow < mw:
-            return "Opening"
-        elif mw < ow and mw < ew:
-            return "Midgame"
-        else:
-            return "Endgame"
-
-    @staticmethod
-    def b_sec_imp(ob: float, mb: float, eb: float) -> str:
-        """Black area of lowest accuracy
-
-        Args:
-            ow (float): Opening accuracy.
-            mw (float): Midgame accuracy.
-            ew (float): Endgame accuracy.
-
-        Returns:
-            str: Game section.
-        """
-        if ob < mb and ob < eb:
-            return "Opening"
-        elif mb < ob and mb < eb:
-            return "Midgame"
-        else:
-            return "Endgame"
-
-    @staticmethod
-    def white_castle_move_num(white_castle_num: list) -> int:
-        """Whites castling move
-
-        Args:
-            white_castle_num (int): Castling move.
-
-        Returns:
-            int: Move number of white that white castled.
-        """
-        return sum(white_castle_num)
-
-    @staticmethod
-    def black_castle_move_num(black_castle_num: list) -> int:
-        """Black castling move
-
-        Args:
-            black_castle_num (int): Castling move.
-
-        Returns:
-            int: Move number of black that black castled.
-        """
-        return sum(black_castle_num)
-
-    @staticmethod
-    def has_white_castled(white_castle_num: list) -> int:
-        """Checks to see if white has castled.
-
-        Args:
-            white_castle_num (list): Castling move list.
-
-        Returns:
-            int: 1 if castled 0 if not castled.
-        """
-        return 1 if sum(white_castle_num) > 0 else 0
-
-    @staticmethod
-    def has_black_castled(black_castle_num: list) -> int:
-        """Checks to see if black has castled.
-
-        Args:
-            black_castle_num (list): Castling move list.
-
-        Returns:
-            int: 1 if castled 0 if not castled.
-        """
-        return 1 if sum(black_castle_num) > 0 else 0
-
-    @staticmethod
-    def white_castle_phase(white_castle_num: list, total_moves: int) -> str:
-        """Game section which white castled.
-
-        Args:
-            white_castle_num (list):  Castling move list.
-            total_moves (int): Total number of moves
-
-        Returns:
-            str: Game section.
-        """
-        if total_moves == 0:
-            return "None"
-        if sum(white_castle_num) == 0:
-            return "None"
-        elif sum(white_castle_num) / (total_moves) < (1 / 3):
-            return "Opening"
-        elif sum(white_castle_num) / (total_moves) <= (2 / 3):
-            return "Midgame"
-        elif sum(white_castle_num) / (total_moves) <= 1:
-            return "Endgame"
-
-    @staticmethod
-    def black_castle_phase(black_castle_num: list, total_moves: int) -> str:
-        """Game section which black castled.
-
-        Args:
-            black_castle_num (list):  Castling move list.
-            total_moves (int): Total number of moves.
-
-        Returns:
-            str: Game section.
-        """
-        if total_moves == 0:
-            return "None"
-        if sum(black_castle_num) == 0:
-            return "None"
-        elif sum(black_castle_num) / (total_moves) < (1 / 3):
-            return "Opening"
-        elif sum(black_castle_num) / (total_moves) <= (2 / 3):
-            return "Midgame"
-        elif sum(black_castle_num) / (total_moves) <= 1:
-            return "Endgame"
-
-    @staticmethod
-    def get_predicted_win_percentage(player_1: int, player_2: int) -> float:
+    def get_predicted_win_percentage(
+        player_1: Optional[int], player_2: Optional[int]
+    ) -> Optional[float]:
         """Predicted win percentage of a user before the game has been played.
 
         Args:
-            player_1 (int): player 1.
-            player_2 (int): player 2.
+            player_1 (Optional[int]): player 1.
+            player_2 (Optional[int]): player 2.
 
         Returns:
-            float: Predicted win percentage.
+            Optional[float]: Predicted win percentage, None if a rating is unknown.
         """
+        if player_1 is None or player_2 is None:
+            return None
         exp_term = (player_2 - player_1) / 400
         return round((1 / (1 + 10**exp_term)) * 100, 2)
 
-    @staticmethod
-    def get_curr_game_pgn(path_temp: str) -> pd.DataFrame:
-        """Gets the current games pgn string for use in webapp.
-
-        Args:
-            game_num (int): Game number of the current game.
-            path_database (str): Path to database.
-            username (str): Username.
-
-        Returns:
-            (pd.DataFrame): Dataframe of the current game
-        """
-        with open(path_temp, "r") as pgn_game_file:
-            pgn_game_file = pgn_game_file.readlines()
-        return str(pgn_game_file)
-
 
 @dataclass
 class Prepare:
@@ -689,8 +392,9 @@ class Prepare:
         Returns:
             dict: _description_
         """
-        chess_game = self.init_game(file_handler.path_temp)
+        chess_game = self.init_game(iter_metadata["game_pgn"])
         board = self.init_board(chess_game)
+        move_times = self.init_move_times(chess_game)
         game_lists_dict = self.init_game_lists()
         game_headers = Headers(
             input_handler, file_handler, run_handler, iter_metadata, chess_game
@@ -701,20 +405,23 @@ class Prepare:
             "game_datetime": headers["Game_datetime"],
             "board": board,
             "chess_game": chess_game,
+            "move_times": move_times,
             "game_lists_dict": game_lists_dict,
+            "move_rows": [],
+            "pre_move_info": None,
+            "engine_game": run_handler.engine_session.game_key(input_handler.username),
         }
 
-    def init_game(self, path_temp: str) -> chess.pgn.Game:
-        """Initialzies the current temporary game.
+    def init_game(self, game_pgn: str) -> chess.pgn.Game:
+        """Initialzies the current game from its pgn string.
 
         Args:
-            path_temp (str): Path of the temporary pgn file.
+            game_pgn (str): pgn string of the current game.
 
         Returns:
             chess.pgn.Game: Current chess game.
         """
-        chess_game_pgn = open(path_temp)
-        return chess.pgn.read_game(chess_game_pgn)
+        return chess.pgn.read_game(io.StringIO(game_pgn))
 
     def init_board(self, chess_game: chess.pgn.Game) -> chess.Board:
         """Initialzies the current temporary games board.
@@ -727,72 +434,94 @@ class Prepare:
         """
         return chess_game.board()
 
-    def init_game_lists(self) -> dict:
-        """Empty Games lists for the current game.
-
-        Returns:
-            dict: Dictionary of empty game lists.
-        """
-        return {
-            "gm_mv_num": [],
-            "gm_mv": [],
-            "gm_best_mv": [],
-            "best_move_eval": [],
-            "mainline_eval": [],
-            "move_eval_diff": [],
-            "gm_mv_ac": [],
-            "move_type_list": [],
-            "w_castle_num": [],
-            "b_castle_num": [],
-        }
-
-    def all_games(self, path_userlogfile: str) -> datetime:
-        """Wrapper for get_last_logged_game function to improve code flow.
+    def init_move_times(self, chess_game: chess.pgn.Game) -> np.ndarray:
+        """Time spent on every move of the current game, from a single pass over the
+        games clock comments.
 
         Args:
-            path_userlogfile (str): User log file.
+            chess_game (chess.pgn.Game): Current chess game.
 
         Returns:
-            datetime: Datetime of last logged game.
+            np.ndarray: Seconds spent on each move, indexed by move number.
         """
-        return self.get_last_logged_game(path_userlogfile)
+        timers = self.filter_timecont_header(chess_game)
+        return self.get_move_times(chess_game, timers)
 
-    def get_last_logged_game(self, path_userlogfile: str) -> datetime:
-        """Returns the last logged game date.
+    @staticmethod
+    def get_move_times(chess_game: chess.pgn.Game, timers: tuple) -> np.ndarray:
+        """Gets the time spent on each move in seconds.
 
         Args:
-            path_userlogfile (str): User log file.
+            chess_game (chess.pgn.Game): Current chess game.
+            timers (tuple): Time control and time interval of the current game.
 
         Returns:
-            datetime:  Datetime of last logged game.
-        """
-        game_log_list = self.get_game_log_list(path_userlogfile)
-        llog = game_log_list[-1]
-        llog_date_str = llog.split("|")[2].strip()
-        return datetime.strptime(llog_date_str, "%Y-%m-%d %H:%M:%S")
+            np.ndarray: Seconds to make each move, NaN for moves without a clock
+                comment (and the next move of the same player).
+        """
+        time_remaining = [timers[0], timers[1]]
+        time_int = timers[2]
+        move_times = []
+        for num, move in enumerate(chess_game.mainline()):
+            move_clock = move.clock()
+            if move_clock is None or time_remaining[num % 2] is None:
+                move_times.append(np.nan)
+            else:
+                time_spent = round(time_remaining[num % 2] - move_clock + time_int, 3)
+                move_times.append(time_spent)
+            time_remaining[num % 2] = move_clock
+        return np.array(move_times, dtype=np.float64)
 
-    def get_game_log_list(self, path_userlogfile: str) -> list:
-        """Collects the log list.
+    @staticmethod
+    def filter_timecont_header(
+        chess_game: chess.pgn.Game,
+    ) -> tuple[Optional[float], Optional[float], int]:
+        """Filters the time control header to determine the starting time of a game.
 
         Args:
-            path_userlogfile (str): User log file.
+            chess_game (chess.pgn.Game): Current chess game.
 
         Returns:
-            list: List of logged games analysed.
-        """
-        game_log_list = []
-        with open(path_userlogfile, mode="r") as log_file:
-            lines = log_file.readlines()
-            self.logfile_line_checker_multi(game_log_list, lines)
-        return game_log_list
+            tuple[Optional[float], Optional[float], int]: Time control and time
+                interval of the current game - the starting times are None for games
+                without a time control, so their first moves get no move time.
+        """
+        if "TimeControl" not in chess_game.headers:
+            return (None, None, 0)
+        tc_white = chess_game.headers["TimeControl"]
+        tc_black = chess_game.headers["TimeControl"]
+        if ("+" in tc_white) or ("+" in tc_black):
+            time_interval = int(tc_white.split("+")[1])
+            tc_white = float(tc_white.split("+")[0])
+            tc_black = float(tc_black.split("+")[0])
+            return (tc_white, tc_black, time_interval)
+        else:
+            try:
+                tc_white = float(tc_white)
+                tc_black = float(tc_black)
+                time_interval = 0
+                return (tc_white, tc_black, time_interval)
+            except ValueError:
+                tc_white = 180.0
+                tc_black = 180.0
+                time_interval = 0
+                return (tc_white, tc_black, time_interval)
 
-    def logfile_line_checker_multi(self, game_log_list: list, lines: list[str]) -> None:
-        """Filter for log list to remove lines not relating to the user/game module.
+    def init_game_lists(self) -> dict:
+        """Empty Games lists for the current game.
 
-        Args:
-            game_log_list (list): List of log lines
-            lines (list[str]): Lines withing the log file.
+        Returns:
+            dict: Dictionary of empty game lists.
         """
-        game_log_list.extend(
-            line for line in lines if ("user" in line) or ("game" in line)
-        )
+        return {
+            "gm_mv_num": [],
+            "gm_mv": [],
+            "gm_best_mv": [],
+            "best_move_eval": [],
+            "mainline_eval": [],
+            "move_eval_diff": [],
+            "gm_mv_ac": [],
+            "move_type_list": [],
+            "w_castle_num": [],
+            "b_castle_num": [],
+        }
@@ -2,6 +2,7 @@
 """
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 import chess
 import chess.engine
@@ -80,16 +81,16 @@ class Headers:
             "Win_draw_loss": self.end_type,
         }
 
-    def time_control(self, chess_game: chess.pgn.Game) -> str:
+    def time_control(self, chess_game: chess.pgn.Game) -> Optional[str]:
         """Gets the time control header from the chess game pgn.
 
         Args:
             chess_game (chess.pgn.Game): Current chess game.
 
         Returns:
-            str: Time control.
+            Optional[str]: Time control, None for games without one e.g. OTB games.
         """
-        return chess_game.headers["TimeControl"]
+        return chess_game.headers.get("TimeControl")
 
     def player_white(self, chess_game: chess.pgn.Game) -> str:
         """Gets the white players username header from the chess game pgn.
@@ -114,7 +115,8 @@ class Headers:
         return chess_game.headers["Black"]
 
     def user_colour(self, white: str, username: str) -> str:
-        """Gets the players colour header from the chess game pgn.
+        """Gets the players colour header from the chess game pgn - usernames are
+        matched ignoring case, as chess.com and the pgn import do.
 
         Args:
             white (str): White players username.
@@ -123,29 +125,44 @@ class Headers:
         Returns:
             str: Users colour.
         """
-        return "White" if white == username else "Black"
+        return "White" if white.lower() == username.lower() else "Black"
 
-    def rating_white(self, chess_game: chess.pgn.Game) -> int:
+    def rating_white(self, chess_game: chess.pgn.Game) -> Optional[int]:
         """Gets whites rating header from the chess game pgn.
 
         Args:
             chess_game (chess.pgn.Game): Current chess game.
 
         Returns:
-            int: Whites player rating.
+            Optional[int]: Whites player rating, None if it is missing or unknown.
         """
-        return int(chess_game.headers["WhiteElo"])
+        return self.rating(chess_game.headers.get("WhiteElo"))
 
-    def rating_black(self, chess_game: chess.pgn.Game) -> int:
+    def rating_black(self, chess_game: chess.pgn.Game) -> Optional[int]:
         """Gets blacks rating header from the chess game pgn.
 
         Args:
             chess_game (chess.pgn.Game): Current chess game.
 
         Returns:
-            int: Blacks player rating.
+            Optional[int]: Blacks player rating, None if it is missing or unknown.
         """
-        return int(chess_game.headers["BlackElo"])
+        return self.rating(chess_game.headers.get("BlackElo"))
+
+    @staticmethod
+    def rating(elo: Optional[str]) -> Optional[int]:
+        """Converts an Elo header to a rating.
+
+        Args:
+            elo (Optional[str]): Elo header e.g. `1500`, `?` or `-` when unknown.
+
+        Returns:
+            Optional[int]: Rating, None if it is missing or unknown.
+        """
+        try:
+            return int(elo)
+        except (TypeError, ValueError):
+            return None
 
     def opening_cls(self, chess_game: chess.pgn.Game) -> str:
         """Gets the opening classification for the current chess game.
@@ -188,10 +205,14 @@ class Headers:
         Returns:
             termination (str): How the game ended.
         """
-        termination_raw = chess_game.headers["Termination"]
+        termination_raw = chess_game.headers.get("Termination")
+        if termination_raw is None:
+            # Only chess.com games say how they ended, use the result for others.
+            player = self.user_colour(chess_game.headers["White"], username)
+            return self.user_winr(self.win_draw_loss(chess_game), player)
         winner_check = termination_raw.split(" ")
         draw_check = " ".join(winner_check[:2])
-        if winner_check[0] == username:
+        if winner_check[0].lower() == username.lower():
             return "Win " + " ".join(winner_check[2:])
         elif draw_check == "Game drawn":
             return "Draw " + " ".join(winner_check[2:])
@@ -262,7 +283,8 @@ class Headers:
             return "Draw"
 
     def game_dt(self, chess_game: chess.pgn.Game) -> str:
-        """Date of the game.
+        """Date of the game - its `UTCDate` header, or `Date` for games from other
+        sites, as `pgn_headers.game_datetime` reads it.
 
         Args:
             chess_game (chess.pgn.Game): Current chess game.
@@ -270,10 +292,11 @@ class Headers:
         Returns:
             str: Game date.
         """
-        return chess_game.headers["UTCDate"]
+        return chess_game.headers.get("UTCDate") or chess_game.headers.get("Date")
 
     def game_t(self, chess_game: chess.pgn.Game) -> str:
-        """Time of the game.
+        """Time of the game - its `UTCTime` header, or `Time` for games from other
+        sites, midnight if neither is set.
 
         Args:
             chess_game (chess.pgn.Game): Current chess game.
@@ -281,9 +304,13 @@ class Headers:
         Returns:
             str: Game Time.
         """
-        return chess_game.headers["UTCTime"]
+        return (
+            chess_game.headers.get("UTCTime")
+            or chess_game.headers.get("Time")
+            or "00:00:00"
+        )
 
-    def game_dt_time(self, game_date: str, game_time: str) -> datetime:
+    def game_dt_time(self, game_date: str, game_time: str) -> Optional[datetime]:
         """Returns the game datetime of the current chess game.
 
         Args:
@@ -291,8 +318,12 @@ class Headers:
             game_time (str): Game Time.
 
         Returns:
-            datetime: datetime of the current chess game.
+            Optional[datetime]: datetime of the current chess game, None if the date
+                is unknown e.g. `????.??.??`.
         """
         game_date_time = f"{game_date} {game_time}"
-        return datetime.strptime(game_date_time, "%Y.%m.%d %H:%M:%S")
+        try:
+            return datetime.strptime(game_date_time, "%Y.%m.%d %H:%M:%S")
+        except ValueError:
+            return None
 
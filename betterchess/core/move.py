@@ -1,18 +1,14 @@
 """Module for analysing a given move of a chess game.
 """
 import math
-import sqlite3
 from dataclasses import dataclass
 from typing import Union
 
 import chess
 import chess.engine
-import chess.pgn
-import mysql.connector
-import pandas as pd
 from chess import Board
-from sqlalchemy import create_engine
 
+from betterchess.core.records import MoveRecord
 from betterchess.utils.handlers import EnvHandler, FileHandler, InputHandler, RunHandler
 
 
@@ -30,17 +26,25 @@ class Move:
 
     def analyse(self) -> None:
         """Method for running the move analysis."""
-        self.str_bm, self.eval_bm = self.best_move(
-            self.game_metadata["board"],
-            self.run_handler.engine,
-            self.input_handler.edepth,
-        )
-        self.str_ml, self.eval_ml = self.mainline_move(
-            self.move_metadata["move"],
-            self.game_metadata["board"],
-            self.run_handler.engine,
-            self.input_handler.edepth,
-        )
+        if self.env_handler.eval_chaining:
+            self.str_bm, self.eval_bm, self.str_ml, self.eval_ml = self.chained_move(
+                self.move_metadata["move"],
+                self.game_metadata["board"],
+                self.run_handler.engine,
+                self.input_handler.edepth,
+            )
+        else:
+            self.str_bm, self.eval_bm = self.best_move(
+                self.game_metadata["board"],
+                self.run_handler.engine,
+                self.input_handler.edepth,
+            )
+            self.str_ml, self.eval_ml = self.mainline_move(
+                self.move_metadata["move"],
+                self.game_metadata["board"],
+                self.run_handler.engine,
+                self.input_handler.edepth,
+            )
         self.evaldiff = self.eval_delta(
             self.move_metadata["move_num"], self.eval_bm, self.eval_ml
         )
@@ -57,44 +61,39 @@ class Move:
         self.b_castle_mv_num = self.black_castle_move_num(
             self.castle_type, self.move_metadata["move_num"]
         )
-        self.timers = self.filter_timecont_header(self.file_handler.path_temp)
-        self.move_time = self.get_time_spent_on_move(
-            self.file_handler.path_temp, self.move_metadata["move_num"], self.timers
-        )
-        self.move_df = self.create_move_df()
-        self.export_move_data(self.move_df, self.env_handler)
+        move_time = self.game_metadata["move_times"][self.move_metadata["move_num"]]
+        self.move_time = None if math.isnan(move_time) else move_time
+        self.move_record = self.create_move_record()
+        self.game_metadata["move_rows"].append(self.move_record)
         self.append_to_game_lists()
 
-    def create_move_df(self) -> pd.DataFrame:
-        """Create the move dataframe.
+    def create_move_record(self) -> MoveRecord:
+        """Create the move record.
 
         Returns:
-            pd.DataFrame: Move dataframe.
+            MoveRecord: Row of `move_data`.
         """
-        self.move_df = pd.DataFrame(
-            {
-                "Username": self.input_handler.username,
-                "Game_date": self.game_metadata["game_datetime"],
-                "Engine_depth": self.input_handler.edepth,
-                "Game_number": self.iter_metadata["game_num"],
-                "Move_number": self.move_metadata["move_num"],
-                "Move": self.str_ml,
-                "Move_eval": self.eval_ml,
-                "Best_move": self.str_bm,
-                "Best_move_eval": self.eval_bm,
-                "Move_eval_diff": self.evaldiff,
-                "Move_accuracy": self.move_acc,
-                "Move_type": self.move_type,
-                "Piece": self.piece,
-                "Move_colour": self.move_col,
-                "Castling_type": self.castle_type,
-                "White_castle_num": self.w_castle_mv_num,
-                "Black_castle_num": self.b_castle_mv_num,
-                "Move_time": self.move_time,
-            },
-            index=[0],
+        self.move_record = MoveRecord(
+            Username=self.input_handler.username,
+            Game_date=self.game_metadata["game_datetime"],
+            Engine_depth=self.input_handler.edepth,
+            Game_number=self.iter_metadata["game_num"],
+            Move_number=self.move_metadata["move_num"],
+            Move=self.str_ml,
+            Move_eval=self.eval_ml,
+            Best_move=self.str_bm,
+            Best_move_eval=self.eval_bm,
+            Move_eval_diff=self.evaldiff,
+            Move_accuracy=self.move_acc,
+            Move_type=self.move_type,
+            Piece=self.piece,
+            Move_colour=self.move_col,
+            Castling_type=self.castle_type,
+            White_castle_num=self.w_castle_mv_num,
+            Black_castle_num=self.b_castle_mv_num,
+            Move_time=self.move_time,
         )
-        return self.move_df
+        return self.move_record
 
     def mainline_move(
         self,
@@ -115,12 +114,7 @@ class Move:
         """
         str_ml = str(move)
         board.push_san(san=str_ml)
-        eval_ml_init = engine.analyse(
-            board=board,
-            limit=chess.engine.Limit(depth=edepth),
-            game=object(),
-        )
-        eval_ml = self.move_eval(move=eval_ml_init)
+        _, eval_ml = self.position_analysis(board, engine, edepth)
         return str_ml, eval_ml
 
     def best_move(
@@ -135,21 +129,107 @@ class Move:
         Returns:
             tuple: Best move string and best move evaluation.
         """
+        str_bm = self.position_best_move(board, engine, edepth)
+        board.push_san(san=str_bm)
+        _, eval_bm = self.position_analysis(board, engine, edepth)
+        board.pop()
+        return str_bm, eval_bm
+
+    def chained_move(
+        self,
+        move: chess.Move,
+        board: Board,
+        engine: chess.engine.SimpleEngine,
+        edepth: int,
+    ) -> tuple:
+        """Analysis of the best and mainline move with one search per position.
+
+        The search of the position before the move gives the best move and its
+        evaluation, the search of the position after the move gives the mainline
+        evaluation and is kept as the next plies pre-move search.
+
+        Args:
+            move (chess.Move): Move.
+            board (Board): Current game board.
+            engine (chess.engine.SimpleEngine): Engine for analysis.
+            edepth (int): Engine depth.
+
+        Returns:
+            tuple: Best move string, best move evaluation, move string and move
+                evaluation.
+        """
+        pre_move_info = self.game_metadata["pre_move_info"]
+        if pre_move_info is None:
+            pre_move_info = self.position_analysis(board, engine, edepth)
+        str_bm, pre_move_eval = pre_move_info
+        if str_bm is None:
+            str_bm = self.position_best_move(board, engine, edepth)
+        str_ml = str(move)
+        board.push(move)
+        post_move_info = self.position_analysis(board, engine, edepth)
+        self.game_metadata["pre_move_info"] = post_move_info
+        eval_ml = post_move_info[1]
+        eval_bm = eval_ml if str_bm == str_ml else pre_move_eval
+        return str_bm, eval_bm, str_ml, eval_ml
+
+    def position_best_move(
+        self, board: Board, engine: chess.engine.SimpleEngine, edepth: int
+    ) -> str:
+        """Best move in a position, from the eval cache if it has been seen before.
+
+        Args:
+            board (Board): Current game board.
+            engine (chess.engine.SimpleEngine): Engine for analysis.
+            edepth (int): Engine depth.
+
+        Returns:
+            str: Best move string.
+        """
+        eval_cache = self.run_handler.eval_cache
+        if eval_cache is not None:
+            str_bm, _ = eval_cache.get(board, edepth)
+            if str_bm is not None:
+                return str_bm
         best_move = engine.play(
             board=board,
             limit=chess.engine.Limit(depth=edepth),
-            game=object(),
+            game=self.game_metadata["engine_game"],
         )
         str_bm = str(best_move.move)
-        board.push_san(san=str_bm)
-        eval_bm_init = engine.analyse(
+        if eval_cache is not None:
+            eval_cache.put(board, edepth, best_move=str_bm)
+        return str_bm
+
+    def position_analysis(
+        self, board: Board, engine: chess.engine.SimpleEngine, edepth: int
+    ) -> tuple:
+        """Best move and evaluation of a position, from the eval cache if it has been
+        seen before.
+
+        Args:
+            board (Board): Current game board.
+            engine (chess.engine.SimpleEngine): Engine for analysis.
+            edepth (int): Engine depth.
+
+        Returns:
+            tuple: Best move string (None if the engine returned no line) and
+                evaluation.
+        """
+        eval_cache = self.run_handler.eval_cache
+        if eval_cache is not None:
+            str_bm, score = eval_cache.get(board, edepth)
+            if score is not None:
+                return str_bm, score
+        info = engine.analyse(
             board=board,
             limit=chess.engine.Limit(depth=edepth),
-            game=object(),
+            game=self.game_metadata["engine_game"],
         )
-        eval_bm = self.move_eval(move=eval_bm_init)
-        board.pop()
-        return str_bm, eval_bm
+        str_bm = str(info["pv"][0]) if "pv" in info else None
+        score = self.move_eval(move=info)
+        if eval_cache is not None:
+            eval_cache.put(board, edepth, best_move=str_bm, score=score)
+        return str_bm, score
 
     @staticmethod
     def move_eval(move: chess.Move) -> int:
@@ -347,93 +427,6 @@ class Move:
             black_castle_move = 0
         return black_castle_move
 
-    @staticmethod
-    def get_time_spent_on_move(path_temp: str, move_num: int, timers: tuple) -> float:
-        """Gets the time spent on a given move in seconds.
-
-        Args:
-            path_temp (str): Pgn filepath for current game.
-            move_num (int): Move number.
-            timers (tuple): Time control and time interval of the current game.
-
-        Returns:
-            float: Seconds to make a move.
-        """
-        chess_game_pgn = open(file=path_temp)
-        game = chess.pgn.read_game(handle=chess_game_pgn)
-        timerem_w, timerem_b, time_int = timers[0], timers[1], timers[2]
-        time_list = []
-        for num, move in enumerate(game.mainline()):
-            if num % 2 == 0:
-                move_time_w = move.clock()
-                time_spent = round(timerem_w - move_time_w + time_int, 3)
-                time_list.append(time_spent)
-                timerem_w = move_time_w
-            else:
-                move_time_b = move.clock()
-                time_spent = round(timerem_b - move_time_b + time_int, 3)
-                time_list.append(time_spent)
-                timerem_b = move_time_b
-        return time_list[move_num]
-
-    @staticmethod
-    def filter_timecont_header(path_temp: str) -> tuple[float, float, int]:
-        """Filters the time control header to determine the starting time of a game.
-
-        Args:
-            path_temp (str): Pgn filepath for current game.
-
-        Returns:
-            tuple[float, float, int]: Time control and time interval of the current game.
-        """
-        chess_game_pgn = open(file=path_temp)
-        game = chess.pgn.read_game(handle=chess_game_pgn)
-        tc_white = game.headers["TimeControl"]
-        tc_black = game.headers["TimeControl"]
-        if ("+" in tc_white) or ("+" in tc_black):
-            time_interval = int(tc_white.split("+")[1])
-            tc_white = float(tc_white.split("+")[0])
-            tc_black = float(tc_black.split("+")[0])
-            return (tc_white, tc_black, time_interval)
-        else:
-            try:
-                tc_white = float(tc_white)
-                tc_black = float(tc_black)
-                time_interval = 0
-                return (tc_white, tc_black, time_interval)
-            except ValueError:
-                tc_white = 180.0
-                tc_black = 180.0
-                time_interval = 0
-                return (tc_white, tc_black, time_interval)
-
-    def export_move_data(self, move_df: pd.DataFrame, env_handler: EnvHandler) -> None:
-        """Exports the move dataframe to sql database.
-
-        Args:
-            move_df (pd.DataFrame): Move dataframe.
-        """
-        if env_handler.db_type == "mysql":
-            conn = mysql.connector.connect(
-                host=env_handler.mysql_host,
-                user=env_handler.mysql_user,
-                database=env_handler.mysql_db,
-                password=env_handler.mysql_password,
-            )
-            mysql_engine = create_engine(
-                f"{self.env_handler.mysql_driver}://{self.env_handler.mysql_user}:{self.env_handler.mysql_password}@{self.env_handler.mysql_host}/{self.env_handler.mysql_db}"
-            )
-            move_df.to_sql("move_data", mysql_engine, if_exists="append", index=False)
-            conn.commit()
-            conn.close()
-        elif env_handler.db_type == "sqlite":
-            conn = sqlite3.connect(
-                FileHandler(self.input_handler.username).path_database
-            )
-            move_df.to_sql("move_data", conn, if_exists="append", index=False)
-            conn.commit()
-            conn.close()
-
     def append_to_game_lists(self) -> None:
         """Appends the move data to the games lists so it can be accessed by the Game class."""
         self.game_metadata["game_lists_dict"]["gm_mv_num"].append(
@@ -0,0 +1,105 @@
+"""Module for the rows written to the `pgn_data`, `moves` and `game_data` tables.
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+class PgnRecord(NamedTuple):
+    """A row of `pgn_data` - field names match the table columns."""
+
+    username: str
+    url_date: Optional[datetime]
+    game_id: str
+    game_datetime: Optional[datetime]
+    time_control: Optional[str]
+    game_data: str
+
+
+class MoveRecord(NamedTuple):
+    """A row of the `move_data` view - field names match the view columns."""
+
+    Username: str
+    Game_date: datetime
+    Engine_depth: int
+    Game_number: int
+    Move_number: int
+    Move: str
+    Move_eval: int
+    Best_move: str
+    Best_move_eval: int
+    Move_eval_diff: int
+    Move_accuracy: float
+    Move_type: int
+    Piece: str
+    Move_colour: str
+    Castling_type: Optional[str]
+    White_castle_num: int
+    Black_castle_num: int
+    Move_time: float
+
+
+class CompactMoveRecord(NamedTuple):
+    """A row of `moves` - field names match the table columns. Moves are uci move
+    codes and the piece and castling type are small integers, see `move_codes`."""
+
+    game_id: int
+    move_number: int
+    engine_depth: int
+    move: Optional[int]
+    move_eval: int
+    best_move: Optional[int]
+    best_move_eval: int
+    move_eval_diff: int
+    move_accuracy: float
+    move_type: int
+    piece: Optional[int]
+    castling_type: Optional[int]
+    white_castle_num: int
+    black_castle_num: int
+    move_time: float
+
+
+class GameRecord(NamedTuple):
+    """A row of `game_data` - field names match the table columns. `Game_number` is
+    the `pgn_data` id of the game, its pgn is read with `PrepareUsers.game_pgn`."""
+
+    Username: str
+    Game_date: datetime
+    Game_time_of_day: str
+    Game_weekday: str
+    Engine_depth: int
+    Game_number: int
+    Game_type: str
+    White_player: str
+    White_rating: int
+    Black_player: str
+    Black_rating: int
+    User_colour: str
+    User_rating: int
+    Opponent_rating: int
+    User_win_percent: float
+    Opp_win_percent: float
+    User_winner: str
+    Opening_name: str
+    Opening_class: str
+    Termination: str
+    End_type: str
+    Number_of_moves: int
+    Accuracy: float
+    Opening_accuracy: float
+    Mid_accuracy: float
+    End_accuracy: float
+    No_best: int
+    No_excellent: int
+    No_good: int
+    No_inaccuracy: int
+    No_mistake: int
+    No_blunder: int
+    No_missed_win: int
+    Improvement: str
+    User_castle_num: int
+    Opp_castle_num: int
+    User_castled: int
+    Opp_castled: int
+    User_castle_phase: str
+    Opp_castle_phase: str
@@ -0,0 +1,131 @@
+"""Module for calculating the aggregates of an analysed game.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+WHITE, BLACK = 0, 1
+
+# Move types in the order they are counted: best, excellent, good, inaccuracy, mistake,
+# blunder, missed win - see `Move.assign_move_type`.
+MOVE_TYPES = (2, 1, 0, -1, -2, -3, -4)
+PHASES = ("Opening", "Midgame", "Endgame")
+
+
+@dataclass
+class GameStats:
+    """Aggregates of an analysed game, from the perspective of either player - see
+    `player_summary`:
+        - move_type_counts: number of each of `MOVE_TYPES`.
+        - accuracy: mean move accuracy.
+        - opening/mid/end_accuracy: mean move accuracy of each third of their moves.
+        - improvement: phase with the lowest accuracy.
+        - castle_move: ply the player castled on, 0 if they did not castle.
+        - castled: 1 if castled 0 if not castled.
+        - castle_phase: phase the player castled in, `None` if they did not castle.
+    """
+
+    move_types: list
+    move_accs: list
+    white_castle_nums: list
+    black_castle_nums: list
+    total_moves: int
+
+    @classmethod
+    def from_game_lists(cls, game_lists: dict, total_moves: int) -> "GameStats":
+        """Creates the stats from the `game_lists_dict` of a game.
+
+        Args:
+            game_lists (dict): `game_lists_dict` of the game.
+            total_moves (int): Total number of moves of the game.
+
+        Returns:
+            GameStats: Aggregates of the game.
+        """
+        return cls(
+            game_lists["move_type_list"],
+            game_lists["gm_mv_ac"],
+            game_lists["w_castle_num"],
+            game_lists["b_castle_num"],
+            total_moves,
+        )
+
+    def player_summary(self, colour: int) -> dict:
+        """Aggregates of the game from the perspective of one of its players.
+
+        Args:
+            colour (int): `WHITE` or `BLACK`.
+
+        Returns:
+            dict: Players aggregates, the opponents castling is prefixed `opp_`.
+        """
+        move_types = self.move_types[colour::2]
+        accs = self.move_accs[colour::2]
+        accuracy = round(float(sum(accs) / len(accs)), 2) if accs else 0.0
+        opening, midgame, endgame = self.phase_accuracy(accs)
+        if opening < endgame and opening < midgame:
+            improvement = PHASES[0]
+        elif midgame < opening and midgame < endgame:
+            improvement = PHASES[1]
+        else:
+            improvement = PHASES[2]
+        castle_moves = [
+            int(sum(castle_nums))
+            for castle_nums in (self.white_castle_nums, self.black_castle_nums)
+        ]
+        castle_move, opp_castle_move = castle_moves[colour], castle_moves[1 - colour]
+        return {
+            "accuracy": accuracy,
+            "opening_accuracy": opening,
+            "mid_accuracy": midgame,
+            "end_accuracy": endgame,
+            "move_type_counts": [
+                move_types.count(move_type) for move_type in MOVE_TYPES
+            ],
+            "improvement": improvement,
+            "castle_move": castle_move,
+            "opp_castle_move": opp_castle_move,
+            "castled": int(castle_move > 0),
+            "opp_castled": int(opp_castle_move > 0),
+            "castle_phase": self.castle_phase(castle_move),
+            "opp_castle_phase": self.castle_phase(opp_castle_move),
+        }
+
+    @staticmethod
+    def phase_accuracy(accs: list) -> list:
+        """Mean accuracy of each third of a players moves, split as `np.array_split`
+        would.
+
+        Args:
+            accs (list): Move accuracies of the player.
+
+        Returns:
+            list: Opening, midgame and endgame accuracy, 0 for an empty phase.
+        """
+        third, remainder = divmod(len(accs), 3)
+        opening_end = third + (remainder > 0)
+        midgame_end = opening_end + third + (remainder > 1)
+        phases = (accs[:opening_end], accs[opening_end:midgame_end], accs[midgame_end:])
+        # rounded as numpy rounds, as the phase accuracies always have been.
+        return [
+            float(np.round(sum(phase) / len(phase), 2)) if phase else 0.0
+            for phase in phases
+        ]
+
+    def castle_phase(self, castle_move: int) -> str:
+        """Phase of the game a player castled in.
+
+        Args:
+            castle_move (int): Ply the player castled on, 0 if they did not castle.
+
+        Returns:
+            str: Game phase, `None` if they did not castle.
+        """
+        if castle_move == 0 or self.total_moves == 0:
+            return "None"
+        game_fraction = castle_move / self.total_moves
+        if game_fraction < 1 / 3:
+            return PHASES[0]
+        if game_fraction <= 2 / 3:
+            return PHASES[1]
+        return PHASES[2]
@@ -1,17 +1,18 @@
 """_summary_
 """
-import sqlite3
+import copy
+import io
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from logging import Logger
-from typing import Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import chess.pgn
-import mysql.connector
-import pandas as pd
-from sqlalchemy import create_engine
 
 from betterchess.core.game import Game
+from betterchess.utils.checkpoint import DONE
+from betterchess.utils.database import Database
 from betterchess.utils.extract import Extract
 from betterchess.utils.handlers import EnvHandler, FileHandler, InputHandler, RunHandler
 
@@ -30,281 +31,233 @@ class User:
         extract = Extract(
             self.input_handler, self.file_handler, self.run_handler, self.env_handler
         )
-        extract.run_data_extract(
-            self.input_handler.username,
-            self.file_handler.path_userlogfile,
-            self.run_handler.logger,
-        )
+        extract.run_data_extract(self.input_handler.username, self.run_handler.logger)
         self.run_analysis()
 
     def run_analysis(self) -> None:
-        """Analyses all of the given users games."""
+        """Analyses the given users games, spread across the engine pool.
+
+        Only games played since the start date, in the selected time controls and not
+        yet marked as analysed at this engine depth by the checkpoint are read from the
+        database. Games are
+        submitted in order with at most one game per engine in flight.
+        """
+        engine_pool = self.run_handler.engine_pool
         prepare_users = PrepareUsers()
-        all_games, tot_games = prepare_users.current_run(
-            self.file_handler.path_database,
+        game_filter = (
             self.input_handler.username,
-            self.file_handler.path_userlogfile,
-            self.run_handler.logger,
-            self.env_handler,
+            self.input_handler.start_date,
+            self.env_handler.time_controls,
+            self.input_handler.edepth,
         )
-        cleandown = Cleandown()
-        cleandown.previous_run(
-            self.file_handler.path_userlogfile,
-            self.file_handler.path_database,
-            self.input_handler.username,
-            self.env_handler,
+        tot_games = prepare_users.count_users_games(
+            self.run_handler.database, *game_filter
         )
         print("Analysing users data: ")
-        for game_num, chess_game in enumerate(all_games["game_data"]):
-            preppare_users = PrepareUsers()
-            preppare_users.current_game(self.file_handler.path_temp, chess_game)
-            iter_metadata = {"game_num": game_num, "tot_games": tot_games}
-            game = Game(
-                self.input_handler,
-                self.file_handler,
-                self.run_handler,
-                self.env_handler,
-                iter_metadata,
+        with ThreadPoolExecutor(max_workers=engine_pool.size) as executor:
+            in_flight = deque()
+            users_games = prepare_users.users_games(
+                self.run_handler.database, *game_filter
             )
-            game.run_game_analysis()
-            del game
-
-
-@dataclass
-class PrepareUsers:
-    """Prepares the current run for analysis e.g. initalises logs, database"""
-
-    def current_run(
-        self,
-        path_database: str,
-        username: str,
-        path_userlogfile: str,
-        logger: Logger,
-        env_handler: EnvHandler,
-    ) -> Tuple[pd.DataFrame, int]:
-        """_summary_
-
-        Args:
-            path_database (str): _description_
-            username (str): _description_
-            path_userlogfile (str): _description_
-            logger (Logger): _description_
-
-        Returns:
-            Tuple[pd.DataFrame, int]: _description_
-        """
-        all_games, tot_games = self.initialise_users_games(
-            path_database, username, env_handler
-        )
-        self.init_game_logs(username, path_userlogfile, logger)
-        return (all_games, tot_games)
-
-    def initialise_users_games(
-        self, path_database: str, username: str, env_handler: EnvHandler
-    ) -> Tuple[pd.DataFrame, int]:
-        """Initialise a users games, connects to specified database type and return
-        all their games.
-
+            for game_idx, (game_id, chess_game) in enumerate(users_games):
+                if len(in_flight) == engine_pool.size:
+                    in_flight.popleft().result()
+                iter_metadata = {
+                    "game_num": game_id,
+                    "game_idx": game_idx,
+                    "tot_games": tot_games,
+                }
+                in_flight.append(
+                    executor.submit(self.run_game, iter_metadata, chess_game)
+                )
+            for future in in_flight:
+                future.result()
+        self.report_eval_cache()
+
+    def report_eval_cache(self) -> None:
+        """Reports how many engine searches were served from the eval cache."""
+        eval_cache = self.run_handler.eval_cache
+        if eval_cache is not None:
+            message = f"Eval cache hit rate: {eval_cache.hit_rate():.1%} of {eval_cache.lookups} lookups"
+            self.run_handler.logger.info(f"| {self.input_handler.username} | {message}")
+            print(f"\n{message}")
+
+    def run_game(self, iter_metadata: dict, chess_game: str) -> None:
+        """Analyses a single game on an engine borrowed from the engine pool. A game
+        whose analysis raises is checkpointed as failed before the error is passed on.
 
         Args:
-            path_database (str): Database file path.
-            username (str): Username of current run.
-
-        Returns:
-            Tuple[pd.DataFrame, int]: all games and the total number of games played
+            iter_metadata (dict): iteration metadata.
+            chess_game (str): Game pgn string from `pgn_data`.
         """
-        if env_handler.db_type == "mysql":
-            sql_query = """select game_data from pgn_data where username =%s"""
-            conn = mysql.connector.connect(
-                host=env_handler.mysql_host,
-                user=env_handler.mysql_user,
-                database=env_handler.mysql_db,
-                password=env_handler.mysql_password,
-            )
-            mysql_engine = create_engine(
-                f"{env_handler.mysql_driver}://{env_handler.mysql_user}:{env_handler.mysql_password}@{env_handler.mysql_host}/{env_handler.mysql_db}"
+        prepare_users = PrepareUsers()
+        iter_metadata["game_pgn"] = prepare_users.current_game(chess_game)
+        try:
+            with self.run_handler.engine_pool.acquire() as engine:
+                run_handler = copy.copy(self.run_handler)
+                run_handler.engine = engine
+                game = Game(
+                    self.input_handler,
+                    self.file_handler,
+                    run_handler,
+                    self.env_handler,
+                    iter_metadata,
+                )
+                game.run_game_analysis()
+        except Exception:
+            self.run_handler.checkpoint.fail(
+                self.input_handler.username,
+                iter_metadata["game_num"],
+                self.input_handler.edepth,
             )
-            all_games = pd.read_sql(sql=sql_query, con=mysql_engine, params=[username])
-            tot_games = len(all_games["game_data"])
-            conn.close()
-            return all_games, tot_games
-        elif env_handler.db_type == "sqlite":
-            sql_query = """select game_data from pgn_data where username =:username"""
-            params = {"username": username}
-            conn = sqlite3.connect(path_database)
-            all_games = pd.read_sql(sql=sql_query, con=conn, params=params)
-            tot_games = len(all_games["game_data"])
-            conn.close()
-            return all_games, tot_games
-
-    def init_game_logs(
-        self, username: str, path_userlogfile: str, logger: Logger
-    ) -> None:
-        """Initialises the log file and sets the first games log date.
-
-        Args:
-            username (str): Username of current run.
-            path_userlogfile (str): Logfile for the current user.
-            logger (Logger): Logger object.
-        """
-        if self.numlines_in_logfile(path_userlogfile) == 0:
-            self.set_first_game_logdate(username, path_userlogfile, logger)
+            raise
 
-    def numlines_in_logfile(self, path_userlogfile: str) -> int:
-        """Returns the number of lines in the logfile.
 
-        Args:
-            path_userlogfile (str): Logfile for the current user.
+@dataclass
+class PrepareUsers:
+    """Prepares the current run for analysis e.g. collects the users games."""
 
-        Returns:
-            int: Number of games in logfile.
-        """
-        game_log_list = []
-        with open(path_userlogfile, "r") as log_file:
-            lines = log_file.readlines()
-            self.check_logfile(game_log_list, lines)
-        return len(game_log_list)
+    def users_games(
+        self,
+        database: Database,
+        username: str,
+        start_date: datetime,
+        time_controls: List[str],
+        edepth: int,
+        chunk_size: int = 500,
+    ) -> Iterator[Tuple[int, str]]:
+        """Streams the users games which still need analysing, in id order.
 
-    def set_first_game_logdate(
-        self, username: str, path_userlogfile: str, logger: Logger
-    ) -> None:
-        """Creates the default date in the logfile.
+        Games are read in chunks of `chunk_size` with a keyset query (`id` greater
+        than the last id read), each chunk in its own short transaction - no cursor is
+        held open while the games are analysed, so the analysis can keep committing.
 
         Args:
+            database (Database): Pooled database connections.
             username (str): Username of current run.
-            path_userlogfile (str): Logfile for the current user.
-            logger (Logger): Logger object.
-        """
-        with open(path_userlogfile, mode="a") as _:
-            game_num = 0
-            init_dt = datetime(2020, 1, 1)
-            logger.info(f"| {username} | {init_dt} | {game_num}")
-
-    def check_logfile(self, game_log_list: list, lines: list[str]) -> None:
-        """Appends a given logged line to `game_log_list` if it is part of the module
-        "user" or "user_analysis"
+            start_date (datetime): Games played before this date are skipped.
+            time_controls (List[str]): `TimeControl` headers to analyse, all if empty.
+            edepth (int): Engine depth of current run.
+            chunk_size (int): Number of games read per query.
 
-        Args:
-            game_log_list (list): List of logged games in logfile
-            lines (list[str]): Lines in the logfile
+        Yields:
+            Iterator[Tuple[int, str]]: `pgn_data` id and game data of each game.
         """
-        game_log_list.extend(
-            line for line in lines if ("user" in line) or ("user_analysis" in line)
+        where, params = self.users_games_filter(
+            database, username, start_date, time_controls, edepth
         )
-
-    def current_game(self, path_temp: str, chess_game: chess.pgn.Game) -> None:
-        """Writes the current game to temp.pgn.
-
-        Args:
-            path_temp (str): path to temp.pgn file
-            chess_game (chess.pgn.Game): chess game for analysis
-        """
-        with open(path_temp, mode="w") as temp_file:
-            temp_file.write(str(chess_game.replace(" ; ", "\n")))
-
-
-@dataclass
-class Cleandown:
-    """Cleans down the previous run e.g. remove unfinished analysis for a game, reset logs."""
-
-    def previous_run(
+        sql_query = f"select id, game_data from pgn_data where {where} and id > {database.placeholder} order by id limit {int(chunk_size)}"
+        last_id = 0
+        while True:
+            with database.connection() as conn:
+                curs = conn.cursor()
+                curs.execute(sql_query, (*params, last_id))
+                rows = curs.fetchall()
+                curs.close()
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
+    def count_users_games(
         self,
-        path_userlogfile: str,
-        path_database: str,
+        database: Database,
         username: str,
-        env_handler: EnvHandler,
-    ) -> None:
-        """Runs the cleandown of the previous run
+        start_date: datetime,
+        time_controls: List[str],
+        edepth: int,
+    ) -> int:
+        """Counts the users games which still need analysing.
 
         Args:
-            path_userlogfile (str):  Logfile for the current user.
-            path_database (str): Database file path.
+            database (Database): Pooled database connections.
             username (str): Username of current run.
-        """
-        game_num = self.get_last_logged_game_num(path_userlogfile)
-        self.clean_sql_table(path_database, game_num, username, env_handler)
-
-    def clean_sql_table(
-        self, path_database: str, game_num: int, username: str, env_handler: EnvHandler
-    ) -> None:
-        """_summary_
+            start_date (datetime): Games played before this date are skipped.
+            time_controls (List[str]): `TimeControl` headers to analyse, all if empty.
+            edepth (int): Engine depth of current run.
 
-        Args:
-            path_database (str): Database file path.
-            game_num (int): Latest unfinished game number of the current user.
-            username (str): Username of current run.
+        Returns:
+            int: Number of games.
         """
-        if env_handler.db_type == "mysql":
-            conn = mysql.connector.connect(
-                host=env_handler.mysql_host,
-                user=env_handler.mysql_user,
-                database=env_handler.mysql_db,
-                password=env_handler.mysql_password,
-            )
-            curs = conn.cursor()
-            curs.execute(
-                """DELETE FROM move_data WHERE Game_number = %s and Username = %s""",
-                (game_num, username),
-            )
-            conn.commit()
-            curs.close()
-        elif env_handler.db_type == "sqlite":
-            conn = sqlite3.connect(path_database)
+        where, params = self.users_games_filter(
+            database, username, start_date, time_controls, edepth
+        )
+        with database.connection() as conn:
             curs = conn.cursor()
-            sql_query = "DELETE FROM move_data WHERE Game_number = :game_num and Username = :username"
-            params = {"game_num": game_num, "username": username}
-            curs.execute(sql_query, params)
-            conn.commit()
+            curs.execute(f"select count(*) from pgn_data where {where}", params)
+            tot_games = curs.fetchone()[0]
             curs.close()
+        return tot_games
 
-    def get_last_logged_game_num(self, path_userlogfile: str) -> int:
-        """Gets the last logged games number.
+    @staticmethod
+    def users_games_filter(
+        database: Database,
+        username: str,
+        start_date: datetime,
+        time_controls: List[str],
+        edepth: int,
+    ) -> Tuple[str, tuple]:
+        """Creates the where clause selecting the users games which still need
+        analysing - played since the start date, in one of the time controls and
+        without a `done` checkpoint at the current engine depth or deeper, so raising
+        the depth analyses the users games again. Games without a known date (e.g.
+        `????.??.??` in an imported pgn) cannot be filtered by date, so they are always
+        included.
 
         Args:
-            path_userlogfile (str): path to logfile.
+            database (Database): Pooled database connections.
+            username (str): Username of current run.
+            start_date (datetime): Games played before this date are skipped.
+            time_controls (List[str]): `TimeControl` headers to analyse, all if empty.
+            edepth (int): Engine depth of current run.
 
         Returns:
-            int: last logged game number.
+            Tuple[str, tuple]: Where clause and its parameters.
         """
-        if self.logfile_not_empty(path_userlogfile):
-            log_list = self.get_game_log_list(path_userlogfile)
-            return int(log_list[-1].split("|")[3].strip())
+        placeholder = database.placeholder
+        where = f"username = {placeholder} and (game_datetime >= {placeholder} or game_datetime is null)"
+        params = (username, start_date)
+        if time_controls:
+            placeholders = ", ".join(placeholder for _ in time_controls)
+            where += f" and time_control in ({placeholders})"
+            params += tuple(time_controls)
+        where += (
+            " and not exists (select 1 from analysis_checkpoint c"
+            " where c.username = pgn_data.username and c.game_id = pgn_data.id"
+            f" and c.status = {placeholder} and c.engine_depth >= {placeholder})"
+        )
+        return where, params + (DONE, edepth)
 
-    def logfile_not_empty(self, path_userlogfile: str) -> bool:
-        """Checks to see if the logfile is empty.
+    def current_game(self, chess_game: str) -> str:
+        """Restores the line breaks of a game stored in `pgn_data`.
 
         Args:
-            path_userlogfile (str): path to logfile.
+            chess_game (str): chess game for analysis
 
         Returns:
-            bool: Whether the log file is empty
+            str: pgn string of the game.
         """
-        with open(path_userlogfile, mode="r") as log_file:
-            lines = log_file.readlines()
-        return bool(lines)
+        return str(chess_game.replace(" ; ", "\n"))
 
-    def get_game_log_list(self, path_userlogfile: str) -> list:
-        """Returns the number of lines in the logfile = "user" or "analysis".
+    def game_pgn(self, database: Database, game_id: int) -> Optional[chess.pgn.Game]:
+        """Reads a stored game by its `pgn_data` id - the `Game_number` of its
+        `game_data` and `move_data` rows.
 
         Args:
-            path_userlogfile (str): path to logfile.
+            database (Database): Pooled database connections.
+            game_id (int): `pgn_data` id of the game.
 
         Returns:
-            list: List of logged games.
+            Optional[chess.pgn.Game]: The parsed game, None if no game has the id.
         """
-        game_log_list = []
-        with open(path_userlogfile, mode="r") as log_file:
-            lines = log_file.readlines()
-            self.logfile_line_checker_multi(game_log_list, lines)
-        return game_log_list
-
-    def logfile_line_checker_multi(self, game_log_list: list, lines: list[str]) -> None:
-        """_summary_
-
-        Args:
-            game_log_list (list):  List of logged games.
-            lines (list[str]): Lines in the log file.
-        """
-        game_log_list.extend(
-            line for line in lines if ("user" in line) or ("game" in line)
-        )
+        with database.connection() as conn:
+            curs = conn.cursor()
+            curs.execute(
+                f"select game_data from pgn_data where id = {database.placeholder}",
+                (game_id,),
+            )
+            row = curs.fetchone()
+            curs.close()
+        if row is None:
+            return None
+        return chess.pgn.read_game(io.StringIO(self.current_game(row[0])))
@@ -1,12 +1,11 @@
-import sqlite3
 from dataclasses import dataclass
 
-import mysql.connector
-
 from betterchess.utils.config import Config
+from betterchess.utils.database import Database
 from betterchess.utils.handlers import EnvHandler, InputHandler
 
-from .managers import MySQLManager, SQLiteManager
+from .managers import DatabaseManager
+from .migration import SchemaMigration
 
 
 @dataclass
@@ -18,27 +17,25 @@ class BaseDataManager:
     env_handler: EnvHandler
     config: Config
     input_handler: InputHandler
+    database: Database
 
     def select_manager(self):
-        """Selects the database manager for the current environment."""
-        if self.env_handler.db_type == "mysql":
-            self.mysql_manager()
-        if self.env_handler.db_type == "sqlite":
-            self.sqlite_manager()
-
-    def mysql_manager(self):
-        """Connects to the mysql database and allows a user to manager the database."""
-        conn = mysql.connector.connect(
-            host=self.env_handler.mysql_host,
-            user=self.env_handler.mysql_user,
-            database=self.env_handler.mysql_db,
-            password=self.env_handler.mysql_password,
+        """Connects to the database of the current environment and allows a user to
+        manage the database."""
+        conn = self.database.raw_connection()
+        manager = DatabaseManager(
+            self.config, conn, self.input_handler, self.env_handler.db_type
+        )
+        manager.query_selector()
+
+    def migrate_database(self) -> dict:
+        """Upgrades the tables of an existing database to the current keys and
+        indexes in place.
+
+        Returns:
+            dict: Number of rows in each table after the migration.
+        """
+        migration = SchemaMigration(
+            self.database, self.config.conf[self.env_handler.db_type]
         )
-        mysql_manager = MySQLManager(self.config, conn, self.input_handler)
-        mysql_manager.query_selector()
-
-    def sqlite_manager(self):
-        """Connects to the sqlite3 database and allows a user to manager the database."""
-        conn = sqlite3.connect(r"./data/betterchess.db")
-        sqlite_manager = SQLiteManager(self.config, conn, self.input_handler)
-        sqlite_manager.query_selector()
+        return migration.migrate()
@@ -0,0 +1,141 @@
+"""Module for paging through the rows of a table a page at a time.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+# Key columns each table is paged in order of, and its user and date columns.
+BROWSE_TABLES = {
+    "pgn_data": (("id",), "username", "game_datetime"),
+    "game_data": (("Username", "Game_number"), "Username", "Game_date"),
+    # Game numbers are unique, so the view is paged by the key of `moves`.
+    "move_data": (("Game_number", "Move_number"), "Username", "Game_date"),
+    "analysis_checkpoint": (("username", "game_id"), "username", "analysed_at"),
+}
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class TableBrowser:
+    """Pages through a table in key order. Each page is its own query for the rows
+    after the last key of the previous page (keyset pagination), so only one page is
+    held in memory and later pages are as quick to read as the first.
+
+    The connection is a DB-API connection of any of the supported databases - the
+    placeholder is `%s` for mysql & postgres and `?` for sqlite.
+    """
+
+    conn: object
+    placeholder: str
+    page_size: int = 50
+
+    def pages(
+        self,
+        table: str,
+        username: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Iterator[list]:
+        """Reads the rows of a table a page at a time.
+
+        Args:
+            table (str): Table name, one of `BROWSE_TABLES`.
+            username (Optional[str]): Only rows of this user.
+            start_date (Optional[datetime]): Only rows on or after this date.
+            end_date (Optional[datetime]): Only rows before this date.
+
+        Yields:
+            Iterator[list]: Rows of each page, at most `page_size`.
+        """
+        key_columns, user_column, date_column = BROWSE_TABLES[table]
+        filters, params = [], []
+        if username:
+            filters.append(f"{user_column} = {self.placeholder}")
+            params.append(username)
+        if start_date is not None:
+            filters.append(f"{date_column} >= {self.placeholder}")
+            params.append(start_date.strftime(DATE_FORMAT))
+        if end_date is not None:
+            filters.append(f"{date_column} < {self.placeholder}")
+            params.append(end_date.strftime(DATE_FORMAT))
+        keys = ", ".join(key_columns)
+        key_placeholders = ", ".join([self.placeholder] * len(key_columns))
+        curs = self.conn.cursor()
+        try:
+            last_key = None
+            while True:
+                page_filters, page_params = list(filters), list(params)
+                if last_key is not None:
+                    page_filters.append(f"({keys}) > ({key_placeholders})")
+                    page_params.extend(last_key)
+                where = f" WHERE {' AND '.join(page_filters)}" if page_filters else ""
+                curs.execute(
+                    f"SELECT * FROM {table}{where} ORDER BY {keys} LIMIT {int(self.page_size)}",
+                    page_params,
+                )
+                rows = curs.fetchall()
+                if rows:
+                    yield rows
+                if len(rows) < self.page_size:
+                    return
+                # postgres reports the unquoted column names in lower case.
+                columns = [column[0].lower() for column in curs.description]
+                last_key = [rows[-1][columns.index(key.lower())] for key in key_columns]
+        finally:
+            curs.close()
+
+    def browse(
+        self,
+        table: str,
+        username: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> int:
+        """Prints the rows of a table a page at a time, asking before each next page.
+
+        Args:
+            table (str): Table name, one of `BROWSE_TABLES`.
+            username (Optional[str]): Only rows of this user.
+            start_date (Optional[datetime]): Only rows on or after this date.
+            end_date (Optional[datetime]): Only rows before this date.
+
+        Returns:
+            int: Number of rows printed.
+        """
+        num_rows = 0
+        pages = self.pages(table, username, start_date, end_date)
+        for page_num, rows in enumerate(pages, 1):
+            for row in rows:
+                print(row)
+            num_rows += len(rows)
+            print(f"------------------------ page {page_num} ------------------------")
+            if len(rows) == self.page_size:
+                if input("Press enter for the next page or q to stop: ") == "q":
+                    pages.close()
+                    break
+        return num_rows
+
+
+def browse_inputs() -> dict:
+    """Asks which table to browse, the filters and the page size.
+
+    Returns:
+        dict: Table, username, start & end date and page size - the end date is the
+            day after the entered date so the range includes it.
+    """
+    table = input(f"Choose a table to browse ({', '.join(BROWSE_TABLES)}): ")
+    if table not in BROWSE_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    username = input("Username (leave blank for all users): ")
+    start_date = input("Start date YYYY-MM-DD (leave blank for no start): ")
+    end_date = input("End date YYYY-MM-DD (leave blank for no end): ")
+    page_size = input("Rows per page (leave blank for 50): ")
+    return {
+        "table": table,
+        "username": username or None,
+        "start_date": datetime.fromisoformat(start_date) if start_date else None,
+        "end_date": (
+            datetime.fromisoformat(end_date) + timedelta(days=1) if end_date else None
+        ),
+        "page_size": int(page_size) if page_size else 50,
+    }
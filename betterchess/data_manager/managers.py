@@ -2,131 +2,71 @@ import os
 import pathlib
 from dataclasses import dataclass
 from sqlite3 import Connection
+from typing import TYPE_CHECKING, Union
 
 from mysql.connector import MySQLConnection
 
+from betterchess.data_manager.browse import TableBrowser, browse_inputs
+from betterchess.data_manager.parquet_export import ParquetExporter
 from betterchess.utils.config import Config
+from betterchess.utils.database import SERVER_DB_TYPES
 from betterchess.utils.handlers import InputHandler
 
+if TYPE_CHECKING:
+    from psycopg2.extensions import connection as PostgresConnection
 
-@dataclass
-class MySQLManager:
-    """Manager for the mysql database - allows the user to reset the databse & logs,
-    select the head of all database tables and see the size of all the tables.
-
-    Returns:
-        None
-    """
-
-    config: Config
-    conn: MySQLConnection
-    input_handler: InputHandler
-
-    def query_selector(self):
-        """Selects the query which the user specifies."""
-        selection = input(
-            "Choose from the following list of options (reset, size, head): "
-        )
-        if selection.lower() == "reset":
-            self.reset_database()
-            self.reset_logs(folder="./logs", user=self.input_handler.username)
-        elif selection.lower() == "size":
-            self.view_table_size()
-        elif selection.lower() == "head":
-            self.select_head_all_tables()
-
-    def reset_logs(self, folder: str, user: str):
-        """Resets the logfile for the current user."""
-        filename = rf"{user}.log"
-        os.remove(f"{folder}/{filename}")
-
-    def reset_database(self):
-        """Resets the database - deletes all tables and recreates empty versions."""
-        curs = self.conn.cursor()
-        queries = [
-            self.config.conf.mysql.drop_game_table.file_path,
-            self.config.conf.mysql.drop_move_table.file_path,
-            self.config.conf.mysql.drop_pgn_table.file_path,
-            self.config.conf.mysql.create_game_table.file_path,
-            self.config.conf.mysql.create_move_table.file_path,
-            self.config.conf.mysql.create_pgn_table.file_path,
-        ]
-        for query in queries:
-            sql = self._get_sql_file(query)
-            curs.execute(sql)
-            self.conn.commit()
-        self.conn.close()
-        print("database reset")
-
-    def view_table_size(self):
-        """Views all the tables and return the number of rows in each."""
-        curs = self.conn.cursor()
-        queries = [
-            (self.config.conf.mysql.select_game_data_all.file_path, "game_data rows"),
-            (self.config.conf.mysql.select_move_data_all.file_path, "move_data rows"),
-            (self.config.conf.mysql.select_pgn_data_all.file_path, "pgn_data rows"),
-        ]
-        for query, name in queries:
-            sql = self._get_sql_file(query)
-            curs.execute(sql)
-            print(f"{name}: {len(curs.fetchall())}")
-        self.conn.close()
-
-    def select_head_all_tables(self):
-        """Select the head of all the tables."""
-        curs = self.conn.cursor()
-        queries = [
-            self.config.conf.mysql.select_game_data.file_path,
-            self.config.conf.mysql.select_move_data.file_path,
-            self.config.conf.mysql.select_pgn_data.file_path,
-        ]
-        for query in queries:
-            sql = self._get_sql_file(query)
-            curs.execute(sql)
-            rows = curs.fetchall()
-            for row in rows:
-                print(row)
-            print("-------------------------------------------------")
-        self.conn.close()
 
-    def _get_sql_file(self, sqlfilepath: str):
-        """Get an sql query for the specified filepath.
+def format_size(num_bytes: int) -> str:
+    """Formats a number of bytes as megabytes.
 
-        Args:
-            sqlfilepath (str): sqlfile path.
+    Args:
+        num_bytes (int): Size in bytes.
 
-        Returns:
-            sql (str): sql query
-        """
-        return pathlib.Path(sqlfilepath).read_text()
+    Returns:
+        str: Size e.g. `12.3 MB`.
+    """
+    return f"{num_bytes / 1024 ** 2:,.1f} MB"
 
 
 @dataclass
-class SQLiteManager:
-
-    """Manager for the mysql database - allows the user to reset the databse & logs,
-    select the head of all database tables and see the size of all the tables.
+class DatabaseManager:
+    """Manager for the database - allows the user to reset the databse & logs, select
+    the head of all database tables and see the size of all the tables. The sql files
+    are read from the `db_type` section of the config.
 
     Returns:
         None
     """
 
     config: Config
-    conn: Connection
+    conn: Union[Connection, MySQLConnection, "PostgresConnection"]
     input_handler: InputHandler
+    db_type: str
+
+    def __post_init__(self):
+        """Selects the sql files and query placeholder of the database type."""
+        self.sql_files = self.config.conf[self.db_type]
+        self.placeholder = "%s" if self.db_type in SERVER_DB_TYPES else "?"
 
     def query_selector(self):
         """Selects the query which the user specifies."""
         selection = input(
-            "Choose from the following list of options (reset, size, head): "
+            "Choose from the following list of options "
+            "(reset, size, stats, head, browse, parquet): "
         )
         if selection.lower() == "reset":
             self.reset_database()
             self.reset_logs(folder="./logs", user=self.input_handler.username)
         elif selection.lower() == "size":
             self.view_table_size()
+        elif selection.lower() == "stats":
+            self.view_table_stats()
         elif selection.lower() == "head":
             self.select_head_all_tables()
+        elif selection.lower() == "browse":
+            self.browse_table()
+        elif selection.lower() == "parquet":
+            self.export_parquet(folder="./data/parquet")
 
     def reset_logs(self, folder: str, user: str):
         """Resets the logfile for the current user."""
@@ -134,50 +74,68 @@ class SQLiteManager:
         os.remove(f"{folder}/{filename}")
 
     def reset_database(self):
-        """Resets the database - deletes all tables and recreates empty versions."""
+        """Resets the database - deletes all tables and recreates empty versions. The
+        `pgn_data` index has its own sql file where it is not part of the table."""
         curs = self.conn.cursor()
-        queries = [
-            self.config.conf.sqlite.drop_game_table.file_path,
-            self.config.conf.sqlite.drop_move_table.file_path,
-            self.config.conf.sqlite.drop_pgn_table.file_path,
-            self.config.conf.sqlite.create_game_table.file_path,
-            self.config.conf.sqlite.create_move_table.file_path,
-            self.config.conf.sqlite.create_pgn_table.file_path,
+        names = [
+            "drop_move_view",
+            "drop_game_table",
+            "drop_move_table",
+            "drop_pgn_table",
+            "drop_checkpoint_table",
+            "create_game_table",
+            "create_move_table",
+            "create_move_view",
+            "create_pgn_table",
+            "create_pgn_index",
+            "create_checkpoint_table",
         ]
-        for query in queries:
-            sql = self._get_sql_file(query)
+        for name in names:
+            if name not in self.sql_files:
+                continue
+            sql = self._get_sql_file(self.sql_files[name].file_path)
             curs.execute(sql)
             self.conn.commit()
         self.conn.close()
         print("database reset")
 
     def view_table_size(self):
-        """Views all the tables and return the number of rows in each."""
+        """Views the number of rows in each table - the rows are counted by the
+        database, so none are sent to the client."""
         curs = self.conn.cursor()
-        queries = [
-            (
-                self.config.conf.sqlite.select_game_data_all.file_path,
-                "game_data rows",
-            ),
-            (
-                self.config.conf.sqlite.select_move_data_all.file_path,
-                "move_data rows",
-            ),
-            (self.config.conf.sqlite.select_pgn_data_all.file_path, "pgn_data rows"),
-        ]
-        for query, name in queries:
-            sql = self._get_sql_file(query)
-            curs.execute(sql)
-            print(f"{name}: {len(curs.fetchall())}")
+        sql = self._get_sql_file(self.sql_files.count_table_rows.file_path)
+        curs.execute(sql)
+        for name, num_rows in curs.fetchall():
+            print(f"{name} rows: {num_rows}")
+        self.conn.close()
+
+    def view_table_stats(self):
+        """Views the row count and on-disk size of each table and index from the
+        databases own statistics (information_schema and innodb index statistics on
+        mysql, pg_class on postgres, dbstat on sqlite), then the number of rows each
+        user has in each table."""
+        curs = self.conn.cursor()
+        sql = self._get_sql_file(self.sql_files.select_table_stats.file_path)
+        curs.execute(sql)
+        for table, index, num_rows, num_bytes in curs.fetchall():
+            if index is None:
+                print(f"{table}: {num_rows} rows, {format_size(num_bytes)}")
+            else:
+                print(f"    {index}: {format_size(num_bytes)}")
+        sql = self._get_sql_file(self.sql_files.select_user_counts.file_path)
+        curs.execute(sql)
+        for table, username, num_rows in curs.fetchall():
+            print(f"{table} rows for {username}: {num_rows}")
         self.conn.close()
 
     def select_head_all_tables(self):
         """Select the head of all the tables."""
         curs = self.conn.cursor()
         queries = [
-            self.config.conf.sqlite.select_game_data.file_path,
-            self.config.conf.sqlite.select_move_data.file_path,
-            self.config.conf.sqlite.select_pgn_data.file_path,
+            self.sql_files.select_game_data.file_path,
+            self.sql_files.select_move_data.file_path,
+            self.sql_files.select_pgn_data.file_path,
+            self.sql_files.select_checkpoint_data.file_path,
         ]
         for query in queries:
             sql = self._get_sql_file(query)
@@ -188,7 +146,26 @@ class SQLiteManager:
             print("-------------------------------------------------")
         self.conn.close()
 
-    def _get_sql_file(self, sqlfilepath):
+    def browse_table(self):
+        """Pages through a table for a user and date range, a page of rows at a time
+        rather than reading the whole table."""
+        inputs = browse_inputs()
+        browser = TableBrowser(self.conn, self.placeholder, inputs.pop("page_size"))
+        browser.browse(**inputs)
+        self.conn.close()
+
+    def export_parquet(self, folder: str):
+        """Exports `game_data` and `move_data` to parquet files partitioned by user and
+        month, writing only the partitions changed since the last export."""
+        exporter = ParquetExporter(self.conn, self.placeholder, folder)
+        counts = exporter.export()
+        self.conn.close()
+        print(
+            f"parquet partitions written: {counts['written']}, "
+            f"unchanged: {counts['skipped']}, removed: {counts['removed']}"
+        )
+
+    def _get_sql_file(self, sqlfilepath: str):
         """Get an sql query for the specified filepath.
 
         Args:
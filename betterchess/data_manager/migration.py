@@ -0,0 +1,334 @@
+"""Module for upgrading an existing database to the current table definitions.
+"""
+import pathlib
+from dataclasses import dataclass
+
+from box import Box
+
+from betterchess.core.records import CompactMoveRecord, MoveRecord
+from betterchess.utils.checkpoint import DONE
+from betterchess.utils.database import Database
+from betterchess.utils.move_codes import compact_move
+from betterchess.utils.pgn_headers import game_datetime, read_headers
+from betterchess.utils.pgn_import import PgnImporter
+
+# Tables in the order they are migrated and the config entry which creates each one.
+TABLES = {
+    "pgn_data": "create_pgn_table",
+    "game_data": "create_game_table",
+    "moves": "create_move_table",
+    "analysis_checkpoint": "create_checkpoint_table",
+}
+GAME_NUMBER_MAP = "migration_game_number"
+
+
+@dataclass
+class SchemaMigration:
+    """Upgrades the tables of an existing database in place - each table is renamed,
+    recreated from its `create_*_table` sql file with the current keys and indexes and
+    its rows copied back, so running it again on a migrated database is harmless.
+
+    Rows which duplicate a key of the new tables are dropped and `pgn_data` rows
+    missing a game id or header columns are filled in from their pgn. Databases from
+    before `pgn_data` had an `id` numbered each users games by their position in
+    `pgn_data` - those game numbers are remapped to the new ids. A `move_data` table
+    from before the compact `moves` table is encoded into `moves` and replaced by the
+    `move_data` view. Columns the new tables no longer have, such as the `Game_pgn`
+    copy of each game in `game_data`, are dropped.
+    """
+
+    database: Database
+    config: Box
+    batch_size: int = 1000
+
+    def migrate(self) -> dict:
+        """Migrates every table in a single transaction - mysql commits after each
+        schema change, so back up a mysql database first.
+
+        Returns:
+            dict: Number of rows in each table after the migration.
+        """
+        with self.database.connection() as conn:
+            curs = conn.cursor()
+            if self.database.db_type == "sqlite":
+                # sqlite only opens a transaction before data changes by itself.
+                curs.execute("BEGIN IMMEDIATE")
+            old_columns = {}
+            if self.table_exists(curs, "move_data"):
+                old_columns["move_data"] = self.table_columns(curs, "move_data")
+                curs.execute("ALTER TABLE move_data RENAME TO move_data_old")
+            else:
+                curs.execute(self.sql_file("drop_move_view"))
+            for table in TABLES:
+                if self.table_exists(curs, table):
+                    old_columns[table] = self.table_columns(curs, table)
+                    curs.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+                curs.execute(self.sql_file(TABLES[table]))
+            legacy = "id" not in old_columns.get("pgn_data", ["id"])
+            duplicates = {}
+            if "pgn_data" in old_columns:
+                self.copy_rows(curs, "pgn_data", old_columns["pgn_data"])
+                if self.database.db_type == "postgres":
+                    # Copied ids do not advance the id sequence.
+                    curs.execute(
+                        "SELECT setval(pg_get_serial_sequence('pgn_data', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM pgn_data"
+                    )
+                duplicates = self.fill_pgn_columns(curs)
+            if legacy:
+                self.create_game_number_map(curs, duplicates)
+            self.delete_pgn_rows(curs, list(duplicates))
+            for table in ("game_data", "moves", "analysis_checkpoint"):
+                if table in old_columns:
+                    self.copy_rows(curs, table, old_columns[table], legacy)
+            if "move_data" in old_columns:
+                self.compact_moves(curs, old_columns["move_data"], legacy)
+            self.mark_exported_done(curs)
+            for table in old_columns:
+                curs.execute(f"DROP TABLE {table}_old")
+            if legacy:
+                curs.execute(f"DROP TABLE {GAME_NUMBER_MAP}")
+            curs.execute(self.sql_file("create_move_view"))
+            if "create_pgn_index" in self.config:
+                curs.execute(self.sql_file("create_pgn_index"))
+            num_rows = {}
+            for table in TABLES:
+                curs.execute(f"SELECT COUNT(*) FROM {table}")
+                num_rows[table] = curs.fetchone()[0]
+            curs.close()
+        return num_rows
+
+    def copy_rows(
+        self, curs, table: str, old_columns: list, legacy: bool = False
+    ) -> None:
+        """Copies the rows of the renamed table into the new table for the columns
+        both have, in their stored order.
+
+        Args:
+            curs: Cursor of the migration transaction.
+            table (str): Table name.
+            old_columns (list): Columns of the renamed table.
+            legacy (bool): Remap game numbers through the game number map.
+        """
+        new_columns = self.table_columns(curs, table)
+        columns = [column for column in new_columns if column in old_columns]
+        selected = [f"o.{column}" for column in columns]
+        source = f"{table}_old o"
+        if legacy and table != "pgn_data":
+            if table == "analysis_checkpoint":
+                user_column, game_column = "username", "game_id"
+            else:
+                user_column, game_column = "Username", "Game_number"
+            selected[columns.index(game_column)] = "m.id"
+            source += (
+                f" JOIN {GAME_NUMBER_MAP} m ON m.username = o.{user_column}"
+                f" AND m.game_number = o.{game_column}"
+            )
+        curs.execute(
+            self.database.insert_select_query(
+                table, columns, f"SELECT {', '.join(selected)} FROM {source}", True
+            )
+        )
+
+    def compact_moves(self, curs, old_columns: list, legacy: bool = False) -> None:
+        """Encodes the rows of the renamed `move_data` table into `moves`, reading
+        them in batches of `batch_size` by their old key. The old table is indexed
+        on that key first, so each batch is a range read rather than a full scan.
+
+        Args:
+            curs: Cursor of the migration transaction.
+            old_columns (list): Columns of the renamed table.
+            legacy (bool): Remap game numbers through the game number map.
+        """
+        # postgres reports the unquoted column names in lower case.
+        stored = {column.lower() for column in old_columns}
+        selected = [
+            f"o.{field}" if field.lower() in stored else "NULL"
+            for field in MoveRecord._fields
+        ]
+        source = "move_data_old o"
+        if legacy:
+            selected[MoveRecord._fields.index("Game_number")] = "m.id"
+            source += (
+                f" JOIN {GAME_NUMBER_MAP} m ON m.username = o.Username"
+                " AND m.game_number = o.Game_number"
+            )
+        keys = "o.Username, o.Game_number, o.Move_number"
+        # mysql only indexes the prefix of a TEXT column.
+        username = "Username(255)" if self.database.db_type == "mysql" else "Username"
+        curs.execute(
+            f"CREATE INDEX move_data_old_key ON move_data_old ({username}, Game_number, Move_number)"
+        )
+        placeholder = self.database.placeholder
+        insert_query = self.database.insert_query(
+            "moves", CompactMoveRecord._fields, ignore=True
+        )
+        last_key = None
+        while True:
+            where, params = "", ()
+            if last_key is not None:
+                where = f" WHERE ({keys}) > ({placeholder}, {placeholder}, {placeholder})"
+                params = last_key
+            curs.execute(
+                f"SELECT {', '.join(selected)}, {keys} FROM {source}{where} ORDER BY {keys} LIMIT {int(self.batch_size)}",
+                params,
+            )
+            rows = curs.fetchall()
+            if rows:
+                num_fields = len(MoveRecord._fields)
+                curs.executemany(
+                    insert_query,
+                    [
+                        tuple(compact_move(MoveRecord(*row[:num_fields])))
+                        for row in rows
+                    ],
+                )
+            if len(rows) < self.batch_size:
+                return
+            last_key = tuple(rows[-1][-3:])
+
+    def fill_pgn_columns(self, curs) -> dict:
+        """Fills in the game id and header columns of `pgn_data` rows stored before
+        they existed, reading the games in batches of `batch_size` by id.
+
+        Args:
+            curs: Cursor of the migration transaction.
+
+        Returns:
+            dict: Id of each game stored more than once and the id of its first row.
+        """
+        placeholder = self.database.placeholder
+        first_ids, duplicates, last_id = {}, {}, 0
+        while True:
+            curs.execute(
+                f"SELECT id, username, game_id, game_datetime, game_data FROM pgn_data WHERE id > {placeholder} ORDER BY id LIMIT {int(self.batch_size)}",
+                (last_id,),
+            )
+            rows = curs.fetchall()
+            updates = []
+            for pgn_id, username, game_id, stored_datetime, game_data in rows:
+                headers = read_headers(game_data.split(" ; "))
+                key = (username, game_id or PgnImporter.game_id(headers, game_data))
+                if key in first_ids:
+                    duplicates[pgn_id] = first_ids[key]
+                    continue
+                first_ids[key] = pgn_id
+                if game_id is None or stored_datetime is None:
+                    updates.append(
+                        (
+                            key[1],
+                            game_datetime(headers),
+                            headers.get("TimeControl"),
+                            pgn_id,
+                        )
+                    )
+            if updates:
+                curs.executemany(
+                    f"UPDATE pgn_data SET game_id = {placeholder}, game_datetime = {placeholder}, time_control = {placeholder} WHERE id = {placeholder}",
+                    updates,
+                )
+            if len(rows) < self.batch_size:
+                return duplicates
+            last_id = rows[-1][0]
+
+    def create_game_number_map(self, curs, duplicates: dict) -> None:
+        """Maps the old game numbers - each games position among the users
+        `pgn_data` rows, in the order they were stored - to the new ids. Games stored
+        more than once map to their first row. The map is keyed by username and old
+        game number, the columns the legacy rows are joined on.
+
+        Args:
+            curs: Cursor of the migration transaction.
+            duplicates (dict): Id of each duplicate game and the id of its first row.
+        """
+        curs.execute(
+            f"CREATE TABLE {GAME_NUMBER_MAP} (username VARCHAR(255), game_number INT, id INT, PRIMARY KEY (username, game_number))"
+        )
+        curs.execute("SELECT id, username FROM pgn_data ORDER BY id")
+        game_numbers, rows = {}, []
+        for pgn_id, username in curs.fetchall():
+            game_number = game_numbers.get(username, 0)
+            game_numbers[username] = game_number + 1
+            rows.append((username, game_number, duplicates.get(pgn_id, pgn_id)))
+        if rows:
+            curs.executemany(
+                self.database.insert_query(
+                    GAME_NUMBER_MAP, ["username", "game_number", "id"]
+                ),
+                rows,
+            )
+
+    def delete_pgn_rows(self, curs, pgn_ids: list) -> None:
+        """Deletes `pgn_data` rows by id.
+
+        Args:
+            curs: Cursor of the migration transaction.
+            pgn_ids (list): Ids of the rows to delete.
+        """
+        if pgn_ids:
+            curs.executemany(
+                f"DELETE FROM pgn_data WHERE id = {self.database.placeholder}",
+                [(pgn_id,) for pgn_id in pgn_ids],
+            )
+
+    def mark_exported_done(self, curs) -> None:
+        """Adds a `done` checkpoint for every game in `game_data` without one, so
+        games analysed before the checkpoint existed are not analysed again.
+
+        Args:
+            curs: Cursor of the migration transaction.
+        """
+        curs.execute(
+            self.database.insert_select_query(
+                "analysis_checkpoint",
+                ["username", "game_id", "status", "engine_depth"],
+                f"SELECT Username, Game_number, {self.database.placeholder}, Engine_depth FROM game_data",
+                ignore=True,
+            ),
+            (DONE,),
+        )
+
+    def table_exists(self, curs, table: str) -> bool:
+        """Checks if a table (not a view) exists in the database.
+
+        Args:
+            curs: Cursor of the migration transaction.
+            table (str): Table name.
+
+        Returns:
+            bool: True if the table exists.
+        """
+        if self.database.db_type == "mysql":
+            sql_query = "SELECT table_name FROM information_schema.tables WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE' AND table_name = %s"
+        elif self.database.db_type == "postgres":
+            sql_query = "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema() AND table_type = 'BASE TABLE' AND table_name = %s"
+        else:
+            sql_query = "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?"
+        curs.execute(sql_query, (table,))
+        return curs.fetchone() is not None
+
+    @staticmethod
+    def table_columns(curs, table: str) -> list:
+        """Gets the column names of a table.
+
+        Args:
+            curs: Cursor of the migration transaction.
+            table (str): Table name.
+
+        Returns:
+            list: Column names.
+        """
+        curs.execute(f"SELECT * FROM {table} WHERE 1 = 0")
+        columns = [column[0] for column in curs.description]
+        curs.fetchall()
+        return columns
+
+    def sql_file(self, name: str) -> str:
+        """Reads a sql file of the current database type from the config.
+
+        Args:
+            name (str): Config entry of the sql file.
+
+        Returns:
+            str: sql query
+        """
+        return pathlib.Path(self.config[name].file_path).read_text()
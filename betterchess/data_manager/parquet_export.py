@@ -0,0 +1,298 @@
+"""Module for exporting the analysis tables to parquet files partitioned by user and
+month, and for reading them back.
+"""
+import json
+import os
+import shutil
+import typing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from betterchess.core.records import GameRecord, MoveRecord
+
+# Exported tables and the records their column types are taken from.
+PARQUET_TABLES = {"game_data": GameRecord, "move_data": MoveRecord}
+ARROW_TYPES = {
+    str: pa.string(),
+    int: pa.int64(),
+    float: pa.float64(),
+    datetime: pa.timestamp("s"),
+}
+PARTITIONING = ds.partitioning(
+    pa.schema([("user", pa.string()), ("month", pa.string())]), flavor="hive"
+)
+MANIFEST = "manifest.json"
+# Month partition of the games without a known date.
+UNKNOWN_MONTH = "unknown"
+
+
+def arrow_schema(record: typing.Type[typing.NamedTuple]) -> pa.Schema:
+    """Arrow schema of a table from the field types of its record, so every
+    partition has the same schema whatever values it holds.
+
+    Args:
+        record (typing.Type[typing.NamedTuple]): Record of the table rows.
+
+    Returns:
+        pa.Schema: Schema of the table.
+    """
+    fields = []
+    for name, annotation in typing.get_type_hints(record).items():
+        # Optional[x] is Union[x, None].
+        field_type = (typing.get_args(annotation) or (annotation,))[0]
+        fields.append(pa.field(name, ARROW_TYPES[field_type]))
+    return pa.schema(fields)
+
+
+@dataclass
+class ParquetExporter:
+    """Exports `game_data` and `move_data` to parquet files under `folder`, one file per
+    table, user and month (`<table>/user=<username>/month=<yyyy-mm>/part-0.parquet`).
+    Games without a known date are written to the `month=unknown` partition.
+
+    Each export records a fingerprint of every partition - the number of games and the
+    sum of their game numbers - in `manifest.json`. Games and their moves are only
+    ever written together, so a partition whose fingerprint is unchanged is skipped on
+    the next export and only new or changed months are read from the database.
+
+    The connection is a DB-API connection of any of the supported databases - the
+    placeholder is `%s` for mysql & postgres and `?` for sqlite.
+    """
+
+    conn: object
+    placeholder: str
+    folder: str
+
+    def export(self, username: Optional[str] = None) -> Dict[str, int]:
+        """Writes the partitions which changed since the last export and removes
+        partitions whose games are no longer in the database.
+
+        Args:
+            username (Optional[str]): Only export the partitions of this user.
+
+        Returns:
+            Dict[str, int]: Number of partitions written, skipped and removed.
+        """
+        manifest = self.read_manifest()
+        partitions = self.partitions(username)
+        counts = {"written": 0, "skipped": 0, "removed": 0}
+        for key, fingerprint in partitions.items():
+            if manifest.get(key) == fingerprint:
+                counts["skipped"] += 1
+                continue
+            self.write_partition(*key.rsplit("/", 1))
+            manifest[key] = fingerprint
+            counts["written"] += 1
+        for key in list(manifest):
+            user, month = key.rsplit("/", 1)
+            if key not in partitions and username in (None, user):
+                for table in PARQUET_TABLES:
+                    shutil.rmtree(self.partition_path(table, user, month), True)
+                del manifest[key]
+                counts["removed"] += 1
+        self.write_manifest(manifest)
+        return counts
+
+    def partitions(self, username: Optional[str] = None) -> Dict[str, list]:
+        """Fingerprints of the user & month partitions in the database, read from
+        `game_data` - one row per partition is returned.
+
+        Args:
+            username (Optional[str]): Only the partitions of this user.
+
+        Returns:
+            Dict[str, list]: `<username>/<yyyy-mm>` and the number of games and sum
+                of the game numbers in the partition.
+        """
+        month_column = f"COALESCE(SUBSTR(Game_date, 1, 7), '{UNKNOWN_MONTH}')"
+        sql_query = f"SELECT Username, {month_column}, COUNT(*), SUM(Game_number) FROM game_data"
+        params = []
+        if username is not None:
+            sql_query += f" WHERE Username = {self.placeholder}"
+            params.append(username)
+        sql_query += f" GROUP BY Username, {month_column}"
+        curs = self.conn.cursor()
+        curs.execute(sql_query, params)
+        partitions = {
+            f"{user}/{month}": [int(num_games), int(game_number_sum)]
+            for user, month, num_games, game_number_sum in curs.fetchall()
+        }
+        curs.close()
+        return partitions
+
+    def write_partition(self, username: str, month: str) -> None:
+        """Reads the games of a user & month and their moves - through the
+        `move_data` view, which takes the user & date of each move from its game - and
+        replaces their parquet files.
+
+        Args:
+            username (str): Username of the partition.
+            month (str): Month of the partition e.g. `2023-01`, or `unknown`.
+        """
+        if month == UNKNOWN_MONTH:
+            where, params = "Game_date IS NULL", (username,)
+        else:
+            where = f"Game_date >= {self.placeholder} AND Game_date < {self.placeholder}"
+            params = (username, *self.month_range(month))
+        curs = self.conn.cursor()
+        for table, record in PARQUET_TABLES.items():
+            curs.execute(
+                f"SELECT * FROM {table} WHERE Username = {self.placeholder} AND {where}",
+                params,
+            )
+            # postgres reports the unquoted column names in lower case.
+            columns = [column[0].lower() for column in curs.description]
+            rows = curs.fetchall()
+            schema = arrow_schema(record)
+            data = {
+                name: [row[columns.index(name.lower())] for row in rows]
+                for name in schema.names
+            }
+            df = self.convert_types(pd.DataFrame(data, columns=schema.names), record)
+            arrow_table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            path = self.partition_path(table, username, month)
+            os.makedirs(path, exist_ok=True)
+            tmp_path = os.path.join(path, "part-0.parquet.tmp")
+            pq.write_table(arrow_table, tmp_path)
+            os.replace(tmp_path, os.path.join(path, "part-0.parquet"))
+        curs.close()
+
+    @staticmethod
+    def convert_types(
+        df: pd.DataFrame, record: typing.Type[typing.NamedTuple]
+    ) -> pd.DataFrame:
+        """Converts the columns read from the database to the field types of the
+        record - sqlite returns the values of `TEXT` columns as strings.
+
+        Args:
+            df (pd.DataFrame): Rows of the partition.
+            record (typing.Type[typing.NamedTuple]): Record of the table rows.
+
+        Returns:
+            pd.DataFrame: Rows with the record types.
+        """
+        for field in arrow_schema(record):
+            column = df[field.name]
+            if pa.types.is_integer(field.type):
+                df[field.name] = pd.to_numeric(column, errors="coerce").astype("Int64")
+            elif pa.types.is_floating(field.type):
+                df[field.name] = pd.to_numeric(column, errors="coerce")
+            elif pa.types.is_timestamp(field.type):
+                df[field.name] = pd.to_datetime(column, errors="coerce")
+            else:
+                df[field.name] = column.where(column.isna(), column.astype(str))
+        return df
+
+    def partition_path(self, table: str, username: str, month: str) -> str:
+        """Folder of the parquet file of a partition.
+
+        Args:
+            table (str): Table name.
+            username (str): Username of the partition.
+            month (str): Month of the partition e.g. `2023-01`.
+
+        Returns:
+            str: Folder path.
+        """
+        return os.path.join(
+            self.folder, table, f"user={quote(username, safe='')}", f"month={month}"
+        )
+
+    @staticmethod
+    def month_range(month: str) -> Tuple[str, str]:
+        """First day of the month and of the following month as stored in the text
+        `Game_date` column.
+
+        Args:
+            month (str): Month e.g. `2023-01`.
+
+        Returns:
+            Tuple[str, str]: Start and end of the month e.g. `2023-01-01`, `2023-02-01`.
+        """
+        year, month_num = (int(part) for part in month.split("-"))
+        year, month_num = (year + 1, 1) if month_num == 12 else (year, month_num + 1)
+        return f"{month}-01", f"{year:04d}-{month_num:02d}-01"
+
+    def read_manifest(self) -> Dict[str, list]:
+        """Reads the partition fingerprints of the last export.
+
+        Returns:
+            Dict[str, list]: Fingerprint of each exported partition.
+        """
+        try:
+            with open(os.path.join(self.folder, MANIFEST)) as manifest_file:
+                return json.load(manifest_file)["partitions"]
+        except FileNotFoundError:
+            return {}
+
+    def write_manifest(self, manifest: Dict[str, list]) -> None:
+        """Replaces the manifest with the partition fingerprints of this export.
+
+        Args:
+            manifest (Dict[str, list]): Fingerprint of each exported partition.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, MANIFEST)
+        with open(f"{path}.tmp", "w") as manifest_file:
+            json.dump({"partitions": manifest}, manifest_file, indent=1, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+
+
+def open_dataset(folder: str, table: str) -> ds.Dataset:
+    """Opens an exported table as a dataset - the files are memory-mapped, so column
+    scans read only the pages of the selected columns. The `user` and `month`
+    partition columns can be used in filters to skip other partitions' files.
+
+    Args:
+        folder (str): Export folder.
+        table (str): `game_data` or `move_data`.
+
+    Returns:
+        ds.Dataset: Dataset of the exported table.
+    """
+    schema = arrow_schema(PARQUET_TABLES[table])
+    for field in PARTITIONING.schema:
+        schema = schema.append(field)
+    return ds.dataset(
+        os.path.join(folder, table),
+        schema=schema,
+        format="parquet",
+        partitioning=PARTITIONING,
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def read_table(
+    folder: str,
+    table: str,
+    columns: Optional[List[str]] = None,
+    username: Optional[str] = None,
+    months: Optional[List[str]] = None,
+) -> pa.Table:
+    """Reads columns of an exported table, optionally for one user and some months.
+
+    Args:
+        folder (str): Export folder.
+        table (str): `game_data` or `move_data`.
+        columns (Optional[List[str]]): Columns to read, defaults to all.
+        username (Optional[str]): Only rows of this user.
+        months (Optional[List[str]]): Only rows of these months e.g. `["2023-01"]`.
+
+    Returns:
+        pa.Table: Rows of the table - `.to_pandas()` converts it to a dataframe.
+    """
+    expression = None
+    if username is not None:
+        expression = ds.field("user") == username
+    if months is not None:
+        month_filter = ds.field("month").isin(months)
+        expression = month_filter if expression is None else expression & month_filter
+    return open_dataset(folder, table).to_table(columns=columns, filter=expression)
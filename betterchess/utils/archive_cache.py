@@ -0,0 +1,104 @@
+"""Module for caching the downloaded chess.com monthly archives between runs.
+"""
+import gzip
+from dataclasses import dataclass
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from betterchess.utils.database import connect_sqlite
+
+
+class CachedArchive(NamedTuple):
+    """A cached archive response and the validators needed to revalidate it."""
+
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: datetime
+
+
+@dataclass
+class ArchiveCache:
+    """Disk backed (sqlite) cache of archive responses keyed by url - bodies are stored
+    gzip compressed alongside their `ETag` and `Last-Modified` headers.
+    """
+
+    path: str
+
+    def __post_init__(self):
+        """Opens the cache database and creates the cache table if needed."""
+        self.conn = connect_sqlite(self.path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS archive_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at TEXT NOT NULL,
+                body BLOB NOT NULL
+            )"""
+        )
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[CachedArchive]:
+        """Looks up the cached response of a url.
+
+        Args:
+            url (str): Archive url.
+
+        Returns:
+            Optional[CachedArchive]: Cached response, None if it has not been cached.
+        """
+        row = self.conn.execute(
+            "SELECT body, etag, last_modified, fetched_at FROM archive_cache WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return CachedArchive(
+            gzip.decompress(body),
+            etag,
+            last_modified,
+            datetime.fromisoformat(fetched_at),
+        )
+
+    def put(
+        self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        """Stores the response of a url, replacing any previous response.
+
+        Args:
+            url (str): Archive url.
+            body (bytes): Uncompressed response body.
+            etag (Optional[str]): `ETag` response header.
+            last_modified (Optional[str]): `Last-Modified` response header.
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO archive_cache (url, etag, last_modified, fetched_at, body) VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, self.now(), gzip.compress(body)),
+        )
+        self.conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Records that the cached response of a url has just been revalidated.
+
+        Args:
+            url (str): Archive url.
+        """
+        self.conn.execute(
+            "UPDATE archive_cache SET fetched_at = ? WHERE url = ?", (self.now(), url)
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def now() -> str:
+        """Current utc time, the same clock chess.com closes its monthly archives on.
+
+        Returns:
+            str: Iso formatted timestamp.
+        """
+        return datetime.utcnow().isoformat()
+
+    def close(self) -> None:
+        """Closes the cache database."""
+        self.conn.close()
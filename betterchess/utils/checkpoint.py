@@ -0,0 +1,83 @@
+"""Module for tracking which games have been analysed in the `analysis_checkpoint` table.
+"""
+import pathlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from betterchess.utils.database import Database
+
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Checkpoint:
+    """Analysis progress of each users games - one row per (username, game id) so
+    resume and skip checks are primary key lookups. A game is `done` once its rows are
+    exported, at the engine depth it was analysed at, or `failed` if its analysis
+    raised - failed games are analysed again by the next run.
+    """
+
+    database: Database
+
+    def create_table(self, path_sql: str) -> None:
+        """Creates the checkpoint table if it does not exist yet.
+
+        Args:
+            path_sql (str): Path of the `create_checkpoint_table` sql file.
+        """
+        with self.database.connection() as conn:
+            curs = conn.cursor()
+            curs.execute(pathlib.Path(path_sql).read_text())
+            curs.close()
+
+    def finish(self, conn, username: str, game_id: int, edepth: int) -> None:
+        """Marks a game as fully analysed within the transaction exporting its rows, so
+        the checkpoint is only committed together with the games analysis.
+
+        Args:
+            conn: DB-API connection of the export transaction.
+            username (str): Username of current run.
+            game_id (int): Game id.
+            edepth (int): Engine depth.
+        """
+        self.record(conn, username, game_id, DONE, edepth)
+
+    def fail(self, username: str, game_id: int, edepth: int) -> None:
+        """Marks a game whose analysis raised as failed, in its own transaction as the
+        games export never happened.
+
+        Args:
+            username (str): Username of current run.
+            game_id (int): Game id.
+            edepth (int): Engine depth.
+        """
+        with self.database.connection() as conn:
+            self.record(conn, username, game_id, FAILED, edepth)
+
+    def record(
+        self, conn, username: str, game_id: int, status: str, edepth: int
+    ) -> None:
+        """Replaces the checkpoint row of a game.
+
+        Args:
+            conn: DB-API connection of the current transaction.
+            username (str): Username of current run.
+            game_id (int): Game id.
+            status (str): `DONE` or `FAILED`.
+            edepth (int): Engine depth.
+        """
+        placeholder = self.database.placeholder
+        curs = conn.cursor()
+        curs.execute(
+            f"DELETE FROM analysis_checkpoint WHERE username = {placeholder} AND game_id = {placeholder}",
+            (username, game_id),
+        )
+        curs.execute(
+            self.database.insert_query(
+                "analysis_checkpoint",
+                ["username", "game_id", "status", "analysed_at", "engine_depth"],
+            ),
+            (username, game_id, status, datetime.now().replace(microsecond=0), edepth),
+        )
+        curs.close()
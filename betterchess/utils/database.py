@@ -0,0 +1,362 @@
+"""Module for sharing pooled database connections across a run.
+"""
+import io
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+if TYPE_CHECKING:
+    from betterchess.utils.handlers import EnvHandler
+
+# Settings every sqlite connection is opened with - WAL lets readers carry on while a
+# writer commits, NORMAL only syncs at checkpoints in WAL mode, and the busy timeout
+# (ms) makes writers from other processes wait for the write lock instead of failing.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "busy_timeout": 30000,
+}
+
+
+# Database types reached over the network, which use `%s` parameters.
+SERVER_DB_TYPES = ("mysql", "postgres")
+
+
+def connect_sqlite(path: str, **kwargs) -> sqlite3.Connection:
+    """Opens a sqlite database with the `SQLITE_PRAGMAS` settings.
+
+    Args:
+        path (str): Path of the database file.
+        **kwargs: Further `sqlite3.connect` arguments.
+
+    Returns:
+        sqlite3.Connection: Database connection.
+    """
+    conn = sqlite3.connect(
+        path, timeout=SQLITE_PRAGMAS["busy_timeout"] / 1000, **kwargs
+    )
+    for pragma, value in SQLITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma}={value}")
+    return conn
+
+
+@dataclass
+class Database:
+    """Pool of connections to the `DB_TYPE` database, created once per run and shared
+    by every worker thread.
+
+    Connections are handed out as DB-API connections so queries use the drivers own
+    parameter style - see `placeholder`. If the process is forked the pool is rebuilt
+    in the child rather than sharing the parents sockets.
+
+    Sqlite connections are opened by `connect_sqlite` and begin their write
+    transactions with `BEGIN IMMEDIATE`, so several processes can write to one
+    database file - each transaction waits for the write lock up front rather than
+    failing with "database is locked" when upgrading a read lock.
+
+    On postgres (through psycopg2) bulk inserts are loaded with `COPY` - see
+    `copy_rows`.
+    """
+
+    env_handler: "EnvHandler"
+    path_database: str
+    pool_size: int = 5
+
+    def __post_init__(self):
+        """Creates the connection pool."""
+        self.db_type = self.env_handler.db_type
+        self.placeholder = "%s" if self.db_type in SERVER_DB_TYPES else "?"
+        self._create_pool()
+
+    def _create_pool(self) -> None:
+        """Creates the sqlalchemy engine and remembers the process that owns it."""
+        if self.db_type == "mysql":
+            env = self.env_handler
+            url = f"{env.mysql_driver}://{env.mysql_user}:{env.mysql_password}@{env.mysql_host}/{env.mysql_db}"
+            engine_args = {}
+        elif self.db_type == "postgres":
+            env = self.env_handler
+            url = f"postgresql+psycopg2://{env.postgres_user}:{env.postgres_password}@{env.postgres_host}/{env.postgres_db}"
+            engine_args = {}
+        else:
+            url = "sqlite://"
+            engine_args = {
+                "creator": lambda: connect_sqlite(
+                    self.path_database,
+                    check_same_thread=False,
+                    isolation_level="IMMEDIATE",
+                )
+            }
+        self._engine = create_engine(
+            url,
+            poolclass=QueuePool,
+            pool_size=self.pool_size,
+            max_overflow=0,
+            pool_pre_ping=self.db_type in SERVER_DB_TYPES,
+            **engine_args,
+        )
+        self.pid = os.getpid()
+
+    @property
+    def engine(self) -> Engine:
+        """Sqlalchemy engine of the pool, rebuilt if the process has been forked.
+
+        Returns:
+            Engine: Sqlalchemy engine.
+        """
+        if os.getpid() != self.pid:
+            self._engine.dispose(close=False)
+            self._create_pool()
+        return self._engine
+
+    def raw_connection(self):
+        """Borrows a DB-API connection from the pool - closing it returns it to the
+        pool.
+
+        Returns:
+            DB-API connection.
+        """
+        return self.engine.raw_connection()
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """Borrows a connection for a single transaction, committing on success and
+        rolling back on error.
+
+        Yields:
+            DB-API connection.
+        """
+        conn = self.raw_connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def read_sql(self, sql_query: str, params: tuple = ()) -> pd.DataFrame:
+        """Runs a select query on a pooled connection.
+
+        Args:
+            sql_query (str): Query using `placeholder` parameters.
+            params (tuple): Query parameters.
+
+        Returns:
+            pd.DataFrame: Query result.
+        """
+        with self.connection() as conn:
+            curs = conn.cursor()
+            curs.execute(sql_query, params)
+            columns = [column[0] for column in curs.description]
+            rows = curs.fetchall()
+            curs.close()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def insert_query(self, table: str, columns: list, ignore: bool = False) -> str:
+        """Creates an insert query for the given table and columns.
+
+        Args:
+            table (str): Table name.
+            columns (list): Column names.
+            ignore (bool): Skip rows which would violate a unique key instead of
+                failing.
+
+        Returns:
+            str: sql query
+        """
+        placeholders = ", ".join(self.placeholder for _ in columns)
+        return self.insert_select_query(
+            table, columns, f"VALUES ({placeholders})", ignore
+        )
+
+    def insert_select_query(
+        self, table: str, columns: list, select: str, ignore: bool = False
+    ) -> str:
+        """Creates an insert query for the given table and columns from a `VALUES`
+        clause or a select query.
+
+        Args:
+            table (str): Table name.
+            columns (list): Column names.
+            select (str): `VALUES` clause or select query of the rows.
+            ignore (bool): Skip rows which would violate a unique key instead of
+                failing.
+
+        Returns:
+            str: sql query
+        """
+        column_names = ", ".join(columns)
+        insert, on_conflict = "INSERT", ""
+        if ignore and self.db_type == "mysql":
+            insert = "INSERT IGNORE"
+        elif ignore and self.db_type == "postgres":
+            on_conflict = " ON CONFLICT DO NOTHING"
+        elif ignore:
+            insert = "INSERT OR IGNORE"
+        return f"{insert} INTO {table} ({column_names}) {select}{on_conflict}"
+
+    def insert_df(
+        self, conn, table: str, df: pd.DataFrame, ignore: bool = False
+    ) -> int:
+        """Inserts every row of a dataframe with a single `executemany`.
+
+        Args:
+            conn: DB-API connection of the current transaction.
+            table (str): Table name.
+            df (pd.DataFrame): Rows to insert.
+            ignore (bool): Skip rows which would violate a unique key.
+
+        Returns:
+            int: Number of rows inserted.
+        """
+        if self.db_type == "postgres":
+            return self.copy_rows(
+                conn, table, list(df.columns), self.df_rows(df), ignore
+            )
+        curs = conn.cursor()
+        curs.executemany(
+            self.insert_query(table, df.columns, ignore), self.df_rows(df)
+        )
+        num_rows = curs.rowcount
+        curs.close()
+        return num_rows
+
+    def insert_records(
+        self, conn, table: str, records: list, ignore: bool = False
+    ) -> int:
+        """Inserts a list of records (NamedTuples whose fields are the table columns)
+        with a single `executemany`.
+
+        Args:
+            conn: DB-API connection of the current transaction.
+            table (str): Table name.
+            records (list): Rows to insert.
+            ignore (bool): Skip rows which would violate a unique key.
+
+        Returns:
+            int: Number of rows inserted.
+        """
+        if not records:
+            return 0
+        rows = [self.record_values(record) for record in records]
+        if self.db_type == "postgres":
+            return self.copy_rows(conn, table, records[0]._fields, rows, ignore)
+        curs = conn.cursor()
+        curs.executemany(self.insert_query(table, records[0]._fields, ignore), rows)
+        num_rows = curs.rowcount
+        curs.close()
+        return num_rows
+
+    def copy_rows(
+        self, conn, table: str, columns: list, rows: list, ignore: bool = False
+    ) -> int:
+        """Bulk loads rows into a postgres table with `COPY`. `COPY` can not skip
+        rows, so with `ignore` the rows are copied into a temporary table and inserted
+        from there with `ON CONFLICT DO NOTHING`.
+
+        Args:
+            conn: DB-API (psycopg2) connection of the current transaction.
+            table (str): Table name.
+            columns (list): Column names.
+            rows (list): Row tuples of python values.
+            ignore (bool): Skip rows which would violate a unique key.
+
+        Returns:
+            int: Number of rows inserted.
+        """
+        column_names = ", ".join(columns)
+        target = f"{table}_copy" if ignore else table
+        curs = conn.cursor()
+        if ignore:
+            curs.execute(
+                f"CREATE TEMPORARY TABLE {target} AS SELECT {column_names} FROM {table} WITH NO DATA"
+            )
+        curs.copy_expert(
+            f"COPY {target} ({column_names}) FROM STDIN WITH (FORMAT csv)",
+            self.copy_buffer(rows),
+        )
+        num_rows = curs.rowcount
+        if ignore:
+            curs.execute(
+                self.insert_select_query(
+                    table, columns, f"SELECT {column_names} FROM {target}", ignore
+                )
+            )
+            num_rows = curs.rowcount
+            curs.execute(f"DROP TABLE {target}")
+        curs.close()
+        return num_rows
+
+    @staticmethod
+    def copy_buffer(rows: list) -> io.StringIO:
+        """Writes rows as `COPY` csv - every value is quoted, so only the unquoted
+        empty fields written for None are read as NULL.
+
+        Args:
+            rows (list): Row tuples of python values.
+
+        Returns:
+            io.StringIO: Csv text of the rows.
+        """
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(
+                ",".join(
+                    "" if value is None else '"' + str(value).replace('"', '""') + '"'
+                    for value in row
+                )
+            )
+            buffer.write("\n")
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def record_values(record: tuple) -> tuple:
+        """Converts numpy scalars in a record to python values the drivers can bind.
+
+        Args:
+            record (tuple): Row to convert.
+
+        Returns:
+            tuple: Row of python values.
+        """
+        return tuple(
+            value.item() if isinstance(value, np.generic) else value
+            for value in record
+        )
+
+    @staticmethod
+    def df_rows(df: pd.DataFrame) -> list:
+        """Converts a dataframe to a list of row tuples of python values which the
+        database drivers can bind.
+
+        Args:
+            df (pd.DataFrame): Dataframe to convert.
+
+        Returns:
+            list: Row tuples.
+        """
+        records = df.astype(object).where(df.notna(), None)
+        return [
+            tuple(
+                value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+                for value in row
+            )
+            for row in records.itertuples(index=False, name=None)
+        ]
+
+    def close(self) -> None:
+        """Closes every connection in the pool."""
+        self.engine.dispose()
@@ -0,0 +1,223 @@
+"""Module for downloading the monthly chess.com game archives concurrently.
+"""
+import asyncio
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from betterchess.utils.archive_cache import ArchiveCache, CachedArchive
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class DownloadError(Exception):
+    """Raised when an archive could not be downloaded within the allowed retries."""
+
+
+@dataclass
+class HostRateLimiter:
+    """Spaces out the requests sent to each host by at least `min_interval` seconds."""
+
+    min_interval: float
+
+    def __post_init__(self):
+        """Creates the per host locks and last request times."""
+        self.locks = defaultdict(asyncio.Lock)
+        self.last_request = defaultdict(float)
+
+    async def wait(self, url: str) -> None:
+        """Waits until a request can be sent to the urls host.
+
+        Args:
+            url (str): Url about to be requested.
+        """
+        host = urlsplit(url).netloc
+        async with self.locks[host]:
+            delay = self.last_request[host] + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.last_request[host] = time.monotonic()
+
+
+@dataclass
+class ArchiveDownloader:
+    """Downloads json archives with bounded concurrency, per host rate limiting and
+    retries with exponential backoff.
+
+    With a `cache`, responses are stored on disk and cached archives are revalidated
+    with conditional requests. Urls whose archive did not change are collected in
+    `unchanged_urls`.
+    """
+
+    max_concurrency: int = 4
+    max_retries: int = 3
+    backoff: float = 0.5
+    min_interval: float = 0.1
+    timeout: float = 30.0
+    cache: Optional[ArchiveCache] = None
+
+    def download(
+        self,
+        urls: list,
+        on_done: Optional[Callable[[int], None]] = None,
+        fresh_after: Optional[dict] = None,
+    ) -> dict:
+        """Downloads all of the urls.
+
+        Args:
+            urls (list): Archive urls.
+            on_done (Optional[Callable[[int], None]]): Called with the number of
+                finished downloads after each download completes.
+            fresh_after (Optional[dict]): Datetime (utc) per url after which its
+                archive can no longer change - a cached archive fetched after it is
+                served without a request.
+
+        Returns:
+            dict: Decoded json of each url.
+        """
+        self.unchanged_urls = set()
+        if not urls:
+            return {}
+        return asyncio.run(self.download_all(urls, on_done, fresh_after))
+
+    async def download_all(
+        self,
+        urls: list,
+        on_done: Optional[Callable[[int], None]] = None,
+        fresh_after: Optional[dict] = None,
+    ) -> dict:
+        """Downloads all of the urls on a single client session.
+
+        Args:
+            urls (list): Archive urls.
+            on_done (Optional[Callable[[int], None]]): Called with the number of
+                finished downloads after each download completes.
+            fresh_after (Optional[dict]): Datetime (utc) per url after which its
+                archive can no longer change.
+
+        Returns:
+            dict: Decoded json of each url.
+        """
+        fresh_after = fresh_after or {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        rate_limiter = HostRateLimiter(self.min_interval)
+        archives = {}
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+
+            async def fetch(url: str) -> None:
+                cached = self.cache.get(url) if self.cache is not None else None
+                if self.is_fresh(cached, fresh_after.get(url)):
+                    body, modified = cached.body, False
+                else:
+                    async with semaphore:
+                        body, modified = await self.fetch_archive(
+                            session, rate_limiter, url, cached
+                        )
+                if not modified:
+                    self.unchanged_urls.add(url)
+                archives[url] = json.loads(body)
+                if on_done is not None:
+                    on_done(len(archives))
+
+            await asyncio.gather(*(fetch(url) for url in urls))
+        return archives
+
+    async def fetch_archive(
+        self,
+        session: aiohttp.ClientSession,
+        rate_limiter: HostRateLimiter,
+        url: str,
+        cached: Optional[CachedArchive] = None,
+    ) -> Tuple[bytes, bool]:
+        """Requests a url, retrying connection errors, timeouts, rate limiting and
+        server errors. A cached archive is revalidated with `If-None-Match` /
+        `If-Modified-Since`.
+
+        Args:
+            session (aiohttp.ClientSession): Client session.
+            rate_limiter (HostRateLimiter): Per host rate limiter.
+            url (str): Archive url.
+            cached (Optional[CachedArchive]): Cached response of the url.
+
+        Raises:
+            DownloadError: The url could not be downloaded within `max_retries`.
+
+        Returns:
+            Tuple[bytes, bool]: Response body and False if the cached archive was
+                not modified.
+        """
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        for attempt in range(self.max_retries + 1):
+            await rate_limiter.wait(url)
+            retry_after = None
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304 and cached is not None:
+                        self.cache.touch(url)
+                        return cached.body, False
+                    if response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        body = await response.read()
+                        if self.cache is not None:
+                            self.cache.put(
+                                url,
+                                body,
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"),
+                            )
+                        return body, True
+                    error = f"HTTP {response.status}"
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                error = repr(exc)
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_delay(attempt, retry_after))
+        raise DownloadError(
+            f"{url} failed after {self.max_retries + 1} attempts: {error}"
+        )
+
+    @staticmethod
+    def is_fresh(
+        cached: Optional[CachedArchive], fresh_after: Optional[datetime]
+    ) -> bool:
+        """Checks if a cached archive was fetched after its archive stopped changing.
+
+        Args:
+            cached (Optional[CachedArchive]): Cached response of the url.
+            fresh_after (Optional[datetime]): Datetime (utc) after which the archive
+                can no longer change.
+
+        Returns:
+            bool: True if the cached archive can be served without a request.
+        """
+        return (
+            cached is not None
+            and fresh_after is not None
+            and cached.fetched_at >= fresh_after
+        )
+
+    def retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before retrying - the servers `Retry-After` if it sent one,
+        otherwise exponential backoff.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting at 0.
+            retry_after (Optional[str]): `Retry-After` response header.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2**attempt
@@ -0,0 +1,88 @@
+"""Module for running multiple stockfish engines so games can be analysed in parallel.
+"""
+import queue
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import chess.engine
+
+
+@dataclass
+class EnginePool:
+    """Pool of stockfish processes - each analysis worker borrows one engine per game."""
+
+    path_stockfish: str
+    size: int
+    options: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Starts `size` stockfish processes with the given uci options and marks them
+        all as idle.
+        """
+        self.engines = [
+            chess.engine.SimpleEngine.popen_uci(self.path_stockfish)
+            for _ in range(self.size)
+        ]
+        if self.options:
+            for engine in self.engines:
+                engine.configure(self.options)
+        self.idle_engines: queue.Queue = queue.Queue()
+        for engine in self.engines:
+            self.idle_engines.put(engine)
+
+    @contextmanager
+    def acquire(self) -> Iterator[chess.engine.SimpleEngine]:
+        """Borrows an idle engine, blocking until one is available.
+
+        Yields:
+            chess.engine.SimpleEngine: Chess engine.
+        """
+        engine = self.idle_engines.get()
+        try:
+            yield engine
+        finally:
+            self.idle_engines.put(engine)
+
+    def close(self) -> None:
+        """Shuts down all of the stockfish processes in the pool."""
+        for engine in self.engines:
+            engine.quit()
+
+
+@dataclass
+class EngineSession:
+    """Decides how long the engine keeps its hash table.
+
+    The object returned by `game_key` is passed to the engine as `game` - python-chess
+    sends `ucinewgame`, which clears stockfish's hash table, whenever it changes.
+
+    Scopes:
+        - game: cleared at the start of every game.
+        - user: cleared when analysis moves on to a different user.
+        - never: never cleared while the engine is running.
+    """
+
+    scope: str = "game"
+
+    def __post_init__(self):
+        """Validates the scope and creates the persistent game identities."""
+        if self.scope not in ("game", "user", "never"):
+            raise ValueError(f"Unknown engine hash scope: {self.scope}")
+        self.run_game = object()
+        self.user_games: dict = {}
+
+    def game_key(self, username: str) -> object:
+        """Returns the engine game identity for the next game to be analysed.
+
+        Args:
+            username (str): Username of the current game.
+
+        Returns:
+            object: Game identity to pass to the engine for every ply of the game.
+        """
+        if self.scope == "game":
+            return object()
+        if self.scope == "user":
+            return self.user_games.setdefault(username, object())
+        return self.run_game
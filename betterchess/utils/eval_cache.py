@@ -0,0 +1,160 @@
+"""Module for caching engine evaluations of positions between runs.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import chess
+
+from betterchess.utils.database import connect_sqlite
+
+
+@dataclass
+class EvalCache:
+    """Disk backed (sqlite) cache of position evaluations keyed by normalised fen and
+    engine depth, with least recently used eviction once `max_entries` is reached.
+
+    The number of cached positions is counted once on open and kept up to date on
+    insert and eviction, so checking it is free. Commits and evictions happen every
+    `commit_every` new positions - cache hits only update `last_used`, which is
+    committed along with them.
+    """
+
+    path: str
+    max_entries: int
+    commit_every: int = 100
+
+    def __post_init__(self):
+        """Opens the cache database and creates the cache table if needed."""
+        self.lock = threading.Lock()
+        self.conn = connect_sqlite(self.path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS eval_cache (
+                fen TEXT NOT NULL,
+                depth INT NOT NULL,
+                best_move TEXT,
+                score INT,
+                last_used INT NOT NULL,
+                PRIMARY KEY (fen, depth)
+            )"""
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS eval_cache_last_used ON eval_cache (last_used)"
+        )
+        self.conn.commit()
+        self.tick = self.conn.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM eval_cache"
+        ).fetchone()[0]
+        self.num_entries = self.conn.execute(
+            "SELECT COUNT(*) FROM eval_cache"
+        ).fetchone()[0]
+        self.lookups, self.hits, self.pending = 0, 0, 0
+
+    @staticmethod
+    def position_key(board: chess.Board) -> str:
+        """Normalised fen of a position - the move counters are dropped so that
+        transpositions share a cache entry.
+
+        Args:
+            board (chess.Board): Position to key.
+
+        Returns:
+            str: Position key.
+        """
+        return board.epd()
+
+    def get(
+        self, board: chess.Board, edepth: int
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """Looks up a position in the cache.
+
+        Args:
+            board (chess.Board): Position to look up.
+            edepth (int): Engine depth.
+
+        Returns:
+            Tuple[Optional[str], Optional[int]]: Cached best move and evaluation,
+                either is None if it has not been cached.
+        """
+        key = self.position_key(board)
+        with self.lock:
+            self.lookups += 1
+            row = self.conn.execute(
+                "SELECT best_move, score FROM eval_cache WHERE fen = ? AND depth = ?",
+                (key, edepth),
+            ).fetchone()
+            if row is None:
+                return None, None
+            self.hits += 1
+            self.tick += 1
+            self.conn.execute(
+                "UPDATE eval_cache SET last_used = ? WHERE fen = ? AND depth = ?",
+                (self.tick, key, edepth),
+            )
+            return row[0], row[1]
+
+    def put(
+        self,
+        board: chess.Board,
+        edepth: int,
+        best_move: Optional[str] = None,
+        score: Optional[int] = None,
+    ) -> None:
+        """Adds a best move and/or evaluation of a position to the cache.
+
+        Args:
+            board (chess.Board): Position analysed.
+            edepth (int): Engine depth.
+            best_move (Optional[str]): Best move in the position.
+            score (Optional[int]): Evaluation of the position.
+        """
+        key = self.position_key(board)
+        with self.lock:
+            self.tick += 1
+            inserted = self.conn.execute(
+                """INSERT INTO eval_cache (fen, depth, best_move, score, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (fen, depth) DO NOTHING""",
+                (key, edepth, best_move, score, self.tick),
+            ).rowcount
+            if not inserted:
+                self.conn.execute(
+                    """UPDATE eval_cache SET
+                        best_move = COALESCE(?, best_move),
+                        score = COALESCE(?, score),
+                        last_used = ?
+                    WHERE fen = ? AND depth = ?""",
+                    (best_move, score, self.tick, key, edepth),
+                )
+                return
+            self.num_entries += 1
+            self.pending += 1
+            if self.pending >= self.commit_every:
+                self._evict()
+                self.conn.commit()
+                self.pending = 0
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries above `max_entries`."""
+        if self.num_entries > self.max_entries:
+            self.num_entries -= self.conn.execute(
+                """DELETE FROM eval_cache WHERE rowid IN (
+                    SELECT rowid FROM eval_cache ORDER BY last_used LIMIT ?
+                )""",
+                (self.num_entries - self.max_entries,),
+            ).rowcount
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups in this run that were served from the cache.
+
+        Returns:
+            float: Hit rate between 0-1.
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def close(self) -> None:
+        """Evicts, commits and closes the cache database."""
+        with self.lock:
+            self._evict()
+            self.conn.commit()
+            self.conn.close()
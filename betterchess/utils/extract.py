@@ -2,14 +2,16 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from logging import Logger
+from typing import List, Tuple
 
 import chessdotcom
-import mysql.connector
 import pandas as pd
-import requests
-from sqlalchemy import create_engine
 
+from betterchess.core.records import PgnRecord
+from betterchess.utils.archive_cache import ArchiveCache
+from betterchess.utils.download import ArchiveDownloader
 from betterchess.utils.handlers import EnvHandler, FileHandler, InputHandler, RunHandler
+from betterchess.utils.pgn_headers import game_datetime, read_headers
 
 
 @dataclass
@@ -21,197 +23,188 @@ class Extract:
     run_handler: RunHandler
     env_handler: EnvHandler
 
-    def run_data_extract(
-        self, username: str, path_userlogfile: str, logger: Logger
-    ) -> None:
+    def run_data_extract(self, username: str, logger: Logger) -> None:
         """Runs the current data extract.
 
         Args:
             username (str): Current users username.
-            logfilepath (str): Logfile path.
             logger (Logger): Logger object.
         """
-        username_list, url_date_list, games_list = [], [], []
-        self.init_user_logfile(username, logger)
         urls = chessdotcom.get_player_game_archives(username).json
-        num_urls = len(urls["archives"])
-        pgn_df = self.get_data_from_urls(
-            urls,
-            num_urls,
-            logger,
-            path_userlogfile,
-            username,
-            username_list,
-            url_date_list,
-            games_list,
-        )
-        self.export_pgn_data(pgn_df)
-
-    def init_user_logfile(self, username: str, logger: Logger) -> None:
-        """Initalises the current users logfile.
-
-        Args:
-            logger (Logger): Logger object.
-            username (str): Current users username.
-        """
-        init_extlogger = datetime(2000, 1, 1)
-        logger.info(f"| {username} | {init_extlogger}")
+        extracted_url_dates = self.get_extracted_url_dates(username)
+        pgn_df = self.get_data_from_urls(urls, logger, extracted_url_dates, username)
+        num_new = self.export_pgn_data(pgn_df)
+        message = f"{num_new} new games, {len(pgn_df) - num_new} already stored"
+        logger.info(f"| {username} | {message}")
+        print(f"\n{message}")
 
     def get_data_from_urls(
         self,
         urls: json,
-        num_urls: int,
         logger: Logger,
-        path_userlogfile: str,
+        extracted_url_dates: set,
         username: str,
-        username_list: list,
-        url_date_list: list,
-        games_list: list,
     ) -> pd.DataFrame:
         """Extracts the filtered user game data and creates a dataframe.
 
         Args:
             urls (json): All the monthly urls extracted for chess.com for a given user.
-            num_urls (int): Number of urls extracted.
             logger (Logger): Logger object.
-            path_userlogfile (str): Logfile path.
+            extracted_url_dates (set): Months which have already been extracted.
             username (str): Current users username.
-            username_list (list): list of repeated username.
-            url_date_list (list): list of repeated url dates.
-            games_list (list): list of chess games data.
 
         Returns:
             pd.DataFrame: pgn game data table.
         """
-        for url_num, url in enumerate(urls["archives"]):
-            self.simple_progress_bar(url_num, num_urls)
+        download_urls = []
+        for url in urls["archives"]:
             in_curr = self.in_curr_month(url)
-            in_log = self.url_in_log(url, path_userlogfile)
-            url_date = self.get_url_date(url)
-            logger.info(f"| {username} | {url_date}")
-            url_games_list = self.extract_filter(
-                username=username,
-                in_log=in_log,
-                in_curr=in_curr,
-                url=url,
-            )
-            try:
-                for game in url_games_list:
-                    username_list.append(username)
-                    url_date_list.append(url_date)
-                    games_list.append(game)
-            except TypeError:
+            in_log = self.url_extracted(url, extracted_url_dates)
+            logger.info(f"| {username} | {self.get_url_date(url)}")
+            if self.extract_filter(in_log=in_log, in_curr=in_curr):
+                download_urls.append(url)
+        archives, unchanged_urls = self.download_archives(download_urls)
+        records = []
+        for url in download_urls:
+            if self.url_extracted(url, extracted_url_dates) and url in unchanged_urls:
                 continue
-        game_dict = {
-            "username": username_list,
-            "url_date": url_date_list,
-            "game_data": games_list,
-        }
-        return pd.DataFrame(game_dict)
+            records.extend(
+                self.collect_game_data(archives[url], username, self.get_url_date(url))
+            )
+        return pd.DataFrame(records, columns=PgnRecord._fields)
 
-    def export_pgn_data(self, pgn_df: pd.DataFrame) -> None:
-        """Extracts teh pgn game data from a given database type.
+    def export_pgn_data(self, pgn_df: pd.DataFrame) -> int:
+        """Exports the games which are not already stored to the database - games are
+        unique by username and game id.
 
         Args:
             pgn_df (pd.DataFrame): pgn data table.
+
+        Returns:
+            int: Number of new games.
         """
-        conn = mysql.connector.connect(
-            host=self.env_handler.mysql_host,
-            user=self.env_handler.mysql_user,
-            database=self.env_handler.mysql_db,
-            password=self.env_handler.mysql_password,
-        )
-        mysql_engine = create_engine(
-            f"{self.env_handler.mysql_driver}://{self.env_handler.mysql_user}:{self.env_handler.mysql_password}@{self.env_handler.mysql_host}/{self.env_handler.mysql_db}"
-        )
-        pgn_df.to_sql(
-            name="pgn_data", con=mysql_engine, if_exists="append", index=False
-        )
-        conn.commit
-        conn.close
+        if pgn_df.empty:
+            return 0
+        database = self.run_handler.database
+        with database.connection() as conn:
+            return database.insert_df(conn, "pgn_data", pgn_df, ignore=True)
 
-    def extract_filter(
-        self, username: str, in_log: bool, in_curr: bool, url: str
-    ) -> list:
-        """Filters the data extract to only pull new games.
+    def extract_filter(self, in_log: bool, in_curr: bool) -> bool:
+        """Filters the data extract to only pull new games - months which have not
+        been extracted and the current month, which is still changing.
 
         Args:
-            username (str): Current users username.
-            in_log (bool): Is the current months extract in the logfile.
-            in_curr (bool): Is the current months extract also the current month.
-            url (str): Extract url.
+            in_log (bool): Has the urls month already been extracted.
+            in_curr (bool): Is the urls month also the current month.
 
         Returns:
-            list: game data.
+            bool: True if the url needs downloading.
         """
-        empty_list = []
-        if not in_log:
-            return self.collect_game_data(url)
-        elif not in_curr:
-            return empty_list
-        else:
-            self.filter_pgn_table(username)
-            return self.collect_game_data(url)
-
-    def filter_pgn_table(self, username: str) -> None:
-        """Filters the pgn table by removing games which have been extracted allready
-        and it is still the same month.
+        return not in_log or in_curr
+
+    def download_archives(self, urls: list) -> Tuple[dict, set]:
+        """Downloads the monthly archives concurrently from chess.com, through the
+        on-disk archive cache. Closed months which were cached after they closed are
+        served locally and the rest are revalidated with conditional requests.
 
         Args:
-            username (str): Current users username.
+            urls (list): Archive urls to download.
+
+        Returns:
+            Tuple[dict, set]: Archive json of each url and the urls whose archive has
+                not changed since it was cached.
         """
-        curr_month = self.get_curr_mth()
-        conn = mysql.connector.connect(
-            host=self.env_handler.mysql_host,
-            user=self.env_handler.mysql_user,
-            database=self.env_handler.mysql_db,
-            password=self.env_handler.mysql_password,
-        )
-        curs = conn.cursor()
-        curs.execute(
-            """delete from pgn_data where username = %s and url_date = %s""",
-            (username, curr_month),
-        )
-        conn.commit()
-        conn.close()
+        fresh_after = {url: self.next_month(self.get_url_date(url)) for url in urls}
+        archive_cache = ArchiveCache(self.file_handler.path_archive_cache)
+        try:
+            downloader = ArchiveDownloader(
+                self.env_handler.download_concurrency, cache=archive_cache
+            )
+            archives = downloader.download(
+                urls,
+                on_done=lambda num: self.simple_progress_bar(num - 1, len(urls)),
+                fresh_after=fresh_after,
+            )
+        finally:
+            archive_cache.close()
+        return archives, downloader.unchanged_urls
 
-    def collect_game_data(self, url: str) -> list:
-        """Collects the game data from chess.com.
+    @staticmethod
+    def next_month(url_date: datetime) -> datetime:
+        """Gets the first day of the month after a url date - the archive of the url
+        can no longer change from then on.
 
         Args:
-            url (str): A given chess.com api url.
+            url_date (datetime): url date.
 
         Returns:
-            list: list of game data for that url month.
+            datetime: First day of the next month.
+        """
+        if url_date.month == 12:
+            return datetime(url_date.year + 1, 1, 1)
+        return datetime(url_date.year, url_date.month + 1, 1)
+
+    @staticmethod
+    def collect_game_data(
+        archive: dict, username: str, url_date: datetime
+    ) -> List[PgnRecord]:
+        """Collects the game data from a chess.com monthly archive.
+
+        Args:
+            archive (dict): Archive json of a given chess.com api url.
+            username (str): Current users username.
+            url_date (datetime): Month of the archive.
+
+        Returns:
+            List[PgnRecord]: Rows of `pgn_data` for each game in that url month, keyed
+                by the games chess.com url.
         """
-        response = requests.get(url)
-        data = response.json()
         url_games_list = []
-        for game_pgn in data["games"]:
-            chess_game_string = str(game_pgn["pgn"]).replace("\n", " ; ")
-            url_games_list.append(chess_game_string)
+        for game_pgn in archive["games"]:
+            pgn = str(game_pgn["pgn"])
+            headers = read_headers(pgn.split("\n"))
+            url_games_list.append(
+                PgnRecord(
+                    username,
+                    url_date,
+                    game_pgn["url"],
+                    game_datetime(headers),
+                    headers.get("TimeControl"),
+                    pgn.replace("\n", " ; "),
+                )
+            )
         return url_games_list
 
-    def url_in_log(self, url: str, path_userlogfile: str) -> bool:
-        """Checks if the current url has allready been added to the logfile.
+    def get_extracted_url_dates(self, username: str) -> set:
+        """Gets the months of the users games which are already in `pgn_data`.
+
+        Args:
+            username (str): Current users username.
+
+        Returns:
+            set: Extracted url dates.
+        """
+        database = self.run_handler.database
+        url_dates = database.read_sql(
+            f"select distinct url_date from pgn_data where username = {database.placeholder} and url_date is not null",
+            (username,),
+        )
+        return {
+            url_date if isinstance(url_date, datetime) else datetime.fromisoformat(url_date)
+            for url_date in url_dates["url_date"]
+        }
+
+    def url_extracted(self, url: str, extracted_url_dates: set) -> bool:
+        """Checks if the current urls month has already been extracted.
 
         Args:
             url (str): A given chess.com api url.
-            path_userlogfile (str): path_userlogfile (str): Logfile path.
+            extracted_url_dates (set): Months which have already been extracted.
 
         Returns:
-            bool: True if url is in the logfile.
+            bool: True if url has been extracted.
         """
-        url_date = self.get_url_date(url)
-        with open(path_userlogfile, "r") as log_file:
-            lines = log_file.readlines()
-        url_date_list = []
-        for line in lines:
-            log_url_date = datetime.strptime(
-                line.split("|")[2].strip(), "%Y-%m-%d %H:%M:%S"
-            )
-            url_date_list.append(log_url_date)
-        return url_date in url_date_list
+        return self.get_url_date(url) in extracted_url_dates
 
     def in_curr_month(self, url: str) -> bool:
         """Checks if the url month date is the current month date.
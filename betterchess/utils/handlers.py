@@ -1,13 +1,16 @@
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from logging import Logger
 
-import chess
-import chess.engine
 from dotenv import load_dotenv
 
+from betterchess.utils.checkpoint import Checkpoint
+from betterchess.utils.database import Database
+from betterchess.utils.engine import EnginePool, EngineSession
+from betterchess.utils.eval_cache import EvalCache
+
 
 class EnvHandler:
     """Creates the current environment"""
@@ -26,6 +29,32 @@ class EnvHandler:
         self.mysql_db = os.getenv("mysql_db")
         self.stk_folder = str(os.getenv("stockfish_folder"))
         self.stk_file = str(os.getenv("stockfish_exe_file"))
+        self.engine_processes = int(os.getenv("engine_processes") or os.cpu_count())
+        self.eval_chaining = str(os.getenv("eval_chaining")).lower() == "true"
+        self.eval_cache_size = int(os.getenv("eval_cache_size") or 5_000_000)
+        self.engine_hash_scope = os.getenv("engine_hash_scope") or "game"
+        self.engine_hash = os.getenv("engine_hash")
+        self.engine_threads = os.getenv("engine_threads")
+        self.db_pool_size = int(os.getenv("db_pool_size") or self.engine_processes + 1)
+        self.download_concurrency = int(os.getenv("download_concurrency") or 4)
+        self.postgres_user = os.getenv("postgres_user")
+        self.postgres_password = os.getenv("postgres_password")
+        self.postgres_host = os.getenv("postgres_host")
+        self.postgres_db = os.getenv("postgres_db")
+        self.time_controls = [
+            time_control.strip()
+            for time_control in (os.getenv("time_controls") or "").split(",")
+            if time_control.strip()
+        ]
+
+    def engine_options(self) -> dict:
+        """UCI options to configure each stockfish process with.
+
+        Returns:
+            dict: `Hash` (MB) and `Threads` options which have been set.
+        """
+        options = {"Hash": self.engine_hash, "Threads": self.engine_threads}
+        return {name: int(value) for name, value in options.items() if value}
 
 
 @dataclass
@@ -50,12 +79,14 @@ class FileHandler:
 
     # Relative paths
     rpath_database: str = "../../data/betterchess.db"
-    rpath_temp: str = "../../data/temp.pgn"
+    rpath_eval_cache: str = "../../data/eval_cache.db"
+    rpath_archive_cache: str = "../../data/archive_cache.db"
     rpath_config_path: str = "../../config/datasets.yaml"
 
     # Absolute paths
     path_database: str = os.path.join(dir, rpath_database)
-    path_temp: str = os.path.join(dir, rpath_temp)
+    path_eval_cache: str = os.path.join(dir, rpath_eval_cache)
+    path_archive_cache: str = os.path.join(dir, rpath_archive_cache)
     config_path: str = os.path.join(dir, rpath_config_path)
 
     def __post_init__(self):
@@ -75,6 +106,10 @@ class RunHandler:
     """Handler for creating the logger and engine objects"""
 
     file_handler: FileHandler
+    eval_cache: EvalCache = None
+    database: Database = None
+    checkpoint: Checkpoint = None
+    engine_session: EngineSession = field(default_factory=EngineSession)
 
     def create_logger(self) -> Logger:
         """Initializes the Logger object
@@ -91,13 +126,71 @@ class RunHandler:
         self.logger = logging.getLogger(__name__)
         return self.logger
 
-    def create_engine(self) -> chess.engine.SimpleEngine:
-        """Initializes the chess engine.
+    def create_engine_pool(self, size: int, options: dict = None) -> EnginePool:
+        """Initializes a pool of chess engines for analysing games in parallel.
+
+        Args:
+            size (int): Number of stockfish processes to run.
+            options (dict): UCI options for each engine e.g. `Hash`, `Threads`.
+
+        Returns:
+            EnginePool: Pool of chess engines.
+        """
+        self.engine_pool = EnginePool(
+            self.file_handler.path_stockfish, size, options or {}
+        )
+        return self.engine_pool
+
+    def create_engine_session(self, scope: str) -> EngineSession:
+        """Initializes the engine session which decides when the engines hash table is
+        cleared.
+
+        Args:
+            scope (str): One of `game`, `user` or `never`.
+
+        Returns:
+            EngineSession: Engine session.
+        """
+        self.engine_session = EngineSession(scope)
+        return self.engine_session
+
+    def create_eval_cache(self, max_entries: int) -> EvalCache:
+        """Initializes the persistent position evaluation cache.
+
+        Args:
+            max_entries (int): Number of positions kept before the least recently used
+                are evicted.
 
         Returns:
-            chess.engine.SimpleEngine: Chess engine to enable analysis of games.
+            EvalCache: Position evaluation cache.
         """
-        self.engine = chess.engine.SimpleEngine.popen_uci(
-            self.file_handler.path_stockfish
+        self.eval_cache = EvalCache(self.file_handler.path_eval_cache, max_entries)
+        return self.eval_cache
+
+    def create_database(self, pool_size: int) -> Database:
+        """Initializes the pool of database connections shared by the run.
+
+        Args:
+            pool_size (int): Number of connections kept open.
+
+        Returns:
+            Database: Pooled database connections.
+        """
+        self.database = Database(
+            self.file_handler.env_handler, self.file_handler.path_database, pool_size
         )
-        return self.engine
+        return self.database
+
+    def create_checkpoint(self, path_sql: str) -> Checkpoint:
+        """Initializes the analysis checkpoint, creating its table if needed. Requires
+        `create_database` to have been called.
+
+        Args:
+            path_sql (str): Path of the `create_checkpoint_table` sql file.
+
+        Returns:
+            Checkpoint: Analysis checkpoint.
+        """
+        self.checkpoint = Checkpoint(self.database)
+        self.checkpoint.create_table(path_sql)
+        return self.checkpoint
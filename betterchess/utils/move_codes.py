@@ -0,0 +1,66 @@
+"""Module for the small integer codes the `moves` table stores each analysed move as -
+the `move_data` view turns them back into the strings of a `MoveRecord`.
+"""
+from typing import Optional
+
+import chess
+
+from betterchess.core.records import CompactMoveRecord, MoveRecord
+
+# Codes are the python-chess piece types, 0 is an empty square.
+PIECE_CODES = {
+    " ": 0,
+    "pawn": chess.PAWN,
+    "knight": chess.KNIGHT,
+    "bishop": chess.BISHOP,
+    "rook": chess.ROOK,
+    "queen": chess.QUEEN,
+    "king": chess.KING,
+}
+CASTLING_CODES = {"white_short": 1, "white_long": 2, "black_short": 3, "black_long": 4}
+
+
+def encode_uci(uci: Optional[str]) -> Optional[int]:
+    """Packs a uci move into 15 bits - the from square, the to square shifted by 6 and
+    the promotion piece type shifted by 12. The null move `0000` is 0.
+
+    Args:
+        uci (Optional[str]): Move in uci notation e.g. `e7e8q`.
+
+    Returns:
+        Optional[int]: Move code.
+    """
+    if uci is None:
+        return None
+    move = chess.Move.from_uci(uci)
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def compact_move(record: MoveRecord) -> CompactMoveRecord:
+    """Encodes a row of `move_data` as a row of `moves`. The username and game date
+    are those of the game and the move colour follows from the move number, so they
+    are not stored.
+
+    Args:
+        record (MoveRecord): Row of `move_data`.
+
+    Returns:
+        CompactMoveRecord: Row of `moves`.
+    """
+    return CompactMoveRecord(
+        game_id=record.Game_number,
+        move_number=record.Move_number,
+        engine_depth=record.Engine_depth,
+        move=encode_uci(record.Move),
+        move_eval=record.Move_eval,
+        best_move=encode_uci(record.Best_move),
+        best_move_eval=record.Best_move_eval,
+        move_eval_diff=record.Move_eval_diff,
+        move_accuracy=record.Move_accuracy,
+        move_type=None if record.Move_type is None else int(record.Move_type),
+        piece=PIECE_CODES.get(record.Piece),
+        castling_type=CASTLING_CODES.get(record.Castling_type),
+        white_castle_num=record.White_castle_num,
+        black_castle_num=record.Black_castle_num,
+        move_time=record.Move_time,
+    )
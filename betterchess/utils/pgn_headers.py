@@ -0,0 +1,44 @@
+"""Module for reading the header columns of `pgn_data` from a games pgn text, without
+parsing its moves.
+"""
+import re
+from datetime import datetime
+from typing import List, Optional
+
+HEADER_PATTERN = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+
+
+def read_headers(game_lines: List[str]) -> dict:
+    """Reads the header tags at the start of a game.
+
+    Args:
+        game_lines (List[str]): Lines of the game.
+
+    Returns:
+        dict: Header values by tag name.
+    """
+    headers = {}
+    for line in game_lines:
+        match = HEADER_PATTERN.match(line)
+        if match is None:
+            break
+        headers[match.group(1)] = match.group(2)
+    return headers
+
+
+def game_datetime(headers: dict) -> Optional[datetime]:
+    """Start of a game from its `UTCDate`/`UTCTime` headers, as `Headers` reads it,
+    falling back to its `Date`/`Time` headers.
+
+    Args:
+        headers (dict): Header values by tag name.
+
+    Returns:
+        Optional[datetime]: Start of the game, None if its date is unknown.
+    """
+    game_date = headers.get("UTCDate") or headers.get("Date")
+    game_time = headers.get("UTCTime") or headers.get("Time") or "00:00:00"
+    try:
+        return datetime.strptime(f"{game_date} {game_time}", "%Y.%m.%d %H:%M:%S")
+    except ValueError:
+        return None
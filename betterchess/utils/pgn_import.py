@@ -0,0 +1,177 @@
+"""Module for importing local pgn files into the `pgn_data` table.
+"""
+import bz2
+import gzip
+import hashlib
+import lzma
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Iterator, List, Optional, Tuple
+
+from betterchess.core.records import PgnRecord
+from betterchess.utils.database import Database
+from betterchess.utils.pgn_headers import game_datetime, read_headers
+
+# Leading bytes of each supported compression format and the module to open it with.
+COMPRESSIONS = (
+    (b"\x1f\x8b", gzip),
+    (b"BZh", bz2),
+    (b"\xfd7zXZ\x00", lzma),
+)
+
+
+@dataclass
+class PgnImporter:
+    """Streams the games of a pgn file (plain, gzip, bz2 or xz compressed) into
+    `pgn_data` - games are read one at a time and written in batches of `batch_size`,
+    so memory use does not grow with the size of the file.
+    """
+
+    database: Database
+    batch_size: int = 1000
+
+    def import_file(self, path_pgn: str, username: str) -> Tuple[int, int]:
+        """Imports the games of a pgn file played by the user, skipping games which are
+        already stored.
+
+        Args:
+            path_pgn (str): Path of the pgn file.
+            username (str): Username the games are imported for.
+
+        Returns:
+            Tuple[int, int]: Number of new games and number of games already stored.
+        """
+        num_new, num_games = 0, 0
+        with self.open_pgn(path_pgn) as pgn_file:
+            batch = []
+            for record in self.user_records(self.read_games(pgn_file), username):
+                batch.append(record)
+                if len(batch) == self.batch_size:
+                    num_new += self.export_batch(batch)
+                    num_games += len(batch)
+                    batch = []
+            if batch:
+                num_new += self.export_batch(batch)
+                num_games += len(batch)
+        return num_new, num_games - num_new
+
+    def export_batch(self, batch: List[PgnRecord]) -> int:
+        """Writes the new games of a batch to `pgn_data` in one transaction.
+
+        Args:
+            batch (List[PgnRecord]): Rows of `pgn_data`.
+
+        Returns:
+            int: Number of new games written.
+        """
+        with self.database.connection() as conn:
+            return self.database.insert_records(conn, "pgn_data", batch, ignore=True)
+
+    @staticmethod
+    def open_pgn(path_pgn: str) -> IO[str]:
+        """Opens a pgn file as text, decompressing it if it starts with the magic
+        bytes of a supported compression format.
+
+        Args:
+            path_pgn (str): Path of the pgn file.
+
+        Returns:
+            IO[str]: Text stream of the pgn file.
+        """
+        with open(path_pgn, "rb") as pgn_file:
+            magic = pgn_file.read(6)
+        for prefix, module in COMPRESSIONS:
+            if magic.startswith(prefix):
+                return module.open(path_pgn, "rt", encoding="utf-8", errors="replace")
+        return open(path_pgn, "r", encoding="utf-8-sig", errors="replace")
+
+    @staticmethod
+    def read_games(pgn_file: IO[str]) -> Iterator[List[str]]:
+        """Splits a pgn stream into games without parsing their moves - a game ends
+        when a header line follows its movetext outside of a comment.
+
+        Args:
+            pgn_file (IO[str]): Text stream of the pgn file.
+
+        Yields:
+            Iterator[List[str]]: Lines of each game.
+        """
+        game_lines, in_movetext, comment_depth = [], False, 0
+        for line in pgn_file:
+            line = line.rstrip("\r\n")
+            if line.startswith("[") and comment_depth == 0:
+                if in_movetext:
+                    yield game_lines
+                    game_lines, in_movetext = [], False
+            elif line.strip() and game_lines:
+                in_movetext = True
+                comment_depth += line.count("{") - line.count("}")
+                comment_depth = max(comment_depth, 0)
+            if game_lines or line.strip():
+                game_lines.append(line)
+        if in_movetext:
+            yield game_lines
+
+    def user_records(
+        self, games: Iterator[List[str]], username: str
+    ) -> Iterator[PgnRecord]:
+        """Converts the games played by the user into `pgn_data` rows - games are
+        stored on one line with ` ; ` separators as they are for chess.com extracts.
+
+        Args:
+            games (Iterator[List[str]]): Lines of each game.
+            username (str): Username the games are imported for.
+
+        Yields:
+            Iterator[PgnRecord]: Rows of `pgn_data`.
+        """
+        username_lower = username.lower()
+        for game_lines in games:
+            headers = read_headers(game_lines)
+            players = (headers.get("White", ""), headers.get("Black", ""))
+            if username_lower not in (player.lower() for player in players):
+                continue
+            while not game_lines[-1].strip():
+                game_lines.pop()
+            url_date = self.game_month(headers.get("UTCDate") or headers.get("Date"))
+            game_data = " ; ".join(game_lines)
+            yield PgnRecord(
+                username,
+                url_date,
+                self.game_id(headers, game_data),
+                game_datetime(headers),
+                headers.get("TimeControl"),
+                game_data,
+            )
+
+    @staticmethod
+    def game_id(headers: dict, game_data: str) -> str:
+        """Stable id of a game - its `Link` header (the chess.com game url, as used for
+        extracted games) or otherwise a hash of the game.
+
+        Args:
+            headers (dict): Header values by tag name.
+            game_data (str): Game stored on one line.
+
+        Returns:
+            str: Game id.
+        """
+        if headers.get("Link"):
+            return headers["Link"]
+        return f"sha1:{hashlib.sha1(game_data.encode()).hexdigest()}"
+
+    @staticmethod
+    def game_month(game_date: Optional[str]) -> Optional[datetime]:
+        """First day of the month a game was played in, like chess.com archive dates.
+
+        Args:
+            game_date (Optional[str]): `UTCDate` or `Date` header e.g. `2023.01.15`.
+
+        Returns:
+            Optional[datetime]: Month of the game, None if the date is unknown.
+        """
+        try:
+            year, month = game_date.split(".")[:2]
+            return datetime(int(year), int(month), 1)
+        except (AttributeError, ValueError):
+            return None
@@ -0,0 +1,7 @@
+SELECT 'game_data', COUNT(*) FROM game_data
+UNION ALL
+SELECT 'moves', COUNT(*) FROM moves
+UNION ALL
+SELECT 'pgn_data', COUNT(*) FROM pgn_data
+UNION ALL
+SELECT 'analysis_checkpoint', COUNT(*) FROM analysis_checkpoint
\ No newline at end of file
@@ -1,10 +1,10 @@
 CREATE TABLE game_data (
-    Username TEXT,
+    Username VARCHAR(255) NOT NULL,
     Game_date TEXT,
     Game_time_of_day TEXT,
     Game_weekday TEXT,
     Engine_depth SMALLINT,
-    Game_number SMALLINT,
+    Game_number INT NOT NULL,
     Game_type TEXT,
     White_player TEXT,
     White_rating SMALLINT,
@@ -39,5 +39,6 @@ CREATE TABLE game_data (
     Opp_castled SMALLINT,
     User_castle_phase TEXT,
     Opp_castle_phase TEXT,
-    Game_pgn TEXT
+    PRIMARY KEY (Username, Game_number),
+    UNIQUE (Game_number)
 )
\ No newline at end of file
@@ -1,20 +1,18 @@
-CREATE TABLE move_data (
-    Username TEXT,
-    Game_date TEXT,
-    Engine_depth SMALLINT,
-    Game_number SMALLINT,
-    Move_number SMALLINT,
-    Move TEXT,
-    Move_eval SMALLINT,
-    Best_move TEXT,
-    Best_move_eval SMALLINT,
-    Move_eval_diff SMALLINT,
-    Move_accuracy REAL,
-    Move_type TEXT,
-    Piece TEXT,
-    Move_colour TEXT,
-    Castling_type TEXT,
-    White_castle_num SMALLINT,
-    Black_castle_num SMALLINT,
-    Move_time REAL
+CREATE TABLE moves (
+    game_id INT NOT NULL,
+    move_number SMALLINT NOT NULL,
+    engine_depth TINYINT,
+    move SMALLINT UNSIGNED,
+    move_eval SMALLINT,
+    best_move SMALLINT UNSIGNED,
+    best_move_eval SMALLINT,
+    move_eval_diff SMALLINT,
+    move_accuracy REAL,
+    move_type TINYINT,
+    piece TINYINT,
+    castling_type TINYINT,
+    white_castle_num SMALLINT,
+    black_castle_num SMALLINT,
+    move_time REAL,
+    PRIMARY KEY (game_id, move_number)
 )
\ No newline at end of file
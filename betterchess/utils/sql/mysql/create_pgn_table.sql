@@ -1,5 +1,11 @@
 CREATE TABLE pgn_data (
-    username TEXT,
-    url_date TEXT,
-    game_data TEXT
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(255),
+    url_date DATETIME,
+    game_id VARCHAR(255),
+    game_datetime DATETIME,
+    time_control VARCHAR(32),
+    game_data TEXT,
+    UNIQUE KEY pgn_data_game (username, game_id),
+    INDEX pgn_data_user_month (username, url_date)
 )
\ No newline at end of file
@@ -0,0 +1 @@
+DROP TABLE IF EXISTS analysis_checkpoint
\ No newline at end of file
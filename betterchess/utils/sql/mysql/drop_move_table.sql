@@ -1 +1 @@
-DROP TABLE IF EXISTS move_data
\ No newline at end of file
+DROP TABLE IF EXISTS moves
\ No newline at end of file
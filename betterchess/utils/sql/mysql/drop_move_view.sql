@@ -0,0 +1 @@
+DROP VIEW IF EXISTS move_data
\ No newline at end of file
@@ -0,0 +1,3 @@
+SELECT *
+FROM analysis_checkpoint
+limit 10
\ No newline at end of file
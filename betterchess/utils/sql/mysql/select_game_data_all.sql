@@ -1 +0,0 @@
-SELECT * FROM game_data
\ No newline at end of file
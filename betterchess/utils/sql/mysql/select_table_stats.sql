@@ -0,0 +1,11 @@
+SELECT table_name, NULL, table_rows, data_length
+FROM information_schema.tables
+WHERE table_schema = DATABASE()
+    AND table_name IN ('game_data', 'moves', 'pgn_data', 'analysis_checkpoint')
+UNION ALL
+SELECT table_name, index_name, NULL, stat_value * @@innodb_page_size
+FROM mysql.innodb_index_stats
+WHERE database_name = DATABASE()
+    AND stat_name = 'size'
+    AND table_name IN ('game_data', 'moves', 'pgn_data', 'analysis_checkpoint')
+ORDER BY 1, 2
\ No newline at end of file
@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS analysis_checkpoint (
+    username VARCHAR(255) NOT NULL,
+    game_id INT NOT NULL,
+    status VARCHAR(16) NOT NULL,
+    analysed_at TIMESTAMP,
+    engine_depth SMALLINT,
+    PRIMARY KEY (username, game_id)
+)
\ No newline at end of file
@@ -0,0 +1,44 @@
+CREATE TABLE game_data (
+    Username VARCHAR(255) NOT NULL,
+    Game_date TEXT,
+    Game_time_of_day TEXT,
+    Game_weekday TEXT,
+    Engine_depth SMALLINT,
+    Game_number INT NOT NULL,
+    Game_type TEXT,
+    White_player TEXT,
+    White_rating SMALLINT,
+    Black_player TEXT,
+    Black_rating SMALLINT,
+    User_colour TEXT,
+    User_rating SMALLINT,
+    Opponent_rating SMALLINT,
+    User_win_percent REAL,
+    Opp_win_percent REAL,
+    User_winner TEXT,
+    Opening_name TEXT,
+    Opening_class TEXT,
+    Termination TEXT,
+    End_type TEXT,
+    Number_of_moves SMALLINT,
+    Accuracy REAL,
+    Opening_accuracy REAL,
+    Mid_accuracy REAL,
+    End_accuracy REAL,
+    No_best SMALLINT,
+    No_excellent SMALLINT,
+    No_good SMALLINT,
+    No_inaccuracy SMALLINT,
+    No_mistake SMALLINT,
+    No_blunder SMALLINT,
+    No_missed_win SMALLINT,
+    Improvement TEXT,
+    User_castle_num SMALLINT,
+    Opp_castle_num SMALLINT,
+    User_castled SMALLINT,
+    Opp_castled SMALLINT,
+    User_castle_phase TEXT,
+    Opp_castle_phase TEXT,
+    PRIMARY KEY (Username, Game_number),
+    UNIQUE (Game_number)
+)
\ No newline at end of file
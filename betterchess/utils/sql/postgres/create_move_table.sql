@@ -0,0 +1,18 @@
+CREATE TABLE moves (
+    game_id INT NOT NULL,
+    move_number SMALLINT NOT NULL,
+    engine_depth SMALLINT,
+    move SMALLINT,
+    move_eval SMALLINT,
+    best_move SMALLINT,
+    best_move_eval SMALLINT,
+    move_eval_diff SMALLINT,
+    move_accuracy REAL,
+    move_type SMALLINT,
+    piece SMALLINT,
+    castling_type SMALLINT,
+    white_castle_num SMALLINT,
+    black_castle_num SMALLINT,
+    move_time REAL,
+    PRIMARY KEY (game_id, move_number)
+)
\ No newline at end of file
@@ -0,0 +1,10 @@
+CREATE TABLE pgn_data (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(255),
+    url_date TIMESTAMP,
+    game_id VARCHAR(255),
+    game_datetime TIMESTAMP,
+    time_control VARCHAR(32),
+    game_data TEXT,
+    UNIQUE (username, game_id)
+)
\ No newline at end of file
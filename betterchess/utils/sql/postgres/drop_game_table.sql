@@ -0,0 +1 @@
+DROP TABLE IF EXISTS game_data
\ No newline at end of file
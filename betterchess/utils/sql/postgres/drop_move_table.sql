@@ -0,0 +1 @@
+DROP TABLE IF EXISTS moves
\ No newline at end of file
@@ -0,0 +1 @@
+DROP TABLE IF EXISTS pgn_data
\ No newline at end of file
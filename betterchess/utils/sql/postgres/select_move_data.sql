@@ -0,0 +1,3 @@
+SELECT *
+FROM move_data
+limit 10
\ No newline at end of file
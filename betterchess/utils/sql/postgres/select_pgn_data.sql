@@ -0,0 +1,3 @@
+SELECT *
+FROM pgn_data
+limit 1
\ No newline at end of file
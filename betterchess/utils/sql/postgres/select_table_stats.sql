@@ -0,0 +1,13 @@
+SELECT c.relname, NULL, NULLIF(c.reltuples, -1)::BIGINT, pg_table_size(c.oid)
+FROM pg_class c
+WHERE c.relnamespace = current_schema()::REGNAMESPACE
+    AND c.relkind = 'r'
+    AND c.relname IN ('game_data', 'moves', 'pgn_data', 'analysis_checkpoint')
+UNION ALL
+SELECT t.relname, i.relname, NULL, pg_relation_size(i.oid)
+FROM pg_index x
+JOIN pg_class i ON i.oid = x.indexrelid
+JOIN pg_class t ON t.oid = x.indrelid
+WHERE t.relnamespace = current_schema()::REGNAMESPACE
+    AND t.relname IN ('game_data', 'moves', 'pgn_data', 'analysis_checkpoint')
+ORDER BY 1, 2 NULLS FIRST
\ No newline at end of file
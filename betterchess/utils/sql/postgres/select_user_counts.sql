@@ -0,0 +1,7 @@
+SELECT 'game_data', Username, COUNT(*) FROM game_data GROUP BY Username
+UNION ALL
+SELECT 'moves', g.Username, COUNT(*) FROM moves m JOIN game_data g ON g.Game_number = m.game_id GROUP BY g.Username
+UNION ALL
+SELECT 'pgn_data', username, COUNT(*) FROM pgn_data GROUP BY username
+UNION ALL
+SELECT 'analysis_checkpoint', username, COUNT(*) FROM analysis_checkpoint GROUP BY username
\ No newline at end of file
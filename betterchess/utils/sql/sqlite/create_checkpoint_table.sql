@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS analysis_checkpoint (
+    username TEXT NOT NULL,
+    game_id INT NOT NULL,
+    status TEXT NOT NULL,
+    analysed_at TEXT,
+    engine_depth INT,
+    PRIMARY KEY (username, game_id)
+)
\ No newline at end of file
@@ -39,5 +39,6 @@ CREATE TABLE game_data (
     Opp_castled INT,
     User_castle_phase TEXT,
     Opp_castle_phase TEXT,
-    Game_pgn TEXT
+    PRIMARY KEY (Username, Game_number),
+    UNIQUE (Game_number)
 )
\ No newline at end of file
@@ -1,20 +1,18 @@
-CREATE TABLE move_data (
-    Username TEXT,
-    Game_date TEXT,
-    Engine_depth INT,
-    Game_number INT,
-    Move_number INT,
-    Move TEXT,
-    Move_eval INT,
-    Best_move TEXT,
-    Best_move_eval INT,
-    Move_eval_diff INT,
-    Move_accuracy REAL,
-    Move_type TEXT,
-    Piece TEXT,
-    Move_colour TEXT,
-    Castling_type TEXT,
-    White_castle_num INT,
-    Black_castle_num INT,
-    Move_time REAL
-)
\ No newline at end of file
+CREATE TABLE moves (
+    game_id INT NOT NULL,
+    move_number INT NOT NULL,
+    engine_depth INT,
+    move INT,
+    move_eval INT,
+    best_move INT,
+    best_move_eval INT,
+    move_eval_diff INT,
+    move_accuracy REAL,
+    move_type INT,
+    piece INT,
+    castling_type INT,
+    white_castle_num INT,
+    black_castle_num INT,
+    move_time REAL,
+    PRIMARY KEY (game_id, move_number)
+) WITHOUT ROWID
\ No newline at end of file
@@ -0,0 +1,35 @@
+CREATE VIEW IF NOT EXISTS move_data AS
+SELECT
+    g.Username,
+    g.Game_date,
+    m.engine_depth AS Engine_depth,
+    m.game_id AS Game_number,
+    m.move_number AS Move_number,
+    CASE WHEN m.move = 0 THEN '0000' ELSE RTRIM(SUBSTR('abcdefgh', (m.move % 64) % 8 + 1, 1) || ((m.move % 64) / 8 + 1) || SUBSTR('abcdefgh', (m.move / 64 % 64) % 8 + 1, 1) || ((m.move / 64 % 64) / 8 + 1) || SUBSTR('  nbrq', m.move / 4096 + 1, 1)) END AS Move,
+    m.move_eval AS Move_eval,
+    CASE WHEN m.best_move = 0 THEN '0000' ELSE RTRIM(SUBSTR('abcdefgh', (m.best_move % 64) % 8 + 1, 1) || ((m.best_move % 64) / 8 + 1) || SUBSTR('abcdefgh', (m.best_move / 64 % 64) % 8 + 1, 1) || ((m.best_move / 64 % 64) / 8 + 1) || SUBSTR('  nbrq', m.best_move / 4096 + 1, 1)) END AS Best_move,
+    m.best_move_eval AS Best_move_eval,
+    m.move_eval_diff AS Move_eval_diff,
+    m.move_accuracy AS Move_accuracy,
+    m.move_type AS Move_type,
+    CASE m.piece
+        WHEN 1 THEN 'pawn'
+        WHEN 2 THEN 'knight'
+        WHEN 3 THEN 'bishop'
+        WHEN 4 THEN 'rook'
+        WHEN 5 THEN 'queen'
+        WHEN 6 THEN 'king'
+        ELSE ' '
+    END AS Piece,
+    CASE WHEN m.move_number % 2 = 0 THEN 'white' ELSE 'black' END AS Move_colour,
+    CASE m.castling_type
+        WHEN 1 THEN 'white_short'
+        WHEN 2 THEN 'white_long'
+        WHEN 3 THEN 'black_short'
+        WHEN 4 THEN 'black_long'
+    END AS Castling_type,
+    m.white_castle_num AS White_castle_num,
+    m.black_castle_num AS Black_castle_num,
+    m.move_time AS Move_time
+FROM moves m
+JOIN game_data g ON g.Game_number = m.game_id
\ No newline at end of file
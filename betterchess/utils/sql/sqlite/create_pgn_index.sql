@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS pgn_data_user_month ON pgn_data (username, url_date)
\ No newline at end of file
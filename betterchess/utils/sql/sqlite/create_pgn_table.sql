@@ -1,5 +1,10 @@
 CREATE TABLE pgn_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
     username TEXT,
     url_date TEXT,
-    game_data TEXT
+    game_id TEXT,
+    game_datetime TEXT,
+    time_control TEXT,
+    game_data TEXT,
+    UNIQUE (username, game_id)
 )
\ No newline at end of file
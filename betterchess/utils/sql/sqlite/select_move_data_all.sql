@@ -1,2 +0,0 @@
-SELECT *
-FROM move_data
\ No newline at end of file
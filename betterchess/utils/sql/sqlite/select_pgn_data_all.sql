@@ -1,2 +0,0 @@
-SELECT *
-FROM pgn_data
\ No newline at end of file
@@ -0,0 +1,8 @@
+SELECT m.tbl_name, CASE WHEN m.type = 'index' THEN m.name END,
+    SUM(CASE WHEN m.type = 'table' AND d.pagetype = 'leaf' THEN d.ncell END),
+    SUM(d.pgsize)
+FROM sqlite_master m
+JOIN dbstat d ON d.name = m.name
+WHERE m.tbl_name IN ('game_data', 'moves', 'pgn_data', 'analysis_checkpoint')
+GROUP BY m.tbl_name, m.name
+ORDER BY 1, 2
\ No newline at end of file
@@ -3,26 +3,57 @@ from betterchess.data_manager.base_manager import BaseDataManager
 from betterchess.utils.config import Config
 from betterchess.utils.handlers import (EnvHandler, FileHandler, InputHandler,
                                         RunHandler)
+from betterchess.utils.pgn_import import PgnImporter
 
 if __name__ == '__main__':
     env_handler = EnvHandler()
     run_type = input(
-        'Do you want to run analysis or manage the database (run, manage): '
+        'Do you want to run analysis, import a pgn file, manage or migrate the '
+        'database (run, import, manage, migrate): '
     )
     config = Config()
     config.create_config()
     input_handler = InputHandler()
     input_handler.collect_user_inputs()
+    file_handler = FileHandler(input_handler.username, env_handler)
+    run_handler = RunHandler(file_handler=file_handler)
+    database = run_handler.create_database(env_handler.db_pool_size)
+    run_handler.create_checkpoint(
+        config.conf[env_handler.db_type].create_checkpoint_table.file_path
+    )
     dbm = BaseDataManager(
-        env_handler=env_handler, config=config, input_handler=input_handler
+        env_handler=env_handler,
+        config=config,
+        input_handler=input_handler,
+        database=database,
     )
     if run_type == 'manage':
         dbm.select_manager()
+    elif run_type == 'migrate':
+        num_rows = dbm.migrate_database()
+        database.close()
+        for table, rows in num_rows.items():
+            print(f'{table} rows: {rows}')
+    elif run_type == 'import':
+        path_pgn = input('Please enter the path of the pgn file: ')
+        pgn_importer = PgnImporter(database)
+        num_new, num_skipped = pgn_importer.import_file(
+            path_pgn, input_handler.username
+        )
+        database.close()
+        print(f'Imported {num_new} new games, {num_skipped} already stored')
     else:
-        file_handler = FileHandler(input_handler.username, env_handler)
-        run_handler = RunHandler(file_handler=file_handler)
-        engine = run_handler.create_engine()
+        engine_pool = run_handler.create_engine_pool(
+            env_handler.engine_processes, env_handler.engine_options()
+        )
+        engine_session = run_handler.create_engine_session(
+            env_handler.engine_hash_scope
+        )
+        eval_cache = run_handler.create_eval_cache(env_handler.eval_cache_size)
         logger = run_handler.create_logger()
         user = User(input_handler, file_handler, run_handler, env_handler)
         user.analyse()
+        engine_pool.close()
+        eval_cache.close()
+        database.close()
         print('Finished user analysis')
@@ -1,15 +1,48 @@
+import sqlite3
+import tempfile
 import unittest
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import chess.pgn
-import pandas as pd
-from pandas.testing import assert_frame_equal
+import numpy as np
 
 from betterchess.core.game import Game, Prepare
+from betterchess.core.records import GameRecord, MoveRecord
+from betterchess.core.stats import GameStats
+from betterchess.utils.checkpoint import Checkpoint
+from betterchess.utils.database import Database
 from betterchess.utils.progress import Progress
 
 
+def read_sql_file(name: str) -> str:
+    with open(f"./betterchess/utils/sql/sqlite/{name}.sql") as sql_file:
+        return sql_file.read()
+
+
+def done_game_ids(database: Database) -> list:
+    checkpoints = database.read_sql(
+        "SELECT game_id FROM analysis_checkpoint WHERE status = 'done'"
+    )
+    return checkpoints["game_id"].tolist()
+
+
+def move_record(move_num: int, move_time: float) -> MoveRecord:
+    values = dict.fromkeys(MoveRecord._fields, 1)
+    values.update(
+        Username="Ainceer",
+        Game_date=datetime(2020, 10, 10),
+        Move_number=move_num,
+        Move="e2e4",
+        Best_move="g1f3",
+        Piece="pawn",
+        Move_colour="white",
+        Castling_type=None,
+        Move_time=move_time,
+    )
+    return MoveRecord(**values)
+
+
 class TestGame(unittest.TestCase):
     def setUp(self):
         self.input_handler = MagicMock()
@@ -20,7 +53,7 @@ class TestGame(unittest.TestCase):
         self.run_handler = MagicMock()
         self.env_handler = MagicMock()
         self.iter_metadata = MagicMock()
-        self.iter_metadata.return_value = {"game_num": 1, "tot_games": 2}
+        self.iter_metadata.return_value = {"game_num": 1, "game_idx": 0, "tot_games": 2}
         self.game = Game(
             self.input_handler,
             self.file_handler,
@@ -33,7 +66,6 @@ class TestGame(unittest.TestCase):
         self.progress = Progress()
         self.chess_game = MagicMock()
         self.chess_game.mainline_moves.return_value = [1, 2, 3]
-        self.move_type_list = [2, 1, 0, -1]
         self.total_moves = 4
         self.game.game_metadata = {
             "game_datetime": 1,
@@ -43,27 +75,10 @@ class TestGame(unittest.TestCase):
                 "b_castle_num": 4,
             },
             "headers": "headers",
+            "move_rows": [],
         }
-        self.move_dict = {
-            "Num_w_best": 1,
-            "Num_w_excl": 1,
-            "Num_w_good": 1,
-            "Num_w_inac": 1,
-            "Num_w_mist": 0,
-            "Num_w_blun": 0,
-            "Num_w_misw": 0,
-            "Num_b_best": 1,
-            "Num_b_excl": 1,
-            "Num_b_good": 1,
-            "Num_b_inac": 1,
-            "Num_b_mist": 1,
-            "Num_b_blun": 1,
-            "Num_b_misw": 1,
-        }
+        self.game_stats = MagicMock()
         self.game_datetime = "10/10/2020"
-        self.game_move_acc = [1, 2, 3, 4]
-        self.w_castle_num = 3
-        self.b_castle_num = 4
         self.total_moves = 4
         self.header1 = {
             "White_rating": 1000,
@@ -86,7 +101,7 @@ class TestGame(unittest.TestCase):
             "White_player": "Other",
             "Time_control": "600",
             "Black_player": "Ainceer",
-            "User_Colour": "White",
+            "User_Colour": "Black",
             "User_rating": 1000,
             "Opponent_rating": 1200,
             "User_winner": True,
@@ -108,69 +123,135 @@ class TestGame(unittest.TestCase):
             "game_lists_dict": {"move_type_list": [1, 2, 3]},
         },
     )
-    @patch("betterchess.core.game.Prepare.all_games", return_value=1)
-    def test_run_game_analysis(
-        self, mock_ag, mock_cga, mock_a, mock_analyse_game, mock_bar
-    ):
+    def test_run_game_analysis(self, mock_cga, mock_a, mock_analyse_game, mock_bar):
+        self.game.iter_metadata = {"game_num": 1, "game_idx": 0, "tot_games": 2}
         self.game.run_game_analysis()
-        mock_ag.assert_called_once()
         mock_cga.assert_called_once()
         # mock_a.assert_called()
         mock_analyse_game.assert_called()
         mock_bar.assert_called()
 
-    @patch("betterchess.core.game.Game.sum_move_types")
+    @patch("betterchess.core.game.GameStats.from_game_lists")
     @patch("betterchess.core.game.Game.user_game_data")
     @patch("betterchess.core.game.Game.export_game_data")
-    def test_analyse_game(self, mock_egd, mock_ugd, mock_smt):
-        self.game.analyse_game(self.move_type_list, self.total_moves, self.env_handler)
+    def test_analyse_game(self, mock_egd, mock_ugd, mock_stats):
+        self.game.analyse_game(self.total_moves)
         mock_egd.assert_called_once()
         mock_ugd.assert_called_once()
-        mock_smt.assert_called_once()
-
-    def test_sum_move_types(self):
-        move_type_list = [2, 2, 1, 1, 0, 0, -1, -1, -2, -2, -3, -3, -4, -4]
-        move_dict = {
-            "Num_w_best": 1,
-            "Num_b_best": 1,
-            "Num_w_excl": 1,
-            "Num_b_excl": 1,
-            "Num_w_good": 1,
-            "Num_b_good": 1,
-            "Num_w_inac": 1,
-            "Num_b_inac": 1,
-            "Num_w_mist": 1,
-            "Num_b_mist": 1,
-            "Num_w_blun": 1,
-            "Num_b_blun": 1,
-            "Num_w_misw": 1,
-            "Num_b_misw": 1,
-        }
-        assert Game.sum_move_types(self, move_type_list) == move_dict
+        mock_stats.assert_called_once_with(
+            self.game.game_metadata["game_lists_dict"], self.total_moves
+        )
+
+    def test_export_game_data(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(MagicMock(db_type="sqlite"), f"{tmp_dir}/test.db")
+            with database.connection() as conn:
+                conn.execute(read_sql_file("create_move_table"))
+                conn.execute(read_sql_file("create_move_view"))
+                conn.execute(read_sql_file("create_game_table"))
+                conn.execute(read_sql_file("create_checkpoint_table"))
+            checkpoint = Checkpoint(database)
+            move_rows = [move_record(1, 0.5), move_record(2, 1.5)]
+            game_record = GameRecord(*(["Ainceer"] + [np.float64(1.0)] * 39))
+            self.game.export_game_data(game_record, move_rows, database, checkpoint)
+            moves = database.read_sql(
+                "SELECT Move_number, Move, Best_move, Piece, Move_time FROM move_data"
+            )
+            games = database.read_sql("SELECT Username, Accuracy FROM game_data")
+            done_games = done_game_ids(database)
+            database.close()
+        self.assertEqual(
+            moves.values.tolist(),
+            [[1, "e2e4", "g1f3", "pawn", 0.5], [2, "e2e4", "g1f3", "pawn", 1.5]],
+        )
+        self.assertEqual(games.values.tolist(), [["Ainceer", 1.0]])
+        self.assertEqual(done_games, [1])
+
+    def test_export_game_data_replaces(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(MagicMock(db_type="sqlite"), f"{tmp_dir}/test.db")
+            with database.connection() as conn:
+                conn.execute(read_sql_file("create_move_table"))
+                conn.execute(read_sql_file("create_move_view"))
+                conn.execute(read_sql_file("create_game_table"))
+                conn.execute(read_sql_file("create_checkpoint_table"))
+            checkpoint = Checkpoint(database)
+            game_record = GameRecord(*(["Ainceer"] + [1] * 39))
+            self.game.export_game_data(
+                game_record,
+                [move_record(1, 0.5), move_record(2, 1.5)],
+                database,
+                checkpoint,
+            )
+            self.game.export_game_data(
+                game_record._replace(Engine_depth=12, Accuracy=2.0),
+                [move_record(1, 3.0)],
+                database,
+                checkpoint,
+            )
+            moves = database.read_sql("SELECT Move_number, Move_time FROM move_data")
+            games = database.read_sql("SELECT Engine_depth, Accuracy FROM game_data")
+            depths = database.read_sql("SELECT engine_depth FROM analysis_checkpoint")
+            database.close()
+        self.assertEqual(moves.values.tolist(), [[1, 3.0]])
+        self.assertEqual(games.values.tolist(), [[12, 2.0]])
+        self.assertEqual(depths["engine_depth"].tolist(), [12])
+
+    def test_export_game_data_rolls_back(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(MagicMock(db_type="sqlite"), f"{tmp_dir}/test.db")
+            with database.connection() as conn:
+                conn.execute(read_sql_file("create_move_table"))
+                conn.execute(read_sql_file("create_checkpoint_table"))
+            checkpoint = Checkpoint(database)
+            move_rows = [move_record(1, 0.5)]
+            game_record = GameRecord(*(["Ainceer"] + [1] * 39))
+            with self.assertRaises(sqlite3.OperationalError):
+                self.game.export_game_data(
+                    game_record, move_rows, database, checkpoint
+                )
+            moves = database.read_sql("SELECT * FROM moves")
+            done_games = done_game_ids(database)
+            database.close()
+        self.assertTrue(moves.empty)
+        self.assertEqual(done_games, [])
+
+    def test_export_game_data_checkpoint_fails(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(MagicMock(db_type="sqlite"), f"{tmp_dir}/test.db")
+            with database.connection() as conn:
+                conn.execute(read_sql_file("create_move_table"))
+                conn.execute(read_sql_file("create_game_table"))
+            move_rows = [move_record(1, 0.5)]
+            game_record = GameRecord(*(["Ainceer"] + [1] * 39))
+            with self.assertRaises(sqlite3.OperationalError):
+                self.game.export_game_data(
+                    game_record, move_rows, database, Checkpoint(database)
+                )
+            moves = database.read_sql("SELECT * FROM moves")
+            games = database.read_sql("SELECT * FROM game_data")
+            database.close()
+        self.assertTrue(moves.empty)
+        self.assertTrue(games.empty)
 
     @patch(
-        "betterchess.core.game.Game.create_game_data_df",
-        return_value=pd.DataFrame({"a": [1, 2], "b": [1, 2]}),
+        "betterchess.core.game.Game.create_game_record",
+        return_value=MagicMock(),
     )
     @patch("betterchess.core.game.Game.collect_white_player_data", return_value=1)
-    @patch("betterchess.core.game.Game.get_curr_game_pgn", return_value=1)
     @patch("betterchess.core.game.Game.game_day_of_week", return_value=1)
     @patch("betterchess.core.game.Game.game_time_of_day", return_value=1)
     def test_user_game_data_white(
         self,
         gtod,
         gdow,
-        gcgp,
         cwpd,
         cgdd,
     ):
         cwpd.return_value = MagicMock()
         self.game.user_game_data(
-            self.move_dict,
+            self.game_stats,
             self.game_datetime,
-            self.game_move_acc,
-            self.w_castle_num,
-            self.b_castle_num,
             self.total_moves,
             self.header1,
             self.input_handler.username,
@@ -179,32 +260,26 @@ class TestGame(unittest.TestCase):
         )
         gtod.assert_called()
         gdow.assert_called()
-        gcgp.assert_called()
         cwpd.assert_called()
         cgdd.assert_called()
 
     @patch(
-        "betterchess.core.game.Game.create_game_data_df",
-        return_value=pd.DataFrame({"a": [1, 2], "b": [1, 2]}),
+        "betterchess.core.game.Game.create_game_record",
+        return_value=MagicMock(),
     )
     @patch("betterchess.core.game.Game.collect_black_player_data", return_value=1)
-    @patch("betterchess.core.game.Game.get_curr_game_pgn", return_value=1)
     @patch("betterchess.core.game.Game.game_day_of_week", return_value=1)
     @patch("betterchess.core.game.Game.game_time_of_day", return_value=1)
     def test_user_game_data_black(
         self,
         gtod,
         gdow,
-        gcgp,
         cbpd,
         cgdd,
     ):
         self.game.user_game_data(
-            self.move_dict,
+            self.game_stats,
             self.game_datetime,
-            self.game_move_acc,
-            self.w_castle_num,
-            self.b_castle_num,
             self.total_moves,
             self.header2,
             self.input_handler.username,
@@ -213,11 +288,27 @@ class TestGame(unittest.TestCase):
         )
         gtod.assert_called()
         gdow.assert_called()
-        gcgp.assert_called()
         cbpd.assert_called()
         cgdd.assert_called()
 
-    def test_create_game_data_df(self):
+    def test_collect_player_data(self):
+        game_stats = GameStats(
+            [2, -3, 1, 0], [100, 20, 99.6, 90], [0, 0, 2, 0], [0] * 4, 3
+        )
+        self.game.collect_black_player_data(game_stats, self.header2)
+        self.assertEqual(self.game.game_acc, 55)
+        self.assertEqual(self.game.opn_acc, 20)
+        self.assertEqual(self.game.num_blun_mv, 1)
+        self.assertEqual(self.game.num_good_mv, 1)
+        self.assertEqual(self.game.num_best_mv, 0)
+        self.assertEqual(self.game.user_castle_mv, 0)
+        self.assertEqual(self.game.opp_castle_mv, 2)
+        self.assertEqual(self.game.user_castle_phase, "None")
+        self.assertEqual(self.game.opp_castle_phase, "Midgame")
+        self.assertEqual(self.game.user_win_percent, 75.97)
+        self.assertEqual(self.game.opp_win_percent, 24.03)
+
+    def test_create_game_record(self):
         self.game.time_of_day = "11"
         self.game.day_of_week = "Monday"
         self.game.user_win_percent = 0.9
@@ -240,9 +331,8 @@ class TestGame(unittest.TestCase):
         self.game.opp_castled = 1
         self.game.user_castle_phase = "opening"
         self.game.opp_castle_phase = "opening"
-        self.game.game_pgn = "pgn"
 
-        actual = self.game.create_game_data_df(
+        actual = self.game.create_game_record(
             self.game_datetime,
             self.total_moves,
             self.header1,
@@ -251,54 +341,50 @@ class TestGame(unittest.TestCase):
             self.game_num,
         )
 
-        expected = pd.DataFrame(
-            {
-                "Username": self.input_handler.username,
-                "Game_date": self.game_datetime,
-                "Game_time_of_day": self.game.time_of_day,
-                "Game_weekday": self.game.day_of_week,
-                "Engine_depth": self.input_handler.edepth,
-                "Game_number": self.game_num,
-                "Game_type": self.header1["Time_control"],
-                "White_player": self.header1["White_player"],
-                "White_rating": self.header1["White_rating"],
-                "Black_player": self.header1["Black_player"],
-                "Black_rating": self.header1["Black_rating"],
-                "User_colour": self.header1["User_Colour"],
-                "User_rating": self.header1["User_rating"],
-                "Opponent_rating": self.header1["Opponent_rating"],
-                "User_win_percent": self.game.user_win_percent,
-                "Opp_win_percent": self.game.opp_win_percent,
-                "User_winner": self.header1["User_winner"],
-                "Opening_name": self.header1["Opening_name"],
-                "Opening_class": self.header1["Opening_class"],
-                "Termination": self.header1["Termination"],
-                "End_type": self.header1["Win_draw_loss"],
-                "Number_of_moves": self.total_moves,
-                "Accuracy": self.game.game_acc,
-                "Opening_accuracy": self.game.opn_acc,
-                "Mid_accuracy": self.game.mid_acc,
-                "End_accuracy": self.game.end_acc,
-                "No_best": self.game.num_best_mv,
-                "No_excellent": self.game.num_excl_mv,
-                "No_good": self.game.num_good_mv,
-                "No_inaccuracy": self.game.num_inac_mv,
-                "No_mistake": self.game.num_mist_mv,
-                "No_blunder": self.game.num_blun_mv,
-                "No_missed_win": self.game.num_misw_mv,
-                "Improvement": self.game.sec_improve,
-                "User_castle_num": self.game.user_castle_mv,
-                "Opp_castle_num": self.game.opp_castle_mv,
-                "User_castled": self.game.user_castled,
-                "Opp_castled": self.game.opp_castled,
-                "User_castle_phase": self.game.user_castle_phase,
-                "Opp_castle_phase": self.game.opp_castle_phase,
-                "Game_pgn": self.game.game_pgn,
-            },
-            index=[0],
+        expected = GameRecord(
+            Username=self.input_handler.username,
+            Game_date=self.game_datetime,
+            Game_time_of_day=self.game.time_of_day,
+            Game_weekday=self.game.day_of_week,
+            Engine_depth=self.input_handler.edepth,
+            Game_number=self.game_num,
+            Game_type=self.header1["Time_control"],
+            White_player=self.header1["White_player"],
+            White_rating=self.header1["White_rating"],
+            Black_player=self.header1["Black_player"],
+            Black_rating=self.header1["Black_rating"],
+            User_colour=self.header1["User_Colour"],
+            User_rating=self.header1["User_rating"],
+            Opponent_rating=self.header1["Opponent_rating"],
+            User_win_percent=self.game.user_win_percent,
+            Opp_win_percent=self.game.opp_win_percent,
+            User_winner=self.header1["User_winner"],
+            Opening_name=self.header1["Opening_name"],
+            Opening_class=self.header1["Opening_class"],
+            Termination=self.header1["Termination"],
+            End_type=self.header1["Win_draw_loss"],
+            Number_of_moves=self.total_moves,
+            Accuracy=self.game.game_acc,
+            Opening_accuracy=self.game.opn_acc,
+            Mid_accuracy=self.game.mid_acc,
+            End_accuracy=self.game.end_acc,
+            No_best=self.game.num_best_mv,
+            No_excellent=self.game.num_excl_mv,
+            No_good=self.game.num_good_mv,
+            No_inaccuracy=self.game.num_inac_mv,
+            No_mistake=self.game.num_mist_mv,
+            No_blunder=self.game.num_blun_mv,
+            No_missed_win=self.game.num_misw_mv,
+            Improvement=self.game.sec_improve,
+            User_castle_num=self.game.user_castle_mv,
+            Opp_castle_num=self.game.opp_castle_mv,
+            User_castled=self.game.user_castled,
+            Opp_castled=self.game.opp_castled,
+            User_castle_phase=self.game.user_castle_phase,
+            Opp_castle_phase=self.game.opp_castle_phase,
         )
 
-        assert_frame_equal(actual, expected)
+        self.assertEqual(actual, expected)
 
     def test_game_time_of_day_night(self):
         game_datetime = datetime(2022, 5, 29, 4, 35, 47)
@@ -320,176 +406,15 @@ class TestGame(unittest.TestCase):
         game_datetime = datetime(2022, 5, 29, 19, 35, 47)
         assert Game.game_day_of_week(game_datetime) == "Sunday"
 
-    def test_game_w_acc(self):
-        game_move_acc = [90, 80, 90, 80, 90, 80]
-        assert Game.game_w_acc(game_move_acc) == 90
-
-    def test_game_w_acc_zero(self):
-        game_move_acc = []
-        assert Game.game_w_acc(game_move_acc) == 0
-
-    def test_game_b_acc(self):
-        game_move_acc = [90, 80, 90, 80, 90, 80]
-        assert Game.game_b_acc(game_move_acc) == 80
-
-    def test_game_b_acc_zero(self):
-        game_move_acc = []
-        assert Game.game_b_acc(game_move_acc) == 0
-
-    def test_op_w_acc(self):
-        game_move_acc = [90, 80, 90, 80, 30, 20, 30, 20, 70, 60, 70, 60]
-        assert Game.op_w_acc(game_move_acc) == 90
-
-    def test_op_w_acc_zero(self):
-        game_move_acc = []
-        assert Game.op_w_acc(game_move_acc) == 0
-
-    def test_mid_w_acc(self):
-        game_move_acc = [90, 80, 90, 80, 30, 20, 30, 20, 70, 60, 70, 60]
-        assert Game.mid_w_acc(game_move_acc) == 30
-
-    def test_mid_w_acc_zero(self):
-        game_move_acc = []
-        assert Game.mid_w_acc(game_move_acc) == 0
-
-    def test_end_w_acc(self):
-        game_move_acc = [90, 80, 90, 80, 30, 20, 30, 20, 70, 60, 70, 60]
-        assert Game.end_w_acc(game_move_acc) == 70
-
-    def test_end_w_acc_zero(self):
-        game_move_acc = []
-        assert Game.end_w_acc(game_move_acc) == 0
-
-    def test_op_b_acc(self):
-        game_move_acc = [90, 80, 90, 80, 30, 20, 30, 20, 70, 60, 70, 60]
-        assert Game.op_b_acc(game_move_acc) == 80
-
-    def test_op_b_acc_zero(self):
-        game_move_acc = []
-        assert Game.op_b_acc(game_move_acc) == 0
-
-    def test_mid_b_acc(self):
-        game_move_acc = [90, 80, 90, 80, 30, 20, 30, 20, 70, 60, 70, 60]
-        assert Game.mid_b_acc(game_move_acc) == 20
-
-    def test_mid_b_acc_zero(self):
-        game_move_acc = []
-        assert Game.mid_b_acc(game_move_acc) == 0
-
-    def test_end_b_acc(self):
-        game_move_acc = [90, 80, 90, 80, 30, 20, 30, 20, 70, 60, 70, 60]
-        assert Game.end_b_acc(game_move_acc) == 60
-
-    def test_end_b_acc_zero(self):
-        game_move_acc = []
-        assert Game.end_b_acc(game_move_acc) == 0
-
-    def test_w_sec_imp_opening(self):
-        ow, mw, ew = 80.0, 90.0, 90.0
-        assert Game.w_sec_imp(ow, mw, ew) == "Opening"
-
-    def test_w_sec_imp_midgame(self):
-        ow, mw, ew = 90.0, 80.0, 90.0
-        assert Game.w_sec_imp(ow, mw, ew) == "Midgame"
-
-    def test_w_sec_imp_endgame(self):
-        ow, mw, ew = 90.0, 90.0, 80.0
-        assert Game.w_sec_imp(ow, mw, ew) == "Endgame"
-
-    def test_b_sec_imp_opening(self):
-        ob, mb, eb = 80.0, 90.0, 90.0
-        assert Game.b_sec_imp(ob, mb, eb) == "Opening"
-
-    def test_b_sec_imp_midgame(self):
-        ob, mb, eb = 90.0, 80.0, 90.0
-        assert Game.b_sec_imp(ob, mb, eb) == "Midgame"
-
-    def test_b_sec_imp_endgame(self):
-        ob, mb, eb = 90.0, 90.0, 80.0
-        assert Game.b_sec_imp(ob, mb, eb) == "Endgame"
-
-    def test_white_castle_move_num(self):
-        white_castle_num = [0, 0, 0, 15]
-        assert Game.white_castle_move_num(white_castle_num) == 15
-
-    def test_black_castle_move_num(self):
-        black_castle_num = [0, 0, 0, 31]
-        assert Game.black_castle_move_num(black_castle_num) == 31
-
-    def test_has_white_castled_yes(self):
-        white_castle_num = [0, 0, 0, 1]
-        assert Game.has_white_castled(white_castle_num) == 1
-
-    def test_has_white_castled_no(self):
-        white_castle_num = [0, 0, 0, 0]
-        assert Game.has_white_castled(white_castle_num) == 0
-
-    def test_has_black_castled_yes(self):
-        black_castle_num = [0, 0, 0, 2]
-        assert Game.has_black_castled(black_castle_num) == 1
-
-    def test_has_black_castled_no(self):
-        black_castle_num = [0, 0, 0, 0]
-        assert Game.has_black_castled(black_castle_num) == 0
-
-    def test_white_castle_phase_opening(self):
-        white_castle_num = [0, 1]
-        total_moves = 10
-        assert Game.white_castle_phase(white_castle_num, total_moves) == "Opening"
-
-    def test_white_castle_phase_midgame(self):
-        white_castle_num = [0, 0, 0, 0, 5]
-        total_moves = 10
-        assert Game.white_castle_phase(white_castle_num, total_moves) == "Midgame"
-
-    def test_white_castle_phase_endgame(self):
-        white_castle_num = [0, 0, 0, 0, 0, 0, 0, 0, 0, 9]
-        total_moves = 10
-        assert Game.white_castle_phase(white_castle_num, total_moves) == "Endgame"
-
-    def test_white_castle_phase_none(self):
-        white_castle_num = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-        total_moves = 10
-        assert Game.white_castle_phase(white_castle_num, total_moves) == "None"
-
-    def test_white_castle_phase_totnone(self):
-        white_castle_num = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-        total_moves = 0
-        assert Game.white_castle_phase(white_castle_num, total_moves) == "None"
-
-    def test_black_castle_phase_opening(self):
-        black_castle_num = [0, 1]
-        total_moves = 10
-        assert Game.black_castle_phase(black_castle_num, total_moves) == "Opening"
-
-    def test_black_castle_phase_midgame(self):
-        black_castle_num = [0, 0, 0, 0, 5]
-        total_moves = 10
-        assert Game.black_castle_phase(black_castle_num, total_moves) == "Midgame"
-
-    def test_black_castle_phase_endgame(self):
-        black_castle_num = [0, 0, 0, 0, 0, 0, 0, 0, 0, 9]
-        total_moves = 10
-        assert Game.black_castle_phase(black_castle_num, total_moves) == "Endgame"
-
-    def test_black_castle_phase_none(self):
-        black_castle_num = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-        total_moves = 10
-        assert Game.black_castle_phase(black_castle_num, total_moves) == "None"
-
-    def test_black_castle_phase_totnone(self):
-        black_castle_num = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-        total_moves = 0
-        assert Game.black_castle_phase(black_castle_num, total_moves) == "None"
-
     def test_get_predicted_win_percentage(self):
         p1 = 400
         p2 = 400
         assert Game.get_predicted_win_percentage(p1, p2) == 50.0
 
-    def test_get_curr_game_pgn(self):
-        path_temp = r"./tests/test_core/fixtures/test_game.pgn"
-        assert Game.get_curr_game_pgn(path_temp) == "['chess game']"
+    def test_unknown_date_and_rating(self):
+        assert Game.game_time_of_day(None) is None
+        assert Game.game_day_of_week(None) is None
+        assert Game.get_predicted_win_percentage(None, 400) is None
 
 
 class TestPrepare(unittest.TestCase):
@@ -500,39 +425,26 @@ class TestPrepare(unittest.TestCase):
         self.input_handler.username = "Ainceer"
         self.input_handler.edepth = 1
         self.file_handler = MagicMock()
-        self.file_handler.path_temp = "./temp"
         self.run_handler = MagicMock()
         self.env_handler = MagicMock()
         self.iter_metadata = MagicMock()
-        self.iter_metadata.return_value = {"game_num": 1, "tot_games": 2}
-
-    def test_logfile_line_checker_multi_empty_input(self):
-        game_log_list = []
-        lines = []
-        Prepare.logfile_line_checker_multi(self, game_log_list, lines)
-        self.assertEqual(game_log_list, [])
-
-    def test_logfile_line_checker_multi(self):
-        game_log_list = []
-        lines = ["user", "game", "other"]
-        Prepare.logfile_line_checker_multi(self, game_log_list, lines)
-        self.assertEqual("user" in game_log_list, True)
-        self.assertEqual("game" in game_log_list, True)
-        self.assertEqual("other" in game_log_list, False)
+        self.iter_metadata.return_value = {"game_num": 1, "game_idx": 0, "tot_games": 2}
 
     @patch(
         "betterchess.core.headers.Headers.collect",
         return_value={"Game_datetime": "10-10-2020"},
     )
     @patch("betterchess.core.game.Prepare.init_game_lists", return_value=[1, 2, 3, 4])
+    @patch("betterchess.core.game.Prepare.init_move_times", return_value=[1.0, 2.0])
     @patch("betterchess.core.game.Prepare.init_board", return_value="board")
     @patch("betterchess.core.game.Prepare.init_game", return_value="chess_game")
-    def test_current_game_analysis(self, mock_ig, mock_ib, mock_igl, mock_col):
+    def test_current_game_analysis(self, mock_ig, mock_ib, mock_imt, mock_igl, mock_col):
         self.prepare.current_game_analysis(
             self.input_handler, self.file_handler, self.run_handler, self.iter_metadata
         )
         mock_ig.assert_called()
         mock_ib.assert_called()
+        mock_imt.assert_called_with("chess_game")
         mock_igl.assert_called()
         mock_col.assert_called()
         assert self.prepare.current_game_analysis(
@@ -542,16 +454,20 @@ class TestPrepare(unittest.TestCase):
             "game_datetime": "10-10-2020",
             "board": "board",
             "chess_game": "chess_game",
+            "move_times": [1.0, 2.0],
             "game_lists_dict": [1, 2, 3, 4],
+            "move_rows": [],
+            "pre_move_info": None,
+            "engine_game": self.run_handler.engine_session.game_key.return_value,
         }
 
     def test_init_game(self):
-        path_temp = r"./tests/test_core/fixtures/testpgnfile.pgn"
-        chess_game_pgn = open(path_temp)
-        expected = chess.pgn.read_game(chess_game_pgn)
-        ob1 = isinstance(expected, chess.Board)
-        ob2 = isinstance(self.prepare.init_game(path_temp), chess.Board)
-        assert ob1 == ob2
+        with open(r"./tests/test_core/fixtures/testpgnfile.pgn") as chess_game_pgn:
+            game_pgn = chess_game_pgn.read()
+        chess_game = self.prepare.init_game(game_pgn)
+        assert isinstance(chess_game, chess.pgn.Game)
+        assert chess_game.headers["White"] == "JezzaShaw"
+        assert len(list(chess_game.mainline_moves())) == 69
 
     def test_init_board(self):
         path_temp = r"./tests/test_core/fixtures/testpgnfile.pgn"
@@ -559,6 +475,55 @@ class TestPrepare(unittest.TestCase):
         chess_game = chess.pgn.read_game(chess_game_pgn)
         assert self.prepare.init_board(chess_game) == chess_game.board()
 
+    def read_fixture(self, path: str) -> chess.pgn.Game:
+        with open(path) as chess_game_pgn:
+            return chess.pgn.read_game(chess_game_pgn)
+
+    def test_init_move_times(self):
+        chess_game = self.read_fixture(r"./tests/test_core/fixtures/testpgnfile.pgn")
+        move_times = self.prepare.init_move_times(chess_game)
+        assert len(move_times) == len(list(chess_game.mainline_moves()))
+        assert move_times[0] == 0.8
+        assert move_times[1] == 3.2
+
+    def test_get_move_times(self):
+        chess_game = self.read_fixture(r"./tests/test_core/fixtures/testpgnfile.pgn")
+        assert self.prepare.get_move_times(chess_game, (600.0, 600.0, 0))[1] == 3.2
+
+    def test_get_move_times_interval(self):
+        chess_game = self.read_fixture(
+            r"./tests/test_core/fixtures/testpgnfile_timeinterval.pgn"
+        )
+        assert self.prepare.get_move_times(chess_game, (600.0, 600.0, 1))[1] == 4.2
+
+    def test_get_move_times_missing_clocks(self):
+        chess_game = self.prepare.init_game(
+            "1. e4 {[%clk 0:09:59]} e5 {[%clk 0:09:58]} 2. Nf3 Nc6 {[%clk 0:09:50]}"
+            " 3. Bc4 {[%clk 0:09:40]} *"
+        )
+        move_times = self.prepare.get_move_times(chess_game, (600.0, 600.0, 0))
+        np.testing.assert_array_equal(move_times, [1.0, 2.0, np.nan, 8.0, np.nan])
+
+    def test_filter_timecont_header(self):
+        chess_game = self.read_fixture(r"./tests/test_core/fixtures/testpgnfile.pgn")
+        assert self.prepare.filter_timecont_header(chess_game) == (600.0, 600.0, 0)
+
+    def test_filter_timecont_header_interval(self):
+        chess_game = self.read_fixture(
+            r"./tests/test_core/fixtures/testpgnfile_timeinterval.pgn"
+        )
+        assert self.prepare.filter_timecont_header(chess_game) == (600.0, 600.0, 1)
+
+    def test_filter_timecont_header_valueerror(self):
+        chess_game = self.read_fixture(
+            r"./tests/test_core/fixtures/testpgnfile_error.pgn"
+        )
+        assert self.prepare.filter_timecont_header(chess_game) == (180.0, 180.0, 0)
+
+    def test_filter_timecont_header_missing(self):
+        chess_game = self.prepare.init_game('[Event "OTB"]\n\n1. e4 *')
+        assert self.prepare.filter_timecont_header(chess_game) == (None, None, 0)
+
     def test_init_game_lists(self):
         expected = {
             "gm_mv_num": [],
@@ -573,40 +538,3 @@ class TestPrepare(unittest.TestCase):
             "b_castle_num": [],
         }
         assert self.prepare.init_game_lists() == expected
-
-    @patch("betterchess.core.game.Prepare.get_last_logged_game", return_value=3)
-    def test_all_games(self, mock_gllg):
-        path = "temp"
-        self.prepare.all_games(path)
-        mock_gllg.assert_called()
-        assert self.prepare.all_games(path) == 3
-
-    @patch(
-        "betterchess.core.game.Prepare.get_game_log_list",
-        return_value=[
-            "[INFO game] | Ainceer | 2020-11-09 16:02:24 | 5",
-            "[INFO game] | Ainceer | 2020-11-09 16:27:24 | 6",
-        ],
-    )
-    def test_get_last_logged_game_num(self, mock_loglist):
-        path = "test"
-        self.prepare.get_last_logged_game(path)
-        mock_loglist.assert_called_once()
-        assert self.prepare.get_last_logged_game(path) == datetime(
-            2020, 11, 9, 16, 27, 24
-        )
-
-    def test_game_get_game_log_list(self):
-        path_userlogfile = r"./tests/test_core/fixtures/test_log_list.txt"
-
-        assert self.prepare.get_game_log_list(path_userlogfile) == [
-            "[INFO user] | Ainceer | 2020-01-01 00:00:00 | 0\n",
-            "[INFO game] | Ainceer | 2020-11-08 22:00:49 | 0\n",
-            "[INFO game] | Ainceer | 2020-11-08 23:10:17 | 1",
-        ]
-
-    def test_game_logfile_line_checker_multi(self):
-        game_log_list = []
-        lines = ["user", "user_analysis", "false"]
-        self.prepare.logfile_line_checker_multi(game_log_list, lines)
-        assert game_log_list == ["user", "user_analysis"]
@@ -1,4 +1,5 @@
 import datetime
+import io
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -162,12 +163,12 @@ class TestGameHeaders(unittest.TestCase):
     def test_rating_white(self):
         chess_game_pgn = open(self.tempfilepath1)
         chess_game = read_game(chess_game_pgn)
-        assert Headers.rating_white(self, chess_game) == 1011
+        assert self.headers.rating_white(chess_game) == 1011
 
     def test_test_rating_black(self):
         chess_game_pgn = open(self.tempfilepath1)
         chess_game = read_game(chess_game_pgn)
-        assert Headers.rating_black(self, chess_game) == 1009
+        assert self.headers.rating_black(chess_game) == 1009
 
     def test_opening_cls_no_err(self):
         chess_game_pgn = open(self.tempfilepath1)
@@ -275,3 +276,24 @@ class TestGameHeaders(unittest.TestCase):
         assert self.headers.game_dt_time(game_date, game_time) == datetime.datetime(
             2021, 2, 22, 19, 35, 47
         )
+
+    def test_headers_missing(self):
+        chess_game = read_game(
+            io.StringIO(
+                '[Date "????.??.??"]\n[White "Ainceer"]\n[Black "Other"]\n'
+                '[Result "0-1"]\n[WhiteElo "?"]\n\n1. f3 e5 2. g4 Qh4# 0-1'
+            )
+        )
+        assert self.headers.time_control(chess_game) is None
+        assert self.headers.rating_white(chess_game) is None
+        assert self.headers.rating_black(chess_game) is None
+        assert self.headers.game_termination(chess_game, "Ainceer") == "Loss"
+        assert self.headers.game_termination(chess_game, "Other") == "Win"
+        game_date = self.headers.game_dt(chess_game)
+        game_time = self.headers.game_t(chess_game)
+        assert (game_date, game_time) == ("????.??.??", "00:00:00")
+        assert self.headers.game_dt_time(game_date, game_time) is None
+
+    def test_game_dt_date_header(self):
+        chess_game = read_game(io.StringIO('[Date "2021.03.01"]\n\n1. e4 *'))
+        assert self.headers.game_dt(chess_game) == "2021.03.01"
@@ -3,22 +3,22 @@ from unittest.mock import MagicMock
 
 import chess
 import chess.engine
-import pandas as pd
 from chess import WHITE
 from chess.engine import Cp, Mate, PovScore
 
 from betterchess.core.move import Move
+from betterchess.core.records import MoveRecord
 from betterchess.utils.handlers import EnvHandler, FileHandler, RunHandler
 
 
 class TestMoveAnalyse(unittest.TestCase):
     def setUp(self):
         env_handler = MagicMock()
+        env_handler.eval_chaining = False
         input_handler = MagicMock()
         input_handler.collect_user_inputs.return_value = ("Ainceer", 1, "2020", "11")
         file_handler = FileHandler("Ainceer", env_handler)
         run_handler = MagicMock()
-        run_handler.create_engine.return_value = "engine"
         iter_metadata = {"game_num": 1, "tot_games": 2}
         move_metadata = {"move": 1, "move_num": 1}
         game_metadata = {
@@ -26,7 +26,9 @@ class TestMoveAnalyse(unittest.TestCase):
             "game_datetime": "b",
             "board": "c",
             "chess_game": "d",
+            "move_times": [5.0, 10.0],
             "game_lists_dict": "e",
+            "move_rows": [],
         }
         self.move_class = Move(
             input_handler,
@@ -49,10 +51,7 @@ class TestMoveAnalyse(unittest.TestCase):
         self.move_class.castling_type = MagicMock()
         self.move_class.white_castle_move_num = MagicMock()
         self.move_class.black_castle_move_num = MagicMock()
-        self.move_class.filter_timecont_header = MagicMock()
-        self.move_class.get_time_spent_on_move = MagicMock()
-        self.move_class.create_move_df = MagicMock()
-        self.move_class.export_move_data = MagicMock()
+        self.move_class.create_move_record = MagicMock()
         self.move_class.append_to_game_lists = MagicMock()
 
         self.move_class.best_move.return_value = ("a2a4", 10)
@@ -67,9 +66,7 @@ class TestMoveAnalyse(unittest.TestCase):
         self.move_class.castling_type.return_value = "short"
         self.move_class.white_castle_move_num.return_value = 10
         self.move_class.black_castle_move_num.return_value = 10
-        self.move_class.filter_timecont_header.return_value = 10
-        self.move_class.get_time_spent_on_move.return_value = 10
-        self.move_class.create_move_df.return_value = 10
+        self.move_class.create_move_record.return_value = 10
 
     def test_analyse(self):
         self.move_class.analyse()
@@ -87,9 +84,9 @@ class TestMoveAnalyse(unittest.TestCase):
         self.assertIsNotNone(self.move_class.castle_type)
         self.assertIsNotNone(self.move_class.w_castle_mv_num)
         self.assertIsNotNone(self.move_class.b_castle_mv_num)
-        self.assertIsNotNone(self.move_class.timers)
-        self.assertIsNotNone(self.move_class.move_time)
-        self.assertIsNotNone(self.move_class.move_df)
+        self.assertEqual(self.move_class.move_time, 10.0)
+        self.assertIsNotNone(self.move_class.move_record)
+        self.assertEqual(self.move_class.game_metadata["move_rows"], [10])
         self.assertIsNotNone(self.move_class.game_metadata)
         self.assertIsNotNone(self.move_class.run_handler)
         self.assertIsNotNone(self.move_class.input_handler)
@@ -97,6 +94,23 @@ class TestMoveAnalyse(unittest.TestCase):
         self.assertIsNotNone(self.move_class.file_handler)
         self.assertIsNotNone(self.move_class.env_handler)
 
+    def test_analyse_no_clock(self):
+        self.move_class.game_metadata["move_times"] = [5.0, float("nan")]
+        self.move_class.analyse()
+        self.assertIsNone(self.move_class.move_time)
+
+    def test_analyse_chained(self):
+        self.move_class.env_handler.eval_chaining = True
+        self.move_class.chained_move = MagicMock(return_value=("a2a4", 10, "a2a3", 5))
+        self.move_class.analyse()
+        self.move_class.chained_move.assert_called_once()
+        self.move_class.best_move.assert_not_called()
+        self.move_class.mainline_move.assert_not_called()
+        self.assertEqual(self.move_class.str_bm, "a2a4")
+        self.assertEqual(self.move_class.eval_bm, 10)
+        self.assertEqual(self.move_class.str_ml, "a2a3")
+        self.assertEqual(self.move_class.eval_ml, 5)
+
 
 class TestMove(unittest.TestCase):
     def setUp(self):
@@ -131,7 +145,10 @@ class TestMove(unittest.TestCase):
         self.move_class.str_ml = "e2e4"
         self.move_class.input_handler.username = "Ainceer"
         self.move_class.input_handler.edepth = 5
-        self.move_class.game_metadata = {"game_datetime": "2022-01-01 12:00:00"}
+        self.move_class.game_metadata = {
+            "game_datetime": "2022-01-01 12:00:00",
+            "engine_game": "engine_game",
+        }
         self.move_class.iter_metadata = {"game_num": 1}
         self.move_class.move_metadata = {"move_num": 1}
         self.move_class.str_ml = "e2e4"
@@ -148,33 +165,30 @@ class TestMove(unittest.TestCase):
         self.move_class.b_castle_mv_num = 0
         self.move_class.move_time = "00:01:00"
 
-    def test_create_move_df(self):
-        result = Move.create_move_df(self.move_class)
-
-        expected = pd.DataFrame(
-            {
-                "Username": "Ainceer",
-                "Game_date": "2022-01-01 12:00:00",
-                "Engine_depth": 5,
-                "Game_number": 1,
-                "Move_number": 1,
-                "Move": "e2e4",
-                "Move_eval": 10,
-                "Best_move": "e7e5",
-                "Best_move_eval": -10,
-                "Move_eval_diff": 20,
-                "Move_accuracy": 0.5,
-                "Move_type": "Quiet",
-                "Piece": "Pawn",
-                "Move_colour": "White",
-                "Castling_type": "King-side",
-                "White_castle_num": 1,
-                "Black_castle_num": 0,
-                "Move_time": "00:01:00",
-            },
-            index=[0],
+    def test_create_move_record(self):
+        result = Move.create_move_record(self.move_class)
+
+        expected = MoveRecord(
+            Username="Ainceer",
+            Game_date="2022-01-01 12:00:00",
+            Engine_depth=5,
+            Game_number=1,
+            Move_number=1,
+            Move="e2e4",
+            Move_eval=10,
+            Best_move="e7e5",
+            Best_move_eval=-10,
+            Move_eval_diff=20,
+            Move_accuracy=0.5,
+            Move_type="Quiet",
+            Piece="Pawn",
+            Move_colour="White",
+            Castling_type="King-side",
+            White_castle_num=1,
+            Black_castle_num=0,
+            Move_time="00:01:00",
         )
-        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(result, expected)
 
     def test_best_move(self):
         edepth = 5
@@ -199,6 +213,99 @@ class TestMove(unittest.TestCase):
         )
         self.assertEqual(result, ("e2e4", 10))
 
+    def test_chained_move(self):
+        board = chess.Board()
+        self.move_class.game_metadata = {
+            "pre_move_info": None,
+            "engine_game": "engine_game",
+        }
+        self.engine.analyse.side_effect = [
+            {"score": PovScore(Cp(30), WHITE), "pv": [chess.Move.from_uci("e2e4")]},
+            {"score": PovScore(Cp(10), WHITE), "pv": [chess.Move.from_uci("d7d5")]},
+        ]
+        result = self.move_class.chained_move(
+            chess.Move.from_uci("d2d4"), board, self.engine, 5
+        )
+        self.assertEqual(result, ("e2e4", 30, "d2d4", 10))
+        self.assertEqual(self.engine.analyse.call_count, 2)
+        self.engine.play.assert_not_called()
+        self.assertEqual(board.peek(), chess.Move.from_uci("d2d4"))
+        self.assertEqual(self.move_class.game_metadata["pre_move_info"], ("d7d5", 10))
+
+    def test_chained_move_reuses_pre_move_info(self):
+        board = chess.Board()
+        self.move_class.game_metadata = {
+            "pre_move_info": ("e2e4", 30),
+            "engine_game": "engine_game",
+        }
+        self.engine.analyse.return_value = {"score": PovScore(Cp(25), WHITE)}
+        result = self.move_class.chained_move(
+            chess.Move.from_uci("e2e4"), board, self.engine, 5
+        )
+        self.assertEqual(result, ("e2e4", 25, "e2e4", 25))
+        self.engine.analyse.assert_called_once()
+
+    def test_chained_move_no_pv(self):
+        board = chess.Board()
+        self.move_class.game_metadata = {
+            "pre_move_info": (None, 30),
+            "engine_game": "engine_game",
+        }
+        best_move = MagicMock()
+        best_move.move = chess.Move.from_uci("g1f3")
+        self.engine.play.return_value = best_move
+        self.engine.analyse.return_value = {"score": PovScore(Cp(0), WHITE)}
+        result = self.move_class.chained_move(
+            chess.Move.from_uci("e2e4"), board, self.engine, 5
+        )
+        self.assertEqual(result, ("g1f3", 30, "e2e4", 0))
+        self.engine.play.assert_called_once()
+
+    def test_position_analysis_cache_hit(self):
+        board = chess.Board()
+        self.move_class.run_handler.eval_cache = MagicMock()
+        self.move_class.run_handler.eval_cache.get.return_value = ("e2e4", 35)
+        result = self.move_class.position_analysis(board, self.engine, 5)
+        self.assertEqual(result, ("e2e4", 35))
+        self.engine.analyse.assert_not_called()
+        self.move_class.run_handler.eval_cache.put.assert_not_called()
+
+    def test_position_analysis_cache_miss(self):
+        board = chess.Board()
+        self.move_class.run_handler.eval_cache = MagicMock()
+        self.move_class.run_handler.eval_cache.get.return_value = ("e2e4", None)
+        self.engine.analyse.return_value = {
+            "score": PovScore(Cp(20), WHITE),
+            "pv": [chess.Move.from_uci("d2d4")],
+        }
+        result = self.move_class.position_analysis(board, self.engine, 5)
+        self.assertEqual(result, ("d2d4", 20))
+        self.engine.analyse.assert_called_once_with(
+            board=board, limit=chess.engine.Limit(depth=5), game="engine_game"
+        )
+        self.move_class.run_handler.eval_cache.put.assert_called_once_with(
+            board, 5, best_move="d2d4", score=20
+        )
+
+    def test_position_best_move_cache_hit(self):
+        board = chess.Board()
+        self.move_class.run_handler.eval_cache = MagicMock()
+        self.move_class.run_handler.eval_cache.get.return_value = ("e2e4", None)
+        assert self.move_class.position_best_move(board, self.engine, 5) == "e2e4"
+        self.engine.play.assert_not_called()
+
+    def test_position_best_move_cache_miss(self):
+        board = chess.Board()
+        self.move_class.run_handler.eval_cache = MagicMock()
+        self.move_class.run_handler.eval_cache.get.return_value = (None, 20)
+        best_move = MagicMock()
+        best_move.move = chess.Move.from_uci("g1f3")
+        self.engine.play.return_value = best_move
+        assert self.move_class.position_best_move(board, self.engine, 5) == "g1f3"
+        self.move_class.run_handler.eval_cache.put.assert_called_once_with(
+            board, 5, best_move="g1f3"
+        )
+
     def test_move_eval(self):
         move = {"score": PovScore(Cp(10), WHITE)}
         assert 10 == Move.move_eval(move)
@@ -363,32 +470,6 @@ class TestMove(unittest.TestCase):
         # Assert that the board_fen() method of the mock object was called
         mock_board.board_fen.assert_called_once()
 
-    def test_get_time_spent_on_move(self):
-        tempfilepath = r"./tests/test_core/fixtures/testpgnfile.pgn"
-        assert (
-            self.move_class.get_time_spent_on_move(tempfilepath, 1, (600.0, 600.0, 0))
-            == 3.2
-        )
-
-    def test_get_time_spent_on_move_interval(self):
-        tempfilepath = r"./tests/test_core/fixtures/testpgnfile_timeinterval.pgn"
-        assert (
-            self.move_class.get_time_spent_on_move(tempfilepath, 1, (600.0, 600.0, 1))
-            == 4.2
-        )
-
-    def test_filter_timecont_header(self):
-        tempfilepath = r"./tests/test_core/fixtures/testpgnfile.pgn"
-        assert self.move_class.filter_timecont_header(tempfilepath) == (600.0, 600.0, 0)
-
-    def test_filter_timecont_header_interval(self):
-        tempfilepath = r"./tests/test_core/fixtures/testpgnfile_timeinterval.pgn"
-        assert self.move_class.filter_timecont_header(tempfilepath) == (600.0, 600.0, 1)
-
-    def test_filter_timecont_header_valueerror(self):
-        tempfilepath = r"./tests/test_core/fixtures/testpgnfile_error.pgn"
-        assert self.move_class.filter_timecont_header(tempfilepath) == (180.0, 180.0, 0)
-
     def test_append_to_game_lists(self):
         self.move_class.game_metadata = {
             "game_lists_dict": {
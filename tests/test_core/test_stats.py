@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from betterchess.core.stats import BLACK, WHITE, GameStats
+
+
+def game_stats(move_types=None, move_accs=None, w_castle=None, b_castle=None, total_moves=0):
+    return GameStats(
+        move_types or [], move_accs or [], w_castle or [], b_castle or [], total_moves
+    )
+
+
+class TestGameStats(unittest.TestCase):
+    def test_move_type_counts(self):
+        move_types = [2, 2, 1, 1, 0, 0, -1, -1, -2, -2, -3, -3, -4, -4]
+        stats = game_stats(move_types=move_types)
+        for colour in (WHITE, BLACK):
+            self.assertEqual(stats.player_summary(colour)["move_type_counts"], [1] * 7)
+
+    def test_accuracy(self):
+        stats = game_stats(move_accs=[90, 80, 90, 80, 90, 80])
+        self.assertEqual(stats.player_summary(WHITE)["accuracy"], 90)
+        self.assertEqual(stats.player_summary(BLACK)["accuracy"], 80)
+
+    def test_accuracy_empty(self):
+        summary = game_stats().player_summary(WHITE)
+        self.assertEqual(summary["accuracy"], 0)
+        self.assertEqual(
+            [
+                summary["opening_accuracy"],
+                summary["mid_accuracy"],
+                summary["end_accuracy"],
+            ],
+            [0, 0, 0],
+        )
+        self.assertEqual(summary["improvement"], "Endgame")
+
+    def test_phase_accuracy(self):
+        move_accs = [90, 80, 90, 80, 30, 20, 30, 20, 70, 60, 70, 60]
+        self.assertEqual(GameStats.phase_accuracy(move_accs[::2]), [90, 30, 70])
+        self.assertEqual(GameStats.phase_accuracy(move_accs[1::2]), [80, 20, 60])
+
+    def test_phase_accuracy_uneven_split(self):
+        for num_moves in range(8):
+            move_accs = list(range(10, 10 * (num_moves + 1), 10))
+            expected = [
+                np.mean(part) if len(part) else 0
+                for part in np.array_split(move_accs, 3)
+            ]
+            self.assertEqual(GameStats.phase_accuracy(move_accs), expected)
+
+    def test_improvement(self):
+        games = [
+            ([80, 90, 90, 80, 90, 90], ["Opening", "Midgame"]),
+            ([90, 90, 80, 80, 90, 90], ["Midgame", "Midgame"]),
+            ([90, 90, 90, 90, 80, 80], ["Endgame", "Endgame"]),
+        ]
+        for move_accs, expected in games:
+            stats = game_stats(move_accs=move_accs)
+            improvements = [
+                stats.player_summary(colour)["improvement"] for colour in (WHITE, BLACK)
+            ]
+            self.assertEqual(improvements, expected)
+
+    def test_castling(self):
+        stats = game_stats(w_castle=[0, 0, 0, 15], b_castle=[0, 0, 0, 0], total_moves=40)
+        summary = stats.player_summary(WHITE)
+        self.assertEqual([summary["castle_move"], summary["opp_castle_move"]], [15, 0])
+        self.assertEqual([summary["castled"], summary["opp_castled"]], [1, 0])
+
+    def test_castle_phase(self):
+        stats = game_stats(total_moves=10)
+        self.assertEqual(
+            [stats.castle_phase(castle_move) for castle_move in (0, 1, 5, 9)],
+            ["None", "Opening", "Midgame", "Endgame"],
+        )
+        self.assertEqual(game_stats().castle_phase(3), "None")
+
+    def test_from_game_lists(self):
+        game_lists = {
+            "move_type_list": [2, -3],
+            "gm_mv_ac": [100, 20],
+            "w_castle_num": [0, 0],
+            "b_castle_num": [0, 1],
+        }
+        summary = GameStats.from_game_lists(game_lists, 1).player_summary(BLACK)
+        self.assertEqual(summary["accuracy"], 20)
+        self.assertEqual(summary["move_type_counts"], [0, 0, 0, 0, 0, 1, 0])
+        self.assertEqual(summary["castle_move"], 1)
+        self.assertEqual(summary["opp_castle_move"], 0)
+        self.assertEqual(summary["castle_phase"], "Endgame")
+        self.assertEqual(summary["opp_castle_phase"], "None")
+        self.assertIs(type(summary["accuracy"]), float)
@@ -1,8 +1,13 @@
+import os
+import tempfile
 import unittest
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 from betterchess.core.game import Game
-from betterchess.core.user import Cleandown, PrepareUsers, User
+from betterchess.core.user import PrepareUsers, User
+from betterchess.utils.checkpoint import Checkpoint
+from betterchess.utils.database import Database
 
 
 class TestAnalyse(unittest.TestCase):
@@ -16,7 +21,6 @@ class TestAnalyse(unittest.TestCase):
             self.input_handler, self.file_handler, self.run_handler, self.env_handler
         )
         self.prepare_users = PrepareUsers()
-        self.cleandown = Cleandown()
         self.game = Game(
             self.input_handler,
             self.file_handler,
@@ -26,7 +30,8 @@ class TestAnalyse(unittest.TestCase):
         )
         self.input_handler.username = "test_user"
         self.file_handler.path_userlogfile = "test_path"
-        self.run_handler.logger = "test_logger"
+        self.run_handler.logger = MagicMock()
+        self.run_handler.eval_cache = None
 
     @patch("betterchess.utils.extract.Extract.run_data_extract")
     @patch("betterchess.core.user.User.run_analysis")
@@ -37,175 +42,171 @@ class TestAnalyse(unittest.TestCase):
 
     @patch("betterchess.core.game.Game.run_game_analysis")
     @patch("betterchess.core.user.PrepareUsers.current_game")
-    @patch("betterchess.core.user.Cleandown.previous_run")
+    @patch("betterchess.core.user.PrepareUsers.count_users_games", return_value=3)
     @patch(
-        "betterchess.core.user.PrepareUsers.current_run",
-        return_value=({"game_data": [1, 2, 3, 4, 5]}, 5),
+        "betterchess.core.user.PrepareUsers.users_games",
+        return_value=iter([(2, "game2"), (4, "game4"), (5, "game5")]),
     )
-    def test_run_analysis(self, mock_curr, mock_prev, mock_curr_game, mock_analysis):
+    def test_run_analysis(self, mock_games, mock_count, mock_curr_game, mock_analysis):
+        engine_pool = MagicMock()
+        engine_pool.size = 2
+        engine_pool.acquire.return_value.__enter__.return_value = "engine"
+        self.run_handler.engine_pool = engine_pool
+        self.input_handler.start_date = datetime(2022, 1, 1)
+        self.env_handler.time_controls = ["600"]
+        self.input_handler.edepth = 8
         self.user.run_analysis()
-        mock_curr.assert_called_once()
-        mock_prev.assert_called_once()
-        mock_curr_game.assert_called()
-        mock_analysis.assert_called()
+        game_filter = (
+            self.run_handler.database,
+            "test_user",
+            datetime(2022, 1, 1),
+            ["600"],
+            8,
+        )
+        mock_count.assert_called_once_with(*game_filter)
+        mock_games.assert_called_once_with(*game_filter)
+        self.assertEqual(mock_curr_game.call_count, 3)
+        mock_curr_game.assert_called_with("game5")
+        self.assertEqual(mock_analysis.call_count, 3)
+        self.assertEqual(engine_pool.acquire.call_count, 3)
+
+    @patch("betterchess.core.user.Game")
+    @patch("betterchess.core.user.PrepareUsers.current_game", return_value="pgn")
+    def test_run_game_iter_metadata(self, mock_curr_game, mock_game):
+        self.run_handler.engine_pool.acquire.return_value.__enter__.return_value = (
+            "engine"
+        )
+        iter_metadata = {"game_num": 4, "game_idx": 1, "tot_games": 3}
+        self.user.run_game(iter_metadata, "game4")
+        self.assertEqual(mock_game.call_args.args[4]["game_num"], 4)
+        self.assertEqual(mock_game.call_args.args[4]["game_pgn"], "pgn")
+        self.assertEqual(mock_game.call_args.args[2].engine, "engine")
+
+    @patch("betterchess.core.user.Game")
+    @patch("betterchess.core.user.PrepareUsers.current_game", return_value="pgn")
+    def test_run_game_failed(self, mock_curr_game, mock_game):
+        mock_game.return_value.run_game_analysis.side_effect = ValueError
+        self.input_handler.edepth = 8
+        with self.assertRaises(ValueError):
+            self.user.run_game({"game_num": 4}, "game4")
+        self.run_handler.checkpoint.fail.assert_called_once_with("test_user", 4, 8)
+
+    @patch("builtins.print")
+    def test_report_eval_cache(self, mock_print):
+        self.run_handler.eval_cache = MagicMock()
+        self.run_handler.eval_cache.hit_rate.return_value = 0.25
+        self.run_handler.eval_cache.lookups = 8
+        self.user.report_eval_cache()
+        mock_print.assert_called_once_with("\nEval cache hit rate: 25.0% of 8 lookups")
+        self.run_handler.logger.info.assert_called_once()
 
 
 class TestPrepareUsers(unittest.TestCase):
     def setUp(self):
-        self.path_database = "./database.db"
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database = Database(
+            MagicMock(db_type="sqlite"), os.path.join(self.tmp_dir.name, "test.db"), 2
+        )
+        with self.database.connection() as conn:
+            for sql_file in ("create_pgn_table.sql", "create_checkpoint_table.sql"):
+                with open(f"./betterchess/utils/sql/sqlite/{sql_file}") as sql:
+                    conn.execute(sql.read())
         self.username = "Ainceer"
-        self.path_userlogfile = "./file.log"
-        self.logger = MagicMock()
-        self.env_handler = MagicMock()
         self.prepare_user = PrepareUsers()
-
-    @patch("betterchess.core.user.PrepareUsers.init_game_logs")
-    @patch(
-        "betterchess.core.user.PrepareUsers.initialise_users_games",
-        return_value=({"game_data": [1, 2, 3, 4, 5]}, 5),
-    )
-    def test_current_run(self, mock_init, mock_logs):
-        self.prepare_user.current_run(
-            self.path_database,
-            self.username,
-            self.path_userlogfile,
-            self.logger,
-            self.env_handler,
+        games = [
+            ("Ainceer", "url1", datetime(2021, 12, 31), "600", "game1"),
+            ("Ainceer", "url2", datetime(2022, 1, 2), "600", "game2"),
+            ("Ainceer", "url3", datetime(2022, 1, 3), "180+2", "game3"),
+            ("Ainceer", "url4", datetime(2022, 1, 4), "600", "game4"),
+            ("someone", "url5", datetime(2022, 1, 5), "600", "game5"),
+            ("Ainceer", "url6", None, "600", "game6"),
+            ("Ainceer", "url7", datetime(2022, 1, 7), "600", "game7"),
+        ]
+        with self.database.connection() as conn:
+            conn.executemany(
+                "insert into pgn_data (username, game_id, game_datetime, time_control, game_data) values (?, ?, ?, ?, ?)",
+                games,
+            )
+            Checkpoint(self.database).finish(conn, "Ainceer", 4, 8)
+
+    def tearDown(self):
+        self.database.close()
+        self.tmp_dir.cleanup()
+
+    def test_users_games(self):
+        users_games = self.prepare_user.users_games(
+            self.database, self.username, datetime(2022, 1, 1), [], 8
         )
-        mock_init.assert_called_once()
-        mock_logs.assert_called_once()
-        assert self.prepare_user.current_run(
-            self.path_database,
-            self.username,
-            self.path_userlogfile,
-            self.logger,
-            self.env_handler,
-        ) == ({"game_data": [1, 2, 3, 4, 5]}, 5)
-
-    @patch("betterchess.core.user.PrepareUsers.set_first_game_logdate")
-    @patch("betterchess.core.user.PrepareUsers.numlines_in_logfile", return_value=0)
-    def test_init_game_logs_zero(self, mock_log, mock_set):
-        self.prepare_user.init_game_logs(
-            self.username, self.path_userlogfile, self.logger
-        )
-        mock_log.assert_called_once()
-        mock_set.assert_called_with(self.username, self.path_userlogfile, self.logger)
-
-    @patch("betterchess.core.user.PrepareUsers.set_first_game_logdate")
-    @patch("betterchess.core.user.PrepareUsers.numlines_in_logfile", return_value=1)
-    def test_init_game_logs_non_zero(self, mock_log, mock_set):
-        self.prepare_user.init_game_logs(
-            self.username, self.path_userlogfile, self.logger
-        )
-        mock_log.assert_called_once()
-        mock_set.assert_not_called()
-
-    @patch("builtins.open", new_callable=MagicMock)
-    def test_numlines_in_logfile(self, mock_open):
-        mock_file = mock_open.return_value.__enter__.return_value
-        mock_file.readlines.return_value = ["line1\n", "line2\n", "line3\n"]
-        mock_check_logfile = MagicMock()
-        self.prepare_user.check_logfile = mock_check_logfile
         self.assertEqual(
-            self.prepare_user.numlines_in_logfile(self.path_userlogfile), 0
+            list(users_games),
+            [(2, "game2"), (3, "game3"), (6, "game6"), (7, "game7")],
         )
-        mock_open.assert_called_once_with(self.path_userlogfile, "r")
-        mock_file.readlines.assert_called_once()
 
-    @patch("builtins.open", new_callable=MagicMock)
-    def test_set_first_game_logdate(self, mock_open):
-        self.prepare_user.set_first_game_logdate(
-            self.username, self.path_userlogfile, self.logger
+    def test_users_games_time_controls(self):
+        users_games = self.prepare_user.users_games(
+            self.database, self.username, datetime(2022, 1, 1), ["600"], 8
         )
-        mock_open.assert_called_once_with(self.path_userlogfile, mode="a")
-        self.logger.info.assert_called_once_with("| Ainceer | 2020-01-01 00:00:00 | 0")
-
-    def test_check_logfile(self):
-        game_log_list = []
-        lines = ["user", "user_analysis", "false"]
-        self.prepare_user.check_logfile(game_log_list, lines)
-
-        assert game_log_list == ["user", "user_analysis"]
-
-    @patch("builtins.open")
-    def test_current_game(self, mock_open):
-        path_temp = "./temp.pgn"
-        chess_game = MagicMock(return_value=";")
-        self.prepare_user.current_game(path_temp, chess_game)
-        mock_open.assert_called_once_with(path_temp, mode="w")
-
-
-class TestCleandown(unittest.TestCase):
-    def setUp(self):
-        self.cleandown = Cleandown()
-        self.path_userlogfile = "test_path"
-        self.path_database = "/database.db"
-        self.username = "test_user"
-        self.env_handler = MagicMock()
-
-    @patch("betterchess.core.user.Cleandown.clean_sql_table")
-    @patch("betterchess.core.user.Cleandown.get_last_logged_game_num", return_value=3)
-    def test_previous_run(self, mock_log, mock_clean):
-        self.cleandown.previous_run(
-            self.path_userlogfile, self.path_database, self.username, self.env_handler
+        self.assertEqual(
+            list(users_games), [(2, "game2"), (6, "game6"), (7, "game7")]
         )
-        mock_log.assert_called_once()
-        mock_clean.assert_called_once()
 
-    @patch(
-        "betterchess.core.user.Cleandown.get_game_log_list",
-        return_value=[
-            "[INFO game] | Ainceer | 2020-11-09 16:02:24 | 5",
-            "[INFO game] | Ainceer | 2020-11-09 16:27:24 | 6",
-        ],
-    )
-    @patch("betterchess.core.user.Cleandown.logfile_not_empty", return_value=True)
-    def test_get_last_logged_game_num(self, mock_logfile, mock_loglist):
-        self.cleandown.get_last_logged_game_num(self.path_userlogfile)
-        mock_logfile.assert_called_once()
-        mock_loglist.assert_called_once()
-        assert self.cleandown.get_last_logged_game_num(self.path_userlogfile) == 6
+    def test_users_games_chunked(self):
+        self.database.connection = MagicMock(wraps=self.database.connection)
+        users_games = self.prepare_user.users_games(
+            self.database, self.username, datetime(2021, 1, 1), [], 8, chunk_size=2
+        )
+        self.assertEqual(next(users_games), (1, "game1"))
+        self.assertEqual(self.database.connection.call_count, 1)
+        self.assertEqual(
+            list(users_games),
+            [(2, "game2"), (3, "game3"), (6, "game6"), (7, "game7")],
+        )
+        self.assertEqual(self.database.connection.call_count, 3)
 
-    @patch("builtins.open")
-    def test_logfile_not_empty(self, mock_open):
-        # arrange
-        path_userlogfile = "userlogfile.txt"
-        file_contents = "example file contents"
-        mock_open.return_value.__enter__.return_value.readlines.return_value = (
-            file_contents.splitlines()
+    def test_count_users_games(self):
+        self.assertEqual(
+            self.prepare_user.count_users_games(
+                self.database,
+                self.username,
+                datetime(2022, 1, 1),
+                ["600", "180+2"],
+                8,
+            ),
+            4,
         )
 
-        result = self.cleandown.logfile_not_empty(path_userlogfile)
+    def test_users_games_deeper_engine_depth(self):
+        users_games = self.prepare_user.users_games(
+            self.database, self.username, datetime(2022, 1, 1), ["600"], 10
+        )
+        self.assertEqual([game_id for game_id, _ in users_games], [2, 4, 6, 7])
 
-        # assert
-        mock_open.assert_called_once_with(path_userlogfile, mode="r")
-        self.assertTrue(result)
+    def test_users_games_failed(self):
+        Checkpoint(self.database).fail("Ainceer", 4, 8)
+        users_games = self.prepare_user.users_games(
+            self.database, self.username, datetime(2022, 1, 1), ["600"], 8
+        )
+        self.assertEqual([game_id for game_id, _ in users_games], [2, 4, 6, 7])
 
     @patch("builtins.open")
-    def test_logfile_empty(self, mock_open):
-        # arrange
-        path_userlogfile = "userlogfile.txt"
-        file_contents = ""
-        mock_open.return_value.__enter__.return_value.readlines.return_value = (
-            file_contents.splitlines()
-        )
-        # act
-        result = self.cleandown.logfile_not_empty(path_userlogfile)
-        # assert
-        mock_open.assert_called_once_with(path_userlogfile, mode="r")
-        self.assertFalse(result)
-
-    def test_get_game_log_list(self):
-        path_userlogfile = r"./tests/test_core/fixtures/test_log_list.txt"
-
-        assert self.cleandown.get_game_log_list(path_userlogfile) == [
-            "[INFO user] | Ainceer | 2020-01-01 00:00:00 | 0\n",
-            "[INFO game] | Ainceer | 2020-11-08 22:00:49 | 0\n",
-            "[INFO game] | Ainceer | 2020-11-08 23:10:17 | 1",
-        ]
-
-    def test_logfile_line_checker_multi(self):
-        game_log_list = []
-        lines = ["user", "user_analysis", "false"]
-        self.cleandown.logfile_line_checker_multi(game_log_list, lines)
-        assert game_log_list == ["user", "user_analysis"]
+    def test_current_game(self, mock_open):
+        chess_game = '[Event "Live Chess"] ; [Site "Chess.com"] ;  ; 1. e4 e5'
+        assert (
+            self.prepare_user.current_game(chess_game)
+            == '[Event "Live Chess"]\n[Site "Chess.com"]\n\n1. e4 e5'
+        )
+        mock_open.assert_not_called()
+
+    def test_game_pgn(self):
+        with self.database.connection() as conn:
+            conn.execute(
+                "update pgn_data set game_data = ? where id = 2",
+                ('[White "Ainceer"] ; [Black "someone"] ;  ; 1. e4 e5 2. Nf3 *',),
+            )
+        chess_game = self.prepare_user.game_pgn(self.database, 2)
+        self.assertEqual(chess_game.headers["White"], "Ainceer")
+        self.assertEqual(
+            [move.uci() for move in chess_game.mainline_moves()],
+            ["e2e4", "e7e5", "g1f3"],
+        )
+        self.assertIsNone(self.prepare_user.game_pgn(self.database, 99))
@@ -0,0 +1,106 @@
+import sqlite3
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from betterchess.data_manager.browse import TableBrowser, browse_inputs
+from betterchess.utils.config import Config
+
+
+class TestTableBrowser(unittest.TestCase):
+    def setUp(self):
+        config = Config()
+        config.create_config()
+        self.conn = sqlite3.connect(":memory:")
+        for name in ("pgn_table", "game_table", "move_table", "move_view"):
+            sql_file = config.conf.sqlite[f"create_{name}"].file_path
+            self.conn.execute(Path(sql_file).read_text())
+        games = [
+            (username, f"2022-01-0{day} 10:00:00", user_num * 3 + day)
+            for user_num, username in enumerate(("Ainceer", "someone"))
+            for day in (1, 2, 3)
+        ]
+        self.conn.executemany(
+            "insert into game_data (Username, Game_date, Game_number) values (?, ?, ?)",
+            games,
+        )
+        self.conn.executemany(
+            "insert into moves (game_id, move_number) values (?, ?)",
+            [(game[2], move_num) for game in games for move_num in (0, 1)],
+        )
+        self.browser = TableBrowser(self.conn, "?", 4)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_pages_composite_key(self):
+        pages = list(self.browser.pages("move_data"))
+        self.assertEqual([len(rows) for rows in pages], [4, 4, 4])
+        keys = [(row[0], row[3], row[4]) for rows in pages for row in rows]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), 12)
+
+    def test_pages_filters(self):
+        pages = list(
+            self.browser.pages(
+                "move_data", "Ainceer", datetime(2022, 1, 2), datetime(2022, 1, 3)
+            )
+        )
+        self.assertEqual(
+            [(row[0], row[3], row[4]) for rows in pages for row in rows],
+            [("Ainceer", 2, 0), ("Ainceer", 2, 1)],
+        )
+
+    def test_pages_empty_table(self):
+        self.assertEqual(list(self.browser.pages("pgn_data", "Ainceer")), [])
+
+    def test_pages_bounded_queries(self):
+        conn = MagicMock()
+        curs = conn.cursor()
+        curs.description = [("id",), ("username",)]
+        curs.fetchall.side_effect = [[(1, "a"), (2, "a")], [(5, "a")]]
+        pages = list(TableBrowser(conn, "%s", 2).pages("pgn_data", "a"))
+        self.assertEqual(pages, [[(1, "a"), (2, "a")], [(5, "a")]])
+        sql, params = curs.execute.call_args.args
+        self.assertEqual(
+            sql,
+            "SELECT * FROM pgn_data WHERE username = %s AND (id) > (%s) ORDER BY id LIMIT 2",
+        )
+        self.assertEqual(params, ["a", 2])
+        curs.close.assert_called_once()
+
+    @patch("builtins.print")
+    @patch("builtins.input", return_value="q")
+    def test_browse_stops(self, mock_input, mock_print):
+        self.assertEqual(self.browser.browse("move_data"), 4)
+        mock_input.assert_called_once()
+
+    @patch("builtins.print")
+    @patch("builtins.input", return_value="")
+    def test_browse_all_pages(self, mock_input, mock_print):
+        self.assertEqual(self.browser.browse("move_data", "someone"), 6)
+        mock_print.assert_any_call(
+            "------------------------ page 2 ------------------------"
+        )
+
+    @patch(
+        "builtins.input",
+        side_effect=["move_data", "", "2022-01-02", "2022-01-02", ""],
+    )
+    def test_browse_inputs(self, mock_input):
+        self.assertEqual(
+            browse_inputs(),
+            {
+                "table": "move_data",
+                "username": None,
+                "start_date": datetime(2022, 1, 2),
+                "end_date": datetime(2022, 1, 3),
+                "page_size": 50,
+            },
+        )
+
+    @patch("builtins.input", return_value="move")
+    def test_browse_inputs_unknown_table(self, mock_input):
+        with self.assertRaises(ValueError):
+            browse_inputs()
@@ -1,16 +1,18 @@
-import os
+import sqlite3
 import unittest
-from unittest.mock import MagicMock, mock_open, patch
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
-from betterchess.data_manager.managers import MySQLManager, SQLiteManager
+from betterchess.data_manager.managers import DatabaseManager
+from betterchess.utils.config import Config
 
 
-class TestMySQLManager(unittest.TestCase):
+class TestDatabaseManager(unittest.TestCase):
     def setUp(self):
         conn = MagicMock()
         config = MagicMock()
         input_handler = MagicMock()
-        self.manager = MySQLManager(config, conn, input_handler)
+        self.manager = DatabaseManager(config, conn, input_handler, "mysql")
         self.manager.view_table_size = MagicMock()
         self.manager.select_head_all_tables = MagicMock()
         self.manager.reset_database = MagicMock()
@@ -18,6 +20,12 @@ class TestMySQLManager(unittest.TestCase):
         self.manager.conn.cursor = MagicMock()
         self.manager._get_sql_file = MagicMock(return_value="SQL")
 
+    def create_manager(self, db_type, config=None):
+        config = config or MagicMock()
+        manager = DatabaseManager(config, MagicMock(), MagicMock(), db_type)
+        manager._get_sql_file = MagicMock(return_value="SQL")
+        return manager
+
     @patch("builtins.input", return_value="reset")
     def test_query_selector_reset(self, mock_input):
         self.manager.query_selector()
@@ -29,124 +37,67 @@ class TestMySQLManager(unittest.TestCase):
         self.manager.query_selector()
         self.manager.view_table_size.assert_called_once()
 
-    @patch("builtins.input", return_value="head")
-    def test_query_selector_head(self, mock_input):
+    @patch("builtins.input", return_value="stats")
+    def test_query_selector_stats(self, mock_input):
+        self.manager.view_table_stats = MagicMock()
         self.manager.query_selector()
-        self.manager.select_head_all_tables.assert_called_once()
-
-    def test_reset_logs(self):
-        # Create a mock folder with a file and a directory
-        conn = MagicMock()
-        config = MagicMock()
-        input_handler = MagicMock()
-        manager = MySQLManager(config, conn, input_handler)
-        folder = "./tests/test_data_manager/fixtures"
-        test_file = "testuser"
-        with patch("os.remove") as mock_remove:
-            manager.reset_logs(folder, test_file)
-            mock_remove.assert_called()
-
-    @patch("builtins.print")
-    def test_reset_database(self, mock_print):
-        conn = MagicMock()
-        config = MagicMock()
-        input_handler = MagicMock()
-        self.manager = MySQLManager(config, conn, input_handler)
-        self.manager.conn.cursor = MagicMock()
-        self.manager._get_sql_file = MagicMock(return_value="SQL")
-
-        self.manager.reset_database()
-        self.manager.conn.cursor.assert_called()
-        self.manager._get_sql_file.assert_called()
-        self.manager.conn.commit.assert_called()
-        self.manager.conn.close.assert_called()
-        mock_print.assert_called_with("database reset")
-
-    @patch("builtins.print")
-    def test_view_table_size(self, mock_print):
-        conn = MagicMock()
-        config = MagicMock()
-        input_handler = MagicMock()
-        self.manager = MySQLManager(config, conn, input_handler)
-        self.manager.conn.cursor = MagicMock()
-        self.manager._get_sql_file = MagicMock(return_value="SQL")
-        self.manager.conn.cursor().fetchall.return_value = [1, 2, 3]
-        self.manager.view_table_size()
-        self.manager.conn.cursor.assert_called()
-        self.manager._get_sql_file.assert_called()
-        self.manager.conn.commit.assert_not_called()
-        self.manager.conn.close.assert_called()
-        mock_print.assert_any_call("game_data rows: 3")
-        mock_print.assert_any_call("move_data rows: 3")
-        mock_print.assert_any_call("pgn_data rows: 3")
-
-    @patch("builtins.print")
-    def test_select_head_all_tables(self, mock_print):
-        conn = MagicMock()
-        config = MagicMock()
-        input_handler = MagicMock()
-        self.manager = MySQLManager(config, conn, input_handler)
-        self.manager.conn.cursor = MagicMock()
-        self.manager._get_sql_file = MagicMock(return_value="SQL")
-        self.manager.conn.cursor().fetchall.return_value = [
-            [1, 2, 3],
-            [4, 5, 6],
-            [7, 8, 9],
-        ]
-        self.manager.select_head_all_tables()
-        self.manager.conn.cursor.assert_called()
-        self.manager._get_sql_file.assert_called()
-        self.manager.conn.commit.assert_not_called()
-        self.manager.conn.close.assert_called()
-        mock_print.assert_any_call([1, 2, 3])
-        mock_print.assert_any_call([4, 5, 6])
-        mock_print.assert_any_call([7, 8, 9])
-        mock_print.assert_any_call("-------------------------------------------------")
-
-    def test_get_sql_file(self):
-        filepath = "./tests/test_data_manager/fixtures/test.sql"
-        expected = "SQL"
-        actual = self.manager._get_sql_file(filepath)
-        print(actual)
-        assert actual == expected
-
-
-class TestSQLiteManager(unittest.TestCase):
-    def setUp(self):
-        conn = MagicMock()
-        config = MagicMock()
-        input_handler = MagicMock()
-        self.manager = SQLiteManager(config, conn, input_handler)
-        self.manager.view_table_size = MagicMock()
-        self.manager.select_head_all_tables = MagicMock()
-        self.manager.reset_database = MagicMock()
-        self.manager.reset_logs = MagicMock()
-        self.manager.conn.cursor = MagicMock()
-        self.manager._get_sql_file = MagicMock(return_value="SQL")
-
-    @patch("builtins.input", return_value="reset")
-    def test_query_selector_reset(self, mock_input):
+        self.manager.view_table_stats.assert_called_once()
 
+    @patch("builtins.input", return_value="parquet")
+    def test_query_selector_parquet(self, mock_input):
+        self.manager.export_parquet = MagicMock()
         self.manager.query_selector()
-        self.manager.reset_database.assert_called_once()
-        self.manager.reset_logs.assert_called_once()
+        self.manager.export_parquet.assert_called_once_with(folder="./data/parquet")
 
-    @patch("builtins.input", return_value="size")
-    def test_query_selector_size(self, mock_input):
+    @patch("builtins.input", return_value="browse")
+    def test_query_selector_browse(self, mock_input):
+        self.manager.browse_table = MagicMock()
         self.manager.query_selector()
-        self.manager.view_table_size.assert_called_once()
+        self.manager.browse_table.assert_called_once()
 
     @patch("builtins.input", return_value="head")
     def test_query_selector_head(self, mock_input):
         self.manager.query_selector()
         self.manager.select_head_all_tables.assert_called_once()
 
-    def test_reset_logs(self):
-        # Create a mock folder with a file and a directory
-        conn = MagicMock()
+    def test_placeholder(self):
+        self.assertEqual(self.create_manager("mysql").placeholder, "%s")
+        self.assertEqual(self.create_manager("postgres").placeholder, "%s")
+        self.assertEqual(self.create_manager("sqlite").placeholder, "?")
+
+    def test_sql_files(self):
         config = MagicMock()
-        input_handler = MagicMock()
-        manager = SQLiteManager(config, conn, input_handler)
+        manager = self.create_manager("postgres", config)
+        self.assertIs(manager.sql_files, config.conf["postgres"])
+
+    @patch("builtins.print")
+    @patch("betterchess.data_manager.managers.ParquetExporter")
+    def test_export_parquet(self, mock_exporter, mock_print):
+        mock_exporter().export.return_value = {
+            "written": 2,
+            "skipped": 5,
+            "removed": 0,
+        }
+        manager = self.create_manager("sqlite")
+        manager.export_parquet("./data/parquet")
+        mock_exporter.assert_called_with(manager.conn, "?", "./data/parquet")
+        manager.conn.close.assert_called_once()
+        mock_print.assert_called_with(
+            "parquet partitions written: 2, unchanged: 5, removed: 0"
+        )
+
+    @patch("betterchess.data_manager.managers.TableBrowser")
+    @patch("betterchess.data_manager.managers.browse_inputs")
+    def test_browse_table(self, mock_browse_inputs, mock_browser):
+        mock_browse_inputs.return_value = {"table": "move_data", "page_size": 20}
+        manager = self.create_manager("mysql")
+        manager.browse_table()
+        mock_browser.assert_called_once_with(manager.conn, "%s", 20)
+        mock_browser().browse.assert_called_once_with(table="move_data")
+        manager.conn.close.assert_called_once()
+
+    def test_reset_logs(self):
+        manager = self.create_manager("sqlite")
         folder = "./tests/test_data_manager/fixtures"
         test_file = "testuser"
         with patch("os.remove") as mock_remove:
@@ -155,63 +106,95 @@ class TestSQLiteManager(unittest.TestCase):
 
     @patch("builtins.print")
     def test_reset_database(self, mock_print):
-        conn = MagicMock()
-        config = MagicMock()
-        input_handler = MagicMock()
-        self.manager = SQLiteManager(config, conn, input_handler)
-        self.manager.conn.cursor = MagicMock()
-        self.manager._get_sql_file = MagicMock(return_value="SQL")
-
-        self.manager.reset_database()
-        self.manager.conn.cursor.assert_called()
-        self.manager._get_sql_file.assert_called()
-        self.manager.conn.commit.assert_called()
-        self.manager.conn.close.assert_called()
+        config = Config()
+        config.create_config()
+        for db_type, num_files in (("mysql", 10), ("postgres", 11), ("sqlite", 11)):
+            manager = self.create_manager(db_type, config)
+            manager.reset_database()
+            paths = [call.args[0] for call in manager._get_sql_file.call_args_list]
+            self.assertEqual(len(paths), num_files)
+            self.assertTrue(all(f"/sql/{db_type}/" in path for path in paths))
+            self.assertEqual(
+                paths[-1], config.conf[db_type].create_checkpoint_table.file_path
+            )
+            self.assertEqual(manager.conn.commit.call_count, num_files)
+            manager.conn.close.assert_called_once()
         mock_print.assert_called_with("database reset")
 
     @patch("builtins.print")
     def test_view_table_size(self, mock_print):
-
-        conn = MagicMock()
         config = MagicMock()
-        input_handler = MagicMock()
-        self.manager = SQLiteManager(config, conn, input_handler)
-        self.manager.conn.cursor = MagicMock()
-        self.manager._get_sql_file = MagicMock(return_value="SQL")
-
-        self.manager.conn.cursor().fetchall.return_value = [1, 2, 3]
-        self.manager.view_table_size()
-        self.manager.conn.cursor.assert_called()
-        self.manager._get_sql_file.assert_called()
-        self.manager.conn.close.assert_called()
+        manager = self.create_manager("mysql", config)
+        manager.conn.cursor().fetchall.return_value = [
+            ("game_data", 3),
+            ("move_data", 240),
+            ("pgn_data", 3),
+        ]
+        manager.view_table_size()
+        manager._get_sql_file.assert_called_once_with(
+            config.conf["mysql"].count_table_rows.file_path
+        )
+        manager.conn.commit.assert_not_called()
+        manager.conn.close.assert_called()
         mock_print.assert_any_call("game_data rows: 3")
-        mock_print.assert_any_call("move_data rows: 3")
+        mock_print.assert_any_call("move_data rows: 240")
         mock_print.assert_any_call("pgn_data rows: 3")
 
+    @patch("builtins.print")
+    def test_view_table_stats(self, mock_print):
+        manager = self.create_manager("mysql")
+        manager.conn.cursor().fetchall.side_effect = [
+            [
+                ("move_data", None, 240, 3 * 1024**2),
+                ("move_data", "PRIMARY", None, 3 * 1024**2),
+            ],
+            [("move_data", "Ainceer", 240)],
+        ]
+        manager.view_table_stats()
+        mock_print.assert_any_call("move_data: 240 rows, 3.0 MB")
+        mock_print.assert_any_call("    PRIMARY: 3.0 MB")
+        mock_print.assert_any_call("move_data rows for Ainceer: 240")
+        manager.conn.close.assert_called_once()
+
+    @patch("builtins.print")
+    def test_view_table_stats_sqlite(self, mock_print):
+        config = Config()
+        config.create_config()
+        conn = sqlite3.connect(":memory:")
+        for name in ("pgn_table", "pgn_index", "game_table", "move_table"):
+            sql_file = config.conf.sqlite[f"create_{name}"].file_path
+            conn.execute(Path(sql_file).read_text())
+        conn.execute(
+            Path(config.conf.sqlite.create_checkpoint_table.file_path).read_text()
+        )
+        conn.executemany(
+            "insert into pgn_data (username, game_id, game_data) values (?, ?, ?)",
+            [("Ainceer", str(game_id), "1. e4 *") for game_id in range(3)],
+        )
+        DatabaseManager(config, conn, MagicMock(), "sqlite").view_table_stats()
+        mock_print.assert_any_call("pgn_data: 3 rows, 0.0 MB")
+        mock_print.assert_any_call("    pgn_data_user_month: 0.0 MB")
+        mock_print.assert_any_call("game_data: 0 rows, 0.0 MB")
+        mock_print.assert_any_call("pgn_data rows for Ainceer: 3")
+
     @patch("builtins.print")
     def test_select_head_all_tables(self, mock_print):
-        conn = MagicMock()
-        config = MagicMock()
-        input_handler = MagicMock()
-        self.manager = SQLiteManager(config, conn, input_handler)
-        self.manager.conn.cursor = MagicMock()
-        self.manager._get_sql_file = MagicMock(return_value="SQL")
-        self.manager.conn.cursor().fetchall.return_value = [
+        manager = self.create_manager("sqlite")
+        manager.conn.cursor().fetchall.return_value = [
             [1, 2, 3],
             [4, 5, 6],
             [7, 8, 9],
         ]
-        self.manager.select_head_all_tables()
-        self.manager.conn.cursor.assert_called()
-        self.manager._get_sql_file.assert_called()
-        self.manager.conn.close.assert_called()
+        manager.select_head_all_tables()
+        self.assertEqual(manager._get_sql_file.call_count, 4)
+        manager.conn.commit.assert_not_called()
+        manager.conn.close.assert_called()
         mock_print.assert_any_call([1, 2, 3])
         mock_print.assert_any_call([4, 5, 6])
         mock_print.assert_any_call([7, 8, 9])
         mock_print.assert_any_call("-------------------------------------------------")
 
     def test_get_sql_file(self):
-        filepath = "./tests/test_data-manager/fixtures/test.sql"
-        expected = "SQL"
-        actual = self.manager._get_sql_file(filepath)
-        assert actual == expected
+        manager = DatabaseManager(MagicMock(), MagicMock(), MagicMock(), "mysql")
+        filepath = "./tests/test_data_manager/fixtures/test.sql"
+        self.assertEqual(manager._get_sql_file(filepath), "SELECT *\nFROM test_table")
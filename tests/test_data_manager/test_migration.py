@@ -0,0 +1,248 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from betterchess.core.records import MoveRecord
+from betterchess.data_manager.migration import GAME_NUMBER_MAP, SchemaMigration
+from betterchess.utils.config import Config
+from betterchess.utils.database import Database
+
+GAME_1 = '[Link "url1"] ; [UTCDate "2022.01.02"] ; [UTCTime "10:00:00"] ; [TimeControl "600"] ;  ; 1. e4 *'
+GAME_2 = '[Link "url2"] ; [UTCDate "2022.01.03"] ; [UTCTime "11:00:00"] ; [TimeControl "180+2"] ;  ; 1. d4 *'
+
+
+class PlanCursor:
+    """Cursor which records the sqlite query plan of each join on the game number
+    map."""
+
+    def __init__(self, curs):
+        self.curs = curs
+        self.plans = []
+
+    def execute(self, sql_query, params=()):
+        if GAME_NUMBER_MAP in sql_query:
+            plan = self.curs.execute(f"EXPLAIN QUERY PLAN {sql_query}", params)
+            self.plans.append([row[-1] for row in plan.fetchall()])
+        return self.curs.execute(sql_query, params)
+
+    def __getattr__(self, name):
+        return getattr(self.curs, name)
+
+
+class TestSchemaMigration(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database = Database(
+            MagicMock(db_type="sqlite"), os.path.join(self.tmp_dir.name, "test.db"), 2
+        )
+        config = Config()
+        config.create_config()
+        self.migration = SchemaMigration(self.database, config.conf.sqlite, 2)
+
+    def tearDown(self):
+        self.database.close()
+        self.tmp_dir.cleanup()
+
+    def create_legacy_database(self):
+        with self.database.connection() as conn:
+            conn.execute(
+                "CREATE TABLE pgn_data (username TEXT, url_date TEXT, game_data TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE game_data (Username TEXT, Engine_depth INT, Game_number INT, Accuracy REAL, Game_pgn TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE move_data (Username TEXT, Game_number INT, Move_number INT, Move TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE analysis_checkpoint (username TEXT, game_id INT, status TEXT, analysed_at TEXT, engine_depth INT)"
+            )
+            conn.executemany(
+                "INSERT INTO pgn_data VALUES (?, ?, ?)",
+                [
+                    ("Ainceer", "2022-01-01 00:00:00", GAME_1),
+                    ("Ainceer", "2022-01-01 00:00:00", GAME_2),
+                    ("Ainceer", "2022-01-01 00:00:00", GAME_1),
+                    ("someone", "2022-01-01 00:00:00", GAME_1),
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO game_data VALUES (?, ?, ?, ?, ?)",
+                [
+                    ("Ainceer", 8, 0, 91.5, str(GAME_1.split(" ; "))),
+                    ("Ainceer", 8, 2, 60.0, str(GAME_1.split(" ; "))),
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO move_data VALUES (?, ?, ?, ?)",
+                [
+                    ("Ainceer", 0, 0, "e2e4"),
+                    ("Ainceer", 0, 0, "e2e4"),
+                    ("Ainceer", 0, 1, "e7e5"),
+                ],
+            )
+            conn.execute(
+                "INSERT INTO analysis_checkpoint VALUES ('Ainceer', 1, 'done', NULL, 8)"
+            )
+
+    def test_migrate_legacy(self):
+        self.create_legacy_database()
+        num_rows = self.migration.migrate()
+        self.assertEqual(
+            num_rows,
+            {"pgn_data": 3, "game_data": 1, "moves": 2, "analysis_checkpoint": 2},
+        )
+        pgn_df = self.database.read_sql(
+            "select id, username, game_id, game_datetime, time_control from pgn_data"
+        )
+        self.assertEqual(pgn_df["id"].tolist(), [1, 2, 4])
+        self.assertEqual(pgn_df["game_id"].tolist(), ["url1", "url2", "url1"])
+        self.assertEqual(
+            pgn_df["game_datetime"].tolist()[:2],
+            [str(datetime(2022, 1, 2, 10)), str(datetime(2022, 1, 3, 11))],
+        )
+        self.assertEqual(pgn_df["time_control"].tolist(), ["600", "180+2", "600"])
+        game_df = self.database.read_sql("select * from game_data")
+        self.assertEqual(
+            game_df[["Game_number", "Accuracy"]].values.tolist(), [[1, 91.5]]
+        )
+        self.assertNotIn("Game_pgn", game_df.columns)
+        move_df = self.database.read_sql(
+            "select Username, Game_number, Move, Move_colour from move_data"
+        )
+        self.assertEqual(
+            move_df.values.tolist(),
+            [["Ainceer", 1, "e2e4", "white"], ["Ainceer", 1, "e7e5", "black"]],
+        )
+        checkpoint_df = self.database.read_sql(
+            "select game_id from analysis_checkpoint order by game_id"
+        )
+        self.assertEqual(checkpoint_df["game_id"].tolist(), [1, 2])
+
+    def test_migrate_legacy_uses_indexes(self):
+        self.create_legacy_database()
+        cursors = []
+        compact_moves, copy_rows = (
+            self.migration.compact_moves,
+            self.migration.copy_rows,
+        )
+
+        def record(method):
+            def wrapper(curs, *args):
+                cursors.append(PlanCursor(curs))
+                return method(cursors[-1], *args)
+
+            return wrapper
+
+        with patch.object(
+            self.migration, "compact_moves", record(compact_moves)
+        ), patch.object(self.migration, "copy_rows", record(copy_rows)):
+            self.migration.migrate()
+        plans = [plan for curs in cursors for plan in curs.plans]
+        # Two batches of moves and the legacy game_data and checkpoint copies.
+        self.assertEqual(len(plans), 4)
+        for plan in plans:
+            self.assertTrue(
+                any(detail.startswith("SEARCH m USING") for detail in plan), plan
+            )
+            self.assertFalse(any("TEMP B-TREE" in detail for detail in plan), plan)
+        for plan in plans[2:]:
+            self.assertTrue(
+                any("INDEX move_data_old_key" in detail for detail in plan), plan
+            )
+
+    def test_migrate_creates_keys(self):
+        self.create_legacy_database()
+        self.migration.migrate()
+        indexes = self.database.read_sql(
+            "select name, tbl_name from sqlite_master where type = 'index'"
+        )
+        self.assertIn("pgn_data_user_month", indexes["name"].tolist())
+        # moves is a without rowid table, so its primary key is the table itself.
+        self.assertEqual(
+            set(indexes["tbl_name"]), {"pgn_data", "game_data", "analysis_checkpoint"}
+        )
+        game_indexes = self.database.read_sql("pragma index_list(game_data)")
+        unique_columns = [
+            self.database.read_sql(f"pragma index_info({name})")["name"].tolist()
+            for name in game_indexes.loc[game_indexes["unique"] == 1, "name"]
+        ]
+        self.assertIn(["Game_number"], unique_columns)
+
+    def test_migrate_twice(self):
+        self.create_legacy_database()
+        first = self.migration.migrate()
+        pgn_df = self.database.read_sql("select * from pgn_data")
+        self.assertEqual(self.migration.migrate(), first)
+        self.assertTrue(self.database.read_sql("select * from pgn_data").equals(pgn_df))
+
+    def test_migrate_empty_database(self):
+        self.assertEqual(
+            self.migration.migrate(),
+            {"pgn_data": 0, "game_data": 0, "moves": 0, "analysis_checkpoint": 0},
+        )
+
+    def test_migrate_compacts_moves(self):
+        with self.database.connection() as conn:
+            conn.execute(
+                "CREATE TABLE pgn_data (id INTEGER PRIMARY KEY, username TEXT, url_date TEXT, game_data TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE game_data (Username TEXT, Game_date TEXT, Game_number INT)"
+            )
+            conn.execute(
+                f"CREATE TABLE move_data ({', '.join(MoveRecord._fields)})"
+            )
+            conn.execute(
+                "INSERT INTO pgn_data VALUES (7, 'Ainceer', '2022-01-01 00:00:00', ?)",
+                (GAME_1,),
+            )
+            conn.execute(
+                "INSERT INTO game_data VALUES ('Ainceer', '2022-01-02 10:00:00', 7)"
+            )
+            rows = [
+                ("e1g1", "king", "-1", "white_short"),
+                ("g8f6", "knight", "2", None),
+                ("e7e8q", "pawn", "1", None),
+            ]
+            for move_num, (move, piece, move_type, castling_type) in enumerate(rows):
+                values = dict.fromkeys(MoveRecord._fields)
+                values.update(
+                    Username="Ainceer",
+                    Game_date="2022-01-02 10:00:00",
+                    Game_number=7,
+                    Move_number=move_num,
+                    Move=move,
+                    Best_move="d2d4",
+                    Move_type=move_type,
+                    Piece=piece,
+                    Castling_type=castling_type,
+                    Move_time=1.5,
+                )
+                conn.execute(
+                    f"INSERT INTO move_data VALUES ({', '.join('?' * len(values))})",
+                    list(MoveRecord(**values)),
+                )
+        self.assertEqual(self.migration.migrate()["moves"], 3)
+        move_df = self.database.read_sql("select * from move_data order by Move_number")
+        self.assertEqual(list(move_df.columns), list(MoveRecord._fields))
+        self.assertEqual(
+            move_df[
+                [
+                    "Game_date",
+                    "Move",
+                    "Best_move",
+                    "Move_type",
+                    "Piece",
+                    "Castling_type",
+                ]
+            ].values.tolist(),
+            [
+                ["2022-01-02 10:00:00", "e1g1", "d2d4", -1, "king", "white_short"],
+                ["2022-01-02 10:00:00", "g8f6", "d2d4", 2, "knight", None],
+                ["2022-01-02 10:00:00", "e7e8q", "d2d4", 1, "pawn", None],
+            ],
+        )
+        self.assertEqual(move_df["Move_colour"].tolist(), ["white", "black", "white"])
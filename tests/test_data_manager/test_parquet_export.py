@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+
+from betterchess.core.records import CompactMoveRecord, GameRecord, MoveRecord
+from betterchess.data_manager.parquet_export import (
+    ParquetExporter,
+    arrow_schema,
+    read_table,
+)
+from betterchess.utils.config import Config
+
+
+class TestParquetExporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        config = Config()
+        config.create_config()
+        self.conn = sqlite3.connect(":memory:")
+        for name in ("game_table", "move_table", "move_view"):
+            sql_file = config.conf.sqlite[f"create_{name}"].file_path
+            self.conn.execute(Path(sql_file).read_text())
+        self.folder = os.path.join(self.tmp_dir.name, "parquet")
+        self.exporter = ParquetExporter(self.conn, "?", self.folder)
+        self.add_game("Ainceer", 1, datetime(2022, 1, 5, 10))
+        self.add_game("Ainceer", 2, datetime(2022, 2, 1))
+        self.add_game("a/b c", 3, datetime(2022, 1, 31, 23, 59, 59))
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def add_game(self, username, game_num, game_date, num_moves=2):
+        values = dict.fromkeys(GameRecord._fields)
+        values.update(
+            Username=username, Game_date=game_date, Game_number=game_num, Accuracy=80.5
+        )
+        self.conn.execute(
+            f"insert into game_data values ({', '.join('?' * len(values))})",
+            list(GameRecord(**values)),
+        )
+        move_values = dict.fromkeys(CompactMoveRecord._fields)
+        move_values.update(game_id=game_num, move_type=1, piece=1)
+        self.conn.executemany(
+            f"insert into moves values ({', '.join('?' * len(move_values))})",
+            [
+                list(CompactMoveRecord(**dict(move_values, move_number=move_num)))
+                for move_num in range(num_moves)
+            ],
+        )
+
+    def test_export(self):
+        self.assertEqual(
+            self.exporter.export(), {"written": 3, "skipped": 0, "removed": 0}
+        )
+        move_table = read_table(self.folder, "move_data")
+        self.assertEqual(move_table.num_rows, 6)
+        self.assertEqual(move_table.schema.field("Move_type").type, pa.int64())
+        self.assertEqual(move_table.column("Piece").to_pylist(), ["pawn"] * 6)
+        game_df = read_table(
+            self.folder, "game_data", ["Game_number", "Game_date", "Accuracy"]
+        ).to_pandas()
+        self.assertEqual(sorted(game_df["Game_number"]), [1, 2, 3])
+        self.assertEqual(
+            list(game_df.columns), ["Game_number", "Game_date", "Accuracy"]
+        )
+        self.assertIn(datetime(2022, 1, 31, 23, 59, 59), list(game_df["Game_date"]))
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    self.folder, "game_data", "user=a%2Fb%20c", "month=2022-01"
+                )
+            )
+        )
+
+    def test_export_changed_partitions(self):
+        self.exporter.export()
+        self.assertEqual(
+            self.exporter.export(), {"written": 0, "skipped": 3, "removed": 0}
+        )
+        self.add_game("Ainceer", 4, datetime(2022, 2, 10), 3)
+        self.add_game("Ainceer", 5, datetime(2022, 3, 1))
+        self.assertEqual(
+            self.exporter.export(), {"written": 2, "skipped": 2, "removed": 0}
+        )
+        move_df = read_table(
+            self.folder, "move_data", ["Game_number"], "Ainceer", ["2022-02"]
+        ).to_pandas()
+        self.assertEqual(sorted(move_df["Game_number"]), [2, 2, 4, 4, 4])
+
+    def test_export_removed_partition(self):
+        self.exporter.export()
+        self.conn.execute("delete from game_data where Game_number = 3")
+        self.assertEqual(
+            self.exporter.export("Ainceer"), {"written": 0, "skipped": 2, "removed": 0}
+        )
+        self.assertEqual(
+            self.exporter.export(), {"written": 0, "skipped": 2, "removed": 1}
+        )
+        game_table = read_table(self.folder, "game_data", username="a/b c")
+        self.assertEqual(game_table.num_rows, 0)
+
+    def test_export_unknown_date(self):
+        self.add_game("Ainceer", 6, None)
+        self.assertEqual(
+            self.exporter.export("Ainceer"), {"written": 3, "skipped": 0, "removed": 0}
+        )
+        move_df = read_table(
+            self.folder, "move_data", ["Game_number"], "Ainceer", ["unknown"]
+        ).to_pandas()
+        self.assertEqual(move_df["Game_number"].tolist(), [6, 6])
+
+    def test_month_range(self):
+        self.assertEqual(
+            ParquetExporter.month_range("2022-12"), ("2022-12-01", "2023-01-01")
+        )
+
+    def test_arrow_schema(self):
+        schema = arrow_schema(MoveRecord)
+        self.assertEqual(schema.names, list(MoveRecord._fields))
+        self.assertEqual(schema.field("Game_date").type, pa.timestamp("s"))
+        self.assertEqual(schema.field("Castling_type").type, pa.string())
@@ -0,0 +1,60 @@
+import gzip
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from betterchess.utils.archive_cache import ArchiveCache
+
+
+class TestArchiveCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "archive_cache.db")
+        self.archive_cache = ArchiveCache(self.path)
+        self.url = "https://api.chess.com/pub/player/ainceer/games/2023/01"
+        self.body = b'{"games": [{"pgn": "1. e4 e5"}]}' * 100
+
+    def tearDown(self):
+        self.archive_cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_get_missing(self):
+        self.assertIsNone(self.archive_cache.get(self.url))
+
+    def test_put_get(self):
+        self.archive_cache.put(self.url, self.body, '"etag"', "Sun, 01 Jan 2023")
+        cached = self.archive_cache.get(self.url)
+        self.assertEqual(cached.body, self.body)
+        self.assertEqual(cached.etag, '"etag"')
+        self.assertEqual(cached.last_modified, "Sun, 01 Jan 2023")
+        self.assertIsInstance(cached.fetched_at, datetime)
+
+    def test_put_compressed(self):
+        self.archive_cache.put(self.url, self.body, None, None)
+        stored = self.archive_cache.conn.execute(
+            "SELECT body FROM archive_cache"
+        ).fetchone()[0]
+        self.assertLess(len(stored), len(self.body))
+        self.assertEqual(gzip.decompress(stored), self.body)
+
+    def test_put_replaces(self):
+        self.archive_cache.put(self.url, b"{}", '"old"', None)
+        self.archive_cache.put(self.url, self.body, '"new"', None)
+        self.assertEqual(self.archive_cache.get(self.url).etag, '"new"')
+
+    def test_touch(self):
+        self.archive_cache.put(self.url, self.body, '"etag"', None)
+        self.archive_cache.conn.execute(
+            "UPDATE archive_cache SET fetched_at = ?", ("2023-01-15T00:00:00",)
+        )
+        self.archive_cache.touch(self.url)
+        cached = self.archive_cache.get(self.url)
+        self.assertGreater(cached.fetched_at, datetime(2023, 1, 15))
+        self.assertEqual(cached.body, self.body)
+
+    def test_persists(self):
+        self.archive_cache.put(self.url, self.body, '"etag"', None)
+        self.archive_cache.close()
+        self.archive_cache = ArchiveCache(self.path)
+        self.assertEqual(self.archive_cache.get(self.url).body, self.body)
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from betterchess.utils.checkpoint import DONE, FAILED, Checkpoint
+from betterchess.utils.database import Database
+
+PATH_CREATE_SQL = "betterchess/utils/sql/sqlite/create_checkpoint_table.sql"
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database = Database(
+            MagicMock(db_type="sqlite"), os.path.join(self.tmp_dir.name, "test.db"), 2
+        )
+        self.checkpoint = Checkpoint(self.database)
+        self.checkpoint.create_table(PATH_CREATE_SQL)
+
+    def tearDown(self):
+        self.database.close()
+        self.tmp_dir.cleanup()
+
+    def read_rows(self):
+        return self.database.read_sql(
+            "select username, game_id, status, engine_depth from analysis_checkpoint"
+        ).values.tolist()
+
+    def test_create_table_exists(self):
+        self.checkpoint.create_table(PATH_CREATE_SQL)
+        self.assertEqual(self.read_rows(), [])
+
+    def test_finish(self):
+        with self.database.connection() as conn:
+            self.checkpoint.finish(conn, "Ainceer", 3, 1)
+        self.assertEqual(self.read_rows(), [["Ainceer", 3, DONE, 1]])
+
+    def test_finish_replaces_row(self):
+        with self.database.connection() as conn:
+            self.checkpoint.finish(conn, "Ainceer", 3, 1)
+        with self.database.connection() as conn:
+            self.checkpoint.finish(conn, "Ainceer", 3, 2)
+        self.assertEqual(self.read_rows(), [["Ainceer", 3, DONE, 2]])
+
+    def test_finish_rolled_back(self):
+        with self.assertRaises(ValueError):
+            with self.database.connection() as conn:
+                self.checkpoint.finish(conn, "Ainceer", 3, 1)
+                raise ValueError
+        self.assertEqual(self.read_rows(), [])
+
+    def test_fail(self):
+        with self.database.connection() as conn:
+            self.checkpoint.finish(conn, "Ainceer", 3, 1)
+        self.checkpoint.fail("Ainceer", 3, 2)
+        self.assertEqual(self.read_rows(), [["Ainceer", 3, FAILED, 2]])
@@ -0,0 +1,247 @@
+import multiprocessing
+import os
+from collections import namedtuple
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from betterchess.utils.database import SQLITE_PRAGMAS, Database, connect_sqlite
+
+
+def insert_games(path_database, username, num_games):
+    database = Database(MagicMock(db_type="sqlite"), path_database, 1)
+    for game_num in range(num_games):
+        with database.connection() as conn:
+            conn.execute(
+                "INSERT INTO pgn_data VALUES (?, ?)", (username, str(game_num))
+            )
+            conn.execute("SELECT COUNT(*) FROM pgn_data").fetchone()
+    database.close()
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.env_handler = MagicMock(db_type="sqlite")
+        self.database = Database(
+            self.env_handler, os.path.join(self.tmp_dir.name, "test.db"), 2
+        )
+        with self.database.connection() as conn:
+            conn.execute("CREATE TABLE pgn_data (username TEXT, url_date TEXT)")
+
+    def tearDown(self):
+        self.database.close()
+        self.tmp_dir.cleanup()
+
+    def test_placeholder(self):
+        self.assertEqual(self.database.placeholder, "?")
+        with patch("betterchess.utils.database.create_engine"):
+            mysql_database = Database(MagicMock(db_type="mysql"), "", 2)
+        self.assertEqual(mysql_database.placeholder, "%s")
+
+    def test_insert_df_read_sql(self):
+        pgn_df = pd.DataFrame(
+            {"username": ["a", "b"], "url_date": [datetime(2020, 1, 1), None]}
+        )
+        with self.database.connection() as conn:
+            self.database.insert_df(conn, "pgn_data", pgn_df)
+        rows = self.database.read_sql(
+            "SELECT * FROM pgn_data WHERE username = ?", ("a",)
+        )
+        self.assertEqual(rows.values.tolist(), [["a", "2020-01-01 00:00:00"]])
+
+    def test_insert_records(self):
+        PgnRecord = namedtuple("PgnRecord", ["username", "url_date"])
+        records = [PgnRecord("a", np.int64(1)), PgnRecord("b", None)]
+        with self.database.connection() as conn:
+            self.database.insert_records(conn, "pgn_data", records)
+        rows = self.database.read_sql("SELECT * FROM pgn_data")
+        self.assertEqual(rows.values.tolist(), [["a", "1"], ["b", None]])
+
+    def test_insert_records_empty(self):
+        conn = MagicMock()
+        self.assertEqual(self.database.insert_records(conn, "pgn_data", []), 0)
+        with patch("betterchess.utils.database.create_engine"):
+            postgres_database = Database(MagicMock(db_type="postgres"), "", 2)
+        self.assertEqual(postgres_database.insert_records(conn, "pgn_data", []), 0)
+        conn.cursor.assert_not_called()
+
+    def test_record_values(self):
+        values = Database.record_values((np.float64(0.5), np.int64(2), "a"))
+        self.assertEqual(values, (0.5, 2, "a"))
+        self.assertIs(type(values[1]), int)
+
+    def test_connection_rolls_back(self):
+        with self.assertRaises(ValueError):
+            with self.database.connection() as conn:
+                conn.execute("INSERT INTO pgn_data VALUES ('a', NULL)")
+                raise ValueError
+        self.assertTrue(self.database.read_sql("SELECT * FROM pgn_data").empty)
+
+    def test_connections_are_pooled(self):
+        first = self.database.raw_connection()
+        dbapi_connection = first.dbapi_connection
+        first.close()
+        second = self.database.raw_connection()
+        self.assertIs(second.dbapi_connection, dbapi_connection)
+        second.close()
+
+    def test_shared_between_threads(self):
+        def insert(username):
+            with self.database.connection() as conn:
+                conn.execute("INSERT INTO pgn_data VALUES (?, NULL)", (username,))
+
+        threads = [threading.Thread(target=insert, args=(str(i),)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.database.read_sql("SELECT * FROM pgn_data")), 8)
+
+    def test_pool_rebuilt_after_fork(self):
+        engine = self.database.engine
+        self.database.pid = -1
+        self.assertIsNot(self.database.engine, engine)
+        self.assertEqual(self.database.pid, os.getpid())
+
+    def test_insert_query(self):
+        self.assertEqual(
+            self.database.insert_query("move_data", ["a", "b"]),
+            "INSERT INTO move_data (a, b) VALUES (?, ?)",
+        )
+
+    def test_insert_query_ignore(self):
+        self.assertEqual(
+            self.database.insert_query("pgn_data", ["a"], ignore=True),
+            "INSERT OR IGNORE INTO pgn_data (a) VALUES (?)",
+        )
+        with patch("betterchess.utils.database.create_engine"):
+            mysql_database = Database(MagicMock(db_type="mysql"), "", 2)
+        self.assertEqual(
+            mysql_database.insert_query("pgn_data", ["a"], ignore=True),
+            "INSERT IGNORE INTO pgn_data (a) VALUES (%s)",
+        )
+
+    def test_insert_query_ignore_postgres(self):
+        with patch("betterchess.utils.database.create_engine"):
+            postgres_database = Database(MagicMock(db_type="postgres"), "", 2)
+        self.assertEqual(postgres_database.placeholder, "%s")
+        self.assertEqual(
+            postgres_database.insert_query("pgn_data", ["a"], ignore=True),
+            "INSERT INTO pgn_data (a) VALUES (%s) ON CONFLICT DO NOTHING",
+        )
+
+    def test_insert_select_query(self):
+        self.assertEqual(
+            self.database.insert_select_query(
+                "pgn_data", ["a", "b"], "SELECT a, b FROM pgn_data_old", ignore=True
+            ),
+            "INSERT OR IGNORE INTO pgn_data (a, b) SELECT a, b FROM pgn_data_old",
+        )
+
+    def test_copy_buffer(self):
+        buffer = Database.copy_buffer(
+            [("a", None, 1, 0.5), ('x"y\nz', "", datetime(2020, 1, 1), None)]
+        )
+        self.assertEqual(
+            buffer.read(),
+            '"a",,"1","0.5"\n"x""y\nz","","2020-01-01 00:00:00",\n',
+        )
+
+    def test_insert_records_postgres_copy(self):
+        with patch("betterchess.utils.database.create_engine"):
+            postgres_database = Database(MagicMock(db_type="postgres"), "", 2)
+        Row = namedtuple("Row", ["username", "game_number"])
+        conn = MagicMock()
+        curs = conn.cursor.return_value
+        curs.rowcount = 2
+        num_rows = postgres_database.insert_records(
+            conn, "move_data", [Row("a", np.int64(1)), Row("b", 2)]
+        )
+        self.assertEqual(num_rows, 2)
+        copy_sql, buffer = curs.copy_expert.call_args.args
+        self.assertEqual(
+            copy_sql,
+            "COPY move_data (username, game_number) FROM STDIN WITH (FORMAT csv)",
+        )
+        self.assertEqual(buffer.read(), '"a","1"\n"b","2"\n')
+        curs.execute.assert_not_called()
+        curs.executemany.assert_not_called()
+
+    def test_insert_df_postgres_copy_ignore(self):
+        with patch("betterchess.utils.database.create_engine"):
+            postgres_database = Database(MagicMock(db_type="postgres"), "", 2)
+        conn = MagicMock()
+        curs = conn.cursor.return_value
+        curs.rowcount = 1
+        pgn_df = pd.DataFrame({"username": ["a", "a"], "game_id": ["1", "2"]})
+        num_rows = postgres_database.insert_df(conn, "pgn_data", pgn_df, ignore=True)
+        self.assertEqual(num_rows, 1)
+        self.assertEqual(
+            curs.copy_expert.call_args.args[0],
+            "COPY pgn_data_copy (username, game_id) FROM STDIN WITH (FORMAT csv)",
+        )
+        self.assertEqual(
+            [call.args[0] for call in curs.execute.call_args_list],
+            [
+                "CREATE TEMPORARY TABLE pgn_data_copy AS SELECT username, game_id FROM pgn_data WITH NO DATA",
+                "INSERT INTO pgn_data (username, game_id) SELECT username, game_id FROM pgn_data_copy ON CONFLICT DO NOTHING",
+                "DROP TABLE pgn_data_copy",
+            ],
+        )
+
+    def test_insert_records_ignore(self):
+        Row = namedtuple("Row", ["game_id"])
+        with self.database.connection() as conn:
+            conn.execute("CREATE TABLE games (game_id TEXT UNIQUE)")
+            first = self.database.insert_records(
+                conn, "games", [Row("a"), Row("b")], ignore=True
+            )
+            second = self.database.insert_records(
+                conn, "games", [Row("b"), Row("c")], ignore=True
+            )
+        self.assertEqual((first, second), (2, 1))
+        rows = self.database.read_sql("SELECT game_id FROM games")
+        self.assertEqual(rows["game_id"].tolist(), ["a", "b", "c"])
+
+    def test_sqlite_pragmas(self):
+        with self.database.connection() as conn:
+            pragmas = {
+                pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+                for pragma in SQLITE_PRAGMAS
+            }
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,
+                "cache_size": -65536,
+                "mmap_size": 268435456,
+                "busy_timeout": 30000,
+            },
+        )
+
+    def test_connect_sqlite(self):
+        conn = connect_sqlite(os.path.join(self.tmp_dir.name, "other.db"))
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        conn.close()
+
+    def test_shared_between_processes(self):
+        path_database = os.path.join(self.tmp_dir.name, "test.db")
+        processes = [
+            multiprocessing.Process(
+                target=insert_games, args=(path_database, str(i), 50)
+            )
+            for i in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([process.exitcode for process in processes], [0] * 4)
+        self.assertEqual(len(self.database.read_sql("SELECT * FROM pgn_data")), 200)
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from betterchess.utils.archive_cache import ArchiveCache
+from betterchess.utils.download import ArchiveDownloader, DownloadError
+from betterchess.utils.extract import Extract
+
+PATH_ARCHIVES = Path("tests/test_utils/fixtures/archives")
+
+
+class StubArchiveHandler(BaseHTTPRequestHandler):
+    """Serves the fixture archives as `.../games/<yyyy>/<mm>` with an `ETag`,
+    `/flaky/<n>` fails with 429 until it has been requested n times and `/down` always
+    fails with 503.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        try:
+            parts = urlsplit(self.path).path.strip("/").split("/")
+            if "games" in parts:
+                path_archive = PATH_ARCHIVES / f"{parts[-2]}_{parts[-1]}.json"
+                if not path_archive.exists():
+                    self.send_body(404, b"{}")
+                    return
+                body = path_archive.read_bytes()
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_body(304, b"", {"ETag": etag})
+                else:
+                    self.send_body(200, body, {"ETag": etag})
+            elif parts[0] == "flaky":
+                if server.requests.count(self.path) < int(parts[1]):
+                    self.send_body(429, b"{}", {"Retry-After": "0"})
+                else:
+                    self.send_body(200, json.dumps({"games": []}).encode())
+            else:
+                self.send_body(503, b"{}")
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def send_body(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestArchiveDownloader(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubArchiveHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.delay = 0.0
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,), daemon=True
+        )
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path_cache = os.path.join(self.tmp_dir.name, "archive_cache.db")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def test_download(self):
+        urls = [f"{self.base_url}/games/2023/01", f"{self.base_url}/games/2023/02"]
+        archives = ArchiveDownloader(min_interval=0).download(urls)
+        self.assertEqual(set(archives), set(urls))
+        self.assertEqual(len(archives[urls[0]]["games"]), 2)
+        self.assertEqual(len(archives[urls[1]]["games"]), 1)
+
+    def test_download_empty(self):
+        self.assertEqual(ArchiveDownloader().download([]), {})
+
+    def test_download_bounded_concurrency(self):
+        self.server.delay = 0.05
+        urls = [f"{self.base_url}/games/2023/01?n={num}" for num in range(8)]
+        archives = ArchiveDownloader(max_concurrency=3, min_interval=0).download(urls)
+        self.assertEqual(len(archives), 8)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+
+    def test_download_progress(self):
+        done = []
+        urls = [f"{self.base_url}/games/2023/01", f"{self.base_url}/games/2023/02"]
+        ArchiveDownloader(min_interval=0).download(urls, on_done=done.append)
+        self.assertEqual(done, [1, 2])
+
+    def test_download_rate_limited(self):
+        urls = [f"{self.base_url}/games/2023/01?n={num}" for num in range(4)]
+        start = time.monotonic()
+        ArchiveDownloader(max_concurrency=4, min_interval=0.05).download(urls)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_download_retries(self):
+        url = f"{self.base_url}/flaky/3"
+        archives = ArchiveDownloader(backoff=0, min_interval=0).download([url])
+        self.assertEqual(archives[url], {"games": []})
+        self.assertEqual(self.server.requests.count("/flaky/3"), 3)
+
+    def test_download_retries_exhausted(self):
+        downloader = ArchiveDownloader(max_retries=2, backoff=0, min_interval=0)
+        with self.assertRaises(DownloadError):
+            downloader.download([f"{self.base_url}/down"])
+        self.assertEqual(self.server.requests.count("/down"), 3)
+
+    def test_download_not_found(self):
+        with self.assertRaises(aiohttp.ClientResponseError):
+            ArchiveDownloader(min_interval=0).download(
+                [f"{self.base_url}/games/1999/01"]
+            )
+        self.assertEqual(self.server.requests.count("/games/1999/01"), 1)
+
+    def test_download_cached_revalidated(self):
+        url = f"{self.base_url}/games/2023/01"
+        archive_cache = ArchiveCache(self.path_cache)
+        downloader = ArchiveDownloader(min_interval=0, cache=archive_cache)
+        first = downloader.download([url])
+        self.assertEqual(downloader.unchanged_urls, set())
+        second = downloader.download([url])
+        archive_cache.close()
+        self.assertEqual(first, second)
+        self.assertEqual(downloader.unchanged_urls, {url})
+        self.assertEqual(self.server.requests.count("/games/2023/01"), 2)
+
+    def test_download_cached_fresh(self):
+        url = f"{self.base_url}/games/2023/01"
+        archive_cache = ArchiveCache(self.path_cache)
+        downloader = ArchiveDownloader(min_interval=0, cache=archive_cache)
+        first = downloader.download([url])
+        second = downloader.download([url], fresh_after={url: datetime(2023, 2, 1)})
+        archive_cache.close()
+        self.assertEqual(first, second)
+        self.assertEqual(downloader.unchanged_urls, {url})
+        self.assertEqual(self.server.requests.count("/games/2023/01"), 1)
+
+    def test_download_cached_stale(self):
+        url = f"{self.base_url}/games/2023/01"
+        archive_cache = ArchiveCache(self.path_cache)
+        archive_cache.put(url, b'{"games": []}', '"old"', None)
+        downloader = ArchiveDownloader(min_interval=0, cache=archive_cache)
+        archives = downloader.download([url], fresh_after={url: datetime.max})
+        cached = archive_cache.get(url)
+        archive_cache.close()
+        self.assertEqual(len(archives[url]["games"]), 2)
+        self.assertEqual(downloader.unchanged_urls, set())
+        self.assertEqual(json.loads(cached.body), archives[url])
+        self.assertNotEqual(cached.etag, '"old"')
+
+    def test_is_fresh(self):
+        cached = MagicMock(fetched_at=datetime(2023, 2, 1, 0, 5))
+        self.assertTrue(ArchiveDownloader.is_fresh(cached, datetime(2023, 2, 1)))
+        self.assertFalse(ArchiveDownloader.is_fresh(cached, datetime(2023, 3, 1)))
+        self.assertFalse(ArchiveDownloader.is_fresh(cached, None))
+        self.assertFalse(ArchiveDownloader.is_fresh(None, datetime(2023, 2, 1)))
+
+    def test_retry_delay(self):
+        downloader = ArchiveDownloader(backoff=0.5)
+        self.assertEqual(downloader.retry_delay(0, None), 0.5)
+        self.assertEqual(downloader.retry_delay(2, None), 2.0)
+        self.assertEqual(downloader.retry_delay(2, "7"), 7.0)
+
+    def test_extract_get_data_from_urls(self):
+        env_handler = MagicMock(download_concurrency=2)
+        file_handler = MagicMock(path_archive_cache=self.path_cache)
+        extract = Extract(MagicMock(), file_handler, MagicMock(), env_handler)
+        archive_url = f"{self.base_url}/pub/player/ainceer/games"
+        urls = {"archives": [f"{archive_url}/2023/01", f"{archive_url}/2023/02"]}
+        pgn_df = extract.get_data_from_urls(urls, MagicMock(), set(), "Ainceer")
+        self.assertEqual(len(pgn_df), 3)
+        self.assertEqual(pgn_df["username"].unique().tolist(), ["Ainceer"])
+        self.assertEqual(pgn_df["url_date"].dt.month.tolist(), [1, 1, 2])
+        self.assertTrue(pgn_df["game_data"][0].startswith('[Event "Live Chess"] ; '))
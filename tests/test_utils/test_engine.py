@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from betterchess.utils.engine import EnginePool, EngineSession
+
+
+class TestEnginePool(unittest.TestCase):
+    def setUp(self):
+        with patch(
+            "chess.engine.SimpleEngine.popen_uci",
+            side_effect=[MagicMock(), MagicMock()],
+        ):
+            self.engine_pool = EnginePool("stockfish", 2)
+
+    def test_init(self):
+        self.assertEqual(len(self.engine_pool.engines), 2)
+        self.assertEqual(self.engine_pool.idle_engines.qsize(), 2)
+
+    def test_acquire(self):
+        with self.engine_pool.acquire() as engine:
+            self.assertIs(engine, self.engine_pool.engines[0])
+            self.assertEqual(self.engine_pool.idle_engines.qsize(), 1)
+        self.assertEqual(self.engine_pool.idle_engines.qsize(), 2)
+
+    def test_acquire_returns_engine_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.engine_pool.acquire():
+                raise ValueError
+        self.assertEqual(self.engine_pool.idle_engines.qsize(), 2)
+
+    def test_close(self):
+        self.engine_pool.close()
+        for engine in self.engine_pool.engines:
+            engine.quit.assert_called_once()
+
+    def test_configure(self):
+        with patch("chess.engine.SimpleEngine.popen_uci") as mock_popen_uci:
+            EnginePool("stockfish", 2, {"Hash": 256, "Threads": 2})
+        self.assertEqual(mock_popen_uci.return_value.configure.call_count, 2)
+        mock_popen_uci.return_value.configure.assert_called_with(
+            {"Hash": 256, "Threads": 2}
+        )
+
+
+class TestEngineSession(unittest.TestCase):
+    def test_game_scope(self):
+        engine_session = EngineSession("game")
+        assert engine_session.game_key("a") is not engine_session.game_key("a")
+
+    def test_user_scope(self):
+        engine_session = EngineSession("user")
+        assert engine_session.game_key("a") is engine_session.game_key("a")
+        assert engine_session.game_key("a") is not engine_session.game_key("b")
+
+    def test_never_scope(self):
+        engine_session = EngineSession("never")
+        assert engine_session.game_key("a") is engine_session.game_key("b")
+
+    def test_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            EngineSession("move")
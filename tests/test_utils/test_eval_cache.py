@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import chess
+
+from betterchess.utils.eval_cache import EvalCache
+
+
+class TestEvalCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "eval_cache.db")
+        self.eval_cache = EvalCache(self.path, max_entries=3, commit_every=1)
+        self.board = chess.Board()
+
+    def tearDown(self):
+        self.eval_cache.close()
+        self.tempdir.cleanup()
+
+    def test_get_miss(self):
+        assert self.eval_cache.get(self.board, 5) == (None, None)
+        assert self.eval_cache.hit_rate() == 0.0
+
+    def test_put_get(self):
+        self.eval_cache.put(self.board, 5, best_move="e2e4", score=30)
+        assert self.eval_cache.get(self.board, 5) == ("e2e4", 30)
+        assert self.eval_cache.get(self.board, 6) == (None, None)
+        assert self.eval_cache.hit_rate() == 0.5
+
+    def test_put_merges(self):
+        self.eval_cache.put(self.board, 5, best_move="e2e4")
+        self.eval_cache.put(self.board, 5, score=30)
+        assert self.eval_cache.get(self.board, 5) == ("e2e4", 30)
+
+    def test_position_key_ignores_move_counters(self):
+        board = chess.Board()
+        board.push_san("Nf3")
+        board.push_san("Nf6")
+        board.push_san("Ng1")
+        board.push_san("Ng8")
+        assert EvalCache.position_key(board) == EvalCache.position_key(self.board)
+
+    def test_evicts_least_recently_used(self):
+        boards = []
+        for san in ["e4", "d4", "c4", "Nf3"]:
+            board = chess.Board()
+            board.push_san(san)
+            boards.append(board)
+        for board in boards[:3]:
+            self.eval_cache.put(board, 5, score=0)
+        self.eval_cache.get(boards[0], 5)
+        self.eval_cache.put(boards[3], 5, score=0)
+        assert self.eval_cache.get(boards[1], 5) == (None, None)
+        assert self.eval_cache.get(boards[0], 5) == (None, 0)
+
+    def test_persists_between_runs(self):
+        self.eval_cache.put(self.board, 5, best_move="e2e4", score=30)
+        self.eval_cache.close()
+        self.eval_cache = EvalCache(self.path, max_entries=3)
+        assert self.eval_cache.get(self.board, 5) == ("e2e4", 30)
+
+    def test_counts_entries(self):
+        for san in ["e4", "d4", "c4", "Nf3"]:
+            board = chess.Board()
+            board.push_san(san)
+            self.eval_cache.put(board, 5, score=0)
+            self.eval_cache.put(board, 5, best_move="e2e4")
+        assert self.eval_cache.num_entries == 3
+        self.eval_cache.close()
+        self.eval_cache = EvalCache(self.path, max_entries=2, commit_every=1)
+        assert self.eval_cache.num_entries == 3
+        self.eval_cache.put(self.board, 5, score=0)
+        assert self.eval_cache.num_entries == 2
+
+    def test_hits_do_not_commit(self):
+        self.eval_cache.close()
+        self.eval_cache = EvalCache(self.path, max_entries=3, commit_every=2)
+        self.eval_cache.put(self.board, 5, score=30)
+        for _ in range(3):
+            self.eval_cache.get(self.board, 5)
+            self.eval_cache.put(self.board, 5, best_move="e2e4")
+        assert self.eval_cache.pending == 1
+        assert self.eval_cache.conn.in_transaction
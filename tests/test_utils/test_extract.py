@@ -1,10 +1,13 @@
 import json
+import tempfile
 import unittest
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
+from betterchess.core.records import PgnRecord
+from betterchess.utils.database import Database
 from betterchess.utils.extract import Extract
 
 
@@ -33,10 +36,6 @@ class TestExtract(unittest.TestCase):
         self.urls = json.loads(
             '{"archives": ["https://example.com/pgn1", "https://example.com/pgn2"]}'
         )
-        self.num_urls = len(self.urls["archives"])
-        self.username_list = []
-        self.url_date_list = []
-        self.games_list = []
         self.pgn_df = pd.DataFrame(
             {
                 "username": ["test_username"],
@@ -66,122 +65,205 @@ class TestExtract(unittest.TestCase):
         self.extract
         self.extract.get_data_from_urls = MagicMock(return_value=mock_pgn_df)
         self.extract.export_pgn_data = MagicMock()
+        extracted_url_dates = {datetime(2022, 1, 1)}
+        self.extract.get_extracted_url_dates = MagicMock(
+            return_value=extracted_url_dates
+        )
 
         username = "testuser"
-        path_userlogfile = "logs/testuser.log"
-        self.extract.run_data_extract(username, path_userlogfile, mock_logger)
+        self.extract.run_data_extract(username, mock_logger)
 
         mock_get_player_game_archives.assert_called_once_with(username)
+        self.extract.get_extracted_url_dates.assert_called_once_with(username)
         self.extract.get_data_from_urls.assert_called_once_with(
-            mock_urls, 2, mock_logger, path_userlogfile, username, [], [], []
+            mock_urls, mock_logger, extracted_url_dates, username
         )
         self.extract.export_pgn_data.assert_called_once_with(mock_pgn_df)
 
     def test_get_data_from_urls(self):
         # Arrange
         self.extract.in_curr_month = MagicMock(return_value=True)
-        self.extract.url_in_log = MagicMock(return_value=False)
+        self.extract.url_extracted = MagicMock(return_value=False)
         self.extract.get_url_date = MagicMock(
             return_value=datetime.now().strftime("%Y-%m-%d")
         )
-        self.extract.extract_filter = MagicMock(return_value=["game1", "game2"])
-        self.extract.simple_progress_bar = MagicMock()
+        self.extract.extract_filter = MagicMock(side_effect=[True, False])
+        self.extract.download_archives = MagicMock(
+            return_value=(
+                {
+                    "https://example.com/pgn1": {
+                        "games": [
+                            {"url": "url1", "pgn": "game1"},
+                            {"url": "url2", "pgn": "game2"},
+                        ]
+                    }
+                },
+                set(),
+            )
+        )
 
         # Act
         result = self.extract.get_data_from_urls(
-            self.urls,
-            self.num_urls,
-            self.run_handler.logger,
-            self.file_handler.path_userlogfile,
-            self.input_handler.username,
-            self.username_list,
-            self.url_date_list,
-            self.games_list,
+            self.urls, self.run_handler.logger, set(), self.input_handler.username
         )
 
         # Assert
-        self.assertIsNotNone(result)
         self.assertIsInstance(result, pd.DataFrame)
-        self.assertEqual(len(result), 4)
-        self.assertEqual(
-            result["game_data"].tolist(), ["game1", "game2", "game1", "game2"]
-        )
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result["game_data"].tolist(), ["game1", "game2"])
+        self.assertEqual(result["game_id"].tolist(), ["url1", "url2"])
         self.extract.in_curr_month.assert_called()
-        self.extract.url_in_log.assert_called()
+        self.extract.url_extracted.assert_called()
         self.extract.get_url_date.assert_called()
-        self.extract.extract_filter.assert_called()
-        self.extract.simple_progress_bar.assert_called()
-
-        self.env_handler = MagicMock()
-
-    @patch("betterchess.utils.extract.Extract.collect_game_data")
-    def test_extract_filter_no_logs(self, mock_collect_game_data):
-
-        mock_collect_game_data.return_value = [1, 2, 3]
+        self.assertEqual(self.extract.extract_filter.call_count, 2)
+        self.extract.download_archives.assert_called_once_with(
+            ["https://example.com/pgn1"]
+        )
 
-        result = self.extract.extract_filter("username", False, False, "url")
-        self.assertEqual(result, [1, 2, 3])
+    def test_get_data_from_urls_current_month(self):
+        self.extract.in_curr_month = MagicMock(return_value=True)
+        self.extract.url_extracted = MagicMock(return_value=True)
+        self.extract.get_url_date = MagicMock(return_value=datetime(2022, 12, 1))
+        self.extract.download_archives = MagicMock(
+            return_value=(
+                {
+                    "https://example.com/pgn1": {
+                        "games": [{"url": "url1", "pgn": "game1"}]
+                    },
+                    "https://example.com/pgn2": {
+                        "games": [{"url": "url2", "pgn": "game2"}]
+                    },
+                },
+                {"https://example.com/pgn1"},
+            )
+        )
 
-    @patch("betterchess.utils.extract.Extract.filter_pgn_table")
-    def test_extract_filter_logs_no_curr(self, mock_filter_pgn_table):
-        mock_filter_pgn_table.return_value = None
+        result = self.extract.get_data_from_urls(
+            self.urls, self.run_handler.logger, {datetime(2022, 12, 1)}, "Ainceer"
+        )
 
-        result = self.extract.extract_filter("username", True, False, "url")
-        self.assertEqual(result, [])
-        mock_filter_pgn_table.assert_not_called()
+        self.assertEqual(result["game_data"].tolist(), ["game2"])
 
-    @patch("betterchess.utils.extract.Extract.collect_game_data")
-    @patch("betterchess.utils.extract.Extract.filter_pgn_table")
-    def test_extract_filter_logs_curr(
-        self, mock_filter_pgn_table, mock_collect_game_data
-    ):
-        mock_collect_game_data.return_value = [1, 2, 3]
-        mock_filter_pgn_table.return_value = None
+    def test_export_pgn_data_skips_stored_games(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(MagicMock(db_type="sqlite"), f"{tmp_dir}/test.db")
+            with open("./betterchess/utils/sql/sqlite/create_pgn_table.sql") as sql:
+                with database.connection() as conn:
+                    conn.execute(sql.read())
+            self.run_handler.database = database
+            pgn_df = pd.DataFrame(
+                {
+                    "username": ["Ainceer", "Ainceer"],
+                    "url_date": [datetime(2022, 12, 1)] * 2,
+                    "game_id": ["url1", "url2"],
+                    "game_data": ["game1", "game2"],
+                }
+            )
+            first = self.extract.export_pgn_data(pgn_df.iloc[:1])
+            second = self.extract.export_pgn_data(pgn_df)
+            stored = database.read_sql("select game_id from pgn_data")
+            database.close()
+        self.assertEqual((first, second), (1, 1))
+        self.assertEqual(stored["game_id"].tolist(), ["url1", "url2"])
+
+    def test_export_pgn_data_empty(self):
+        self.assertEqual(self.extract.export_pgn_data(pd.DataFrame()), 0)
+
+    def test_extract_filter_no_logs(self):
+        self.assertTrue(self.extract.extract_filter(False, False))
+
+    def test_extract_filter_logs_no_curr(self):
+        self.assertFalse(self.extract.extract_filter(True, False))
+
+    def test_extract_filter_logs_curr(self):
+        self.assertTrue(self.extract.extract_filter(True, True))
+
+    @patch("betterchess.utils.extract.ArchiveCache")
+    @patch("betterchess.utils.extract.ArchiveDownloader")
+    def test_download_archives(self, mock_downloader, mock_cache):
+        self.env_handler.download_concurrency = 8
+        self.file_handler.path_archive_cache = "archive_cache.db"
+        downloader = mock_downloader.return_value
+        downloader.download.return_value = {"url": {"games": []}}
+        downloader.unchanged_urls = {"url"}
+        url = "https://api.chess.com/pub/player/ainceer/games/2022/12"
+
+        result = self.extract.download_archives([url])
+
+        mock_cache.assert_called_once_with("archive_cache.db")
+        mock_downloader.assert_called_once_with(8, cache=mock_cache.return_value)
+        self.assertEqual(
+            downloader.download.call_args.kwargs["fresh_after"],
+            {url: datetime(2023, 1, 1)},
+        )
+        self.assertEqual(result, ({"url": {"games": []}}, {"url"}))
+        mock_cache.return_value.close.assert_called_once()
 
-        result = self.extract.extract_filter("username", True, True, "url")
-        self.assertEqual(result, [1, 2, 3])
-        mock_filter_pgn_table.assert_called_once_with("username")
+    def test_next_month(self):
+        self.assertEqual(
+            self.extract.next_month(datetime(2022, 11, 1)), datetime(2022, 12, 1)
+        )
+        self.assertEqual(
+            self.extract.next_month(datetime(2022, 12, 1)), datetime(2023, 1, 1)
+        )
 
-    @patch("requests.get")
-    def test_collect_game_data(self, mock_get):
-        mock_response = mock_get.return_value
-        mock_response.json.return_value = {
+    def test_collect_game_data(self):
+        archive = {
             "games": [
-                {"pgn": "1. e4 e5 2. Nf3 Nc6\n"},
-                {"pgn": "1. d4 d5 2. c4 dxc4 3. e3 Nf6 4. Bxc4 e6"},
+                {
+                    "url": "url1",
+                    "pgn": '[UTCDate "2022.12.03"]\n[UTCTime "10:15:00"]\n'
+                    '[TimeControl "600"]\n\n1. e4 e5 2. Nf3 Nc6\n',
+                },
+                {"url": "url2", "pgn": "1. d4 d5 2. c4 dxc4 3. e3 Nf6 4. Bxc4 e6"},
             ]
         }
-        result = self.extract.collect_game_data("https://example.com/games")
+        result = self.extract.collect_game_data(
+            archive, "Ainceer", datetime(2022, 12, 1)
+        )
         expected_result = [
-            "1. e4 e5 2. Nf3 Nc6 ; ",
-            "1. d4 d5 2. c4 dxc4 3. e3 Nf6 4. Bxc4 e6",
+            PgnRecord(
+                "Ainceer",
+                datetime(2022, 12, 1),
+                "url1",
+                datetime(2022, 12, 3, 10, 15),
+                "600",
+                '[UTCDate "2022.12.03"] ; [UTCTime "10:15:00"] ; [TimeControl "600"]'
+                " ;  ; 1. e4 e5 2. Nf3 Nc6 ; ",
+            ),
+            PgnRecord(
+                "Ainceer",
+                datetime(2022, 12, 1),
+                "url2",
+                None,
+                None,
+                "1. d4 d5 2. c4 dxc4 3. e3 Nf6 4. Bxc4 e6",
+            ),
         ]
         self.assertEqual(result, expected_result)
 
-    @patch(
-        "betterchess.utils.extract.Extract.get_url_date",
-        return_value=datetime(23, 1, 1, 0, 0, 0),
-    )
-    def test_url_in_log_true(self, mock_date):
-        test_file_path = r"tests/test_utils/fixtures/test_url_in_log1.log"
-        actual = self.extract.url_in_log(
-            url="chess.com/testgame/date", path_userlogfile=test_file_path
-        )
-        assert actual is False
-
-    @patch(
-        "betterchess.utils.extract.Extract.get_url_date",
-        return_value=datetime.strptime(
-            "2023-01-01 00:00:00",
-            "%Y-%m-%d %H:%M:%S",
-        ),
-    )
-    def test_url_in_log_false(self, mock_date):
-        test_file_path = r"tests/test_utils/fixtures/test_url_in_log2.log"
-        actual = self.extract.url_in_log(
-            url="chess.com/testgame/date", path_userlogfile=test_file_path
-        )
-        assert actual is True
+    def test_url_extracted_true(self):
+        url = "https://api.chess.com/pub/player/ainceer/games/2023/01"
+        extracted_url_dates = {datetime(2022, 12, 1), datetime(2023, 1, 1)}
+        assert self.extract.url_extracted(url, extracted_url_dates) is True
+
+    def test_url_extracted_false(self):
+        url = "https://api.chess.com/pub/player/ainceer/games/2023/02"
+        extracted_url_dates = {datetime(2022, 12, 1), datetime(2023, 1, 1)}
+        assert self.extract.url_extracted(url, extracted_url_dates) is False
+
+    def test_get_extracted_url_dates(self):
+        database = self.run_handler.database
+        database.placeholder = "?"
+        database.read_sql.return_value = pd.DataFrame(
+            {"url_date": ["2022-12-01 00:00:00", datetime(2023, 1, 1)]}, dtype=object
+        )
+        actual = self.extract.get_extracted_url_dates("Ainceer")
+        assert actual == {datetime(2022, 12, 1), datetime(2023, 1, 1)}
+        database.read_sql.assert_called_once_with(
+            "select distinct url_date from pgn_data where username = ? and url_date is not null",
+            ("Ainceer",),
+        )
 
     @patch("betterchess.utils.extract.Extract.get_curr_mth", return_value="2020-10-01")
     @patch("betterchess.utils.extract.Extract.get_url_date", return_value="2020-10-01")
@@ -38,7 +38,10 @@ class TestFileHandler(unittest.TestCase):
         # Assert that the correct values are stored in the instance variables
         self.assertEqual(file_handler.username, "test_user")
         self.assertEqual(file_handler.rpath_database, "../../data/betterchess.db")
-        self.assertEqual(file_handler.rpath_temp, "../../data/temp.pgn")
+        self.assertEqual(file_handler.rpath_eval_cache, "../../data/eval_cache.db")
+        self.assertEqual(
+            file_handler.rpath_archive_cache, "../../data/archive_cache.db"
+        )
         self.assertEqual(file_handler.rpath_config_path, "../../config/datasets.yaml")
 
 
@@ -63,20 +66,41 @@ class TestRunHandler(unittest.TestCase):
                 datefmt="%Y/%m/%d %I:%M:%S",
             )
 
-    def test_create_engine(self):
-        # Create an instance of the FileHandler class
+    def test_create_engine_pool(self):
         env_handler = MagicMock()
         file_handler = FileHandler("test_user", env_handler)
-
-        # Create an instance of the RunHandler class
         run_handler = RunHandler(file_handler)
 
-        # Use the patch decorator to mock the chess.engine.SimpleEngine.popen_uci method
         with patch("chess.engine.SimpleEngine.popen_uci") as mock_popen_uci:
-            run_handler.create_engine()
+            engine_pool = run_handler.create_engine_pool(3)
+
+            self.assertEqual(mock_popen_uci.call_count, 3)
+            self.assertIs(run_handler.engine_pool, engine_pool)
+            mock_popen_uci.return_value.configure.assert_not_called()
+
+    def test_create_database(self):
+        env_handler = MagicMock()
+        file_handler = FileHandler("test_user", env_handler)
+        run_handler = RunHandler(file_handler)
+
+        with patch("betterchess.utils.handlers.Database") as mock_database:
+            database = run_handler.create_database(4)
+
+            mock_database.assert_called_once_with(
+                env_handler, file_handler.path_database, 4
+            )
+            self.assertIs(run_handler.database, database)
 
-            # Assert that the popen_uci method was called with the correct argument
-            mock_popen_uci.assert_called_with(file_handler.path_stockfish)
+    def test_create_engine_session(self):
+        env_handler = MagicMock()
+        file_handler = FileHandler("test_user", env_handler)
+        run_handler = RunHandler(file_handler)
+        self.assertEqual(run_handler.engine_session.scope, "game")
+
+        engine_session = run_handler.create_engine_session("never")
+
+        self.assertIs(run_handler.engine_session, engine_session)
+        self.assertEqual(engine_session.scope, "never")
 
 
 class TestEnvHandler(unittest.TestCase):
@@ -87,7 +111,29 @@ class TestEnvHandler(unittest.TestCase):
         # Use the patch decorator to mock the os.getenv function
         with patch(
             "os.getenv",
-            side_effect=["sqlite", "sqlite3", None, None, None, None, "folder", "file"],
+            side_effect=[
+                "sqlite",
+                "sqlite3",
+                None,
+                None,
+                None,
+                None,
+                "folder",
+                "file",
+                "4",
+                "true",
+                "1000",
+                "user",
+                "256",
+                None,
+                "3",
+                "8",
+                "pg_user",
+                "pg_password",
+                "localhost",
+                "betterchess",
+                "600, 180+2",
+            ],
         ):
             env_handler.create_environment()
 
@@ -100,3 +146,30 @@ class TestEnvHandler(unittest.TestCase):
             self.assertIsNone(env_handler.mysql_db)
             self.assertEqual(env_handler.stk_folder, "folder")
             self.assertEqual(env_handler.stk_file, "file")
+            self.assertEqual(env_handler.engine_processes, 4)
+            self.assertTrue(env_handler.eval_chaining)
+            self.assertEqual(env_handler.eval_cache_size, 1000)
+            self.assertEqual(env_handler.engine_hash_scope, "user")
+            self.assertEqual(env_handler.engine_options(), {"Hash": 256})
+            self.assertEqual(env_handler.db_pool_size, 3)
+            self.assertEqual(env_handler.download_concurrency, 8)
+            self.assertEqual(env_handler.postgres_user, "pg_user")
+            self.assertEqual(env_handler.postgres_password, "pg_password")
+            self.assertEqual(env_handler.postgres_host, "localhost")
+            self.assertEqual(env_handler.postgres_db, "betterchess")
+            self.assertEqual(env_handler.time_controls, ["600", "180+2"])
+
+    def test_create_checkpoint(self):
+        env_handler = MagicMock()
+        file_handler = FileHandler("test_user", env_handler)
+        run_handler = RunHandler(file_handler)
+        run_handler.database = MagicMock()
+
+        with patch("betterchess.utils.handlers.Checkpoint") as mock_checkpoint:
+            checkpoint = run_handler.create_checkpoint("create_checkpoint_table.sql")
+
+            mock_checkpoint.assert_called_once_with(run_handler.database)
+            checkpoint.create_table.assert_called_once_with(
+                "create_checkpoint_table.sql"
+            )
+            self.assertIs(run_handler.checkpoint, checkpoint)
@@ -0,0 +1,86 @@
+import sqlite3
+import unittest
+from datetime import datetime
+
+import chess
+
+from betterchess.core.records import MoveRecord
+from betterchess.utils.move_codes import compact_move, encode_uci
+
+
+def read_sql_file(name: str) -> str:
+    with open(f"./betterchess/utils/sql/sqlite/{name}.sql") as sql_file:
+        return sql_file.read()
+
+
+class TestMoveCodes(unittest.TestCase):
+    def test_encode_uci(self):
+        self.assertEqual(encode_uci("e2e4"), chess.E2 | chess.E4 << 6)
+        self.assertEqual(
+            encode_uci("a7b8q"), chess.A7 | chess.B8 << 6 | chess.QUEEN << 12
+        )
+        self.assertEqual(encode_uci("0000"), 0)
+        self.assertIsNone(encode_uci(None))
+        self.assertLess(encode_uci("h2h1n"), 2**15)
+
+    def test_compact_move(self):
+        values = dict.fromkeys(MoveRecord._fields, 3)
+        values.update(
+            Username="Ainceer",
+            Game_date=datetime(2022, 1, 1),
+            Move="e1g1",
+            Best_move=None,
+            Move_type="-1",
+            Piece="king",
+            Move_colour="white",
+            Castling_type="white_short",
+        )
+        compact = compact_move(MoveRecord(**values))
+        self.assertEqual(compact.move, chess.E1 | chess.G1 << 6)
+        self.assertIsNone(compact.best_move)
+        self.assertEqual(compact.move_type, -1)
+        self.assertEqual(compact.piece, chess.KING)
+        self.assertEqual(compact.castling_type, 1)
+        self.assertEqual(compact.game_id, 3)
+
+    def test_move_view_decodes(self):
+        moves = [
+            chess.Move(from_square, to_square).uci()
+            for from_square in chess.SQUARES
+            for to_square in chess.SQUARES
+            if from_square != to_square
+        ]
+        moves += ["a7a8q", "b2b1n", "c7d8r", "h2g1b", "0000"]
+        conn = sqlite3.connect(":memory:")
+        for name in ("game_table", "move_table", "move_view"):
+            conn.execute(read_sql_file(f"create_{name}"))
+        conn.execute("insert into game_data (Username, Game_number) values ('a', 1)")
+        for move_num, uci in enumerate(moves):
+            values = dict.fromkeys(MoveRecord._fields)
+            values.update(Game_number=1, Move_number=move_num, Move=uci, Piece=" ")
+            conn.execute(
+                "insert into moves values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                compact_move(MoveRecord(**values)),
+            )
+        rows = conn.execute(
+            "select Move, Piece, Move_colour from move_data order by Move_number"
+        ).fetchall()
+        conn.close()
+        self.assertEqual([row[0] for row in rows], moves)
+        self.assertEqual(rows[0][1:], (" ", "white"))
+        self.assertEqual(rows[1][1:], (" ", "black"))
+
+    def test_move_view_joins_by_index(self):
+        conn = sqlite3.connect(":memory:")
+        for name in ("game_table", "move_table", "move_view"):
+            conn.execute(read_sql_file(f"create_{name}"))
+        plan = conn.execute("explain query plan select * from move_data").fetchall()
+        conn.close()
+        details = [row[-1] for row in plan]
+        self.assertIn("SCAN m", details)
+        self.assertTrue(
+            any(
+                detail.startswith("SEARCH g USING") and "(Game_number=?)" in detail
+                for detail in details
+            )
+        )
@@ -0,0 +1,26 @@
+import unittest
+from datetime import datetime
+
+from betterchess.utils.pgn_headers import game_datetime, read_headers
+
+
+class TestPgnHeaders(unittest.TestCase):
+    def test_read_headers(self):
+        lines = ['[White "a"]', '[UTCDate "2020.05.03"]', "", '1. e4 {[x "y"]} *']
+        self.assertEqual(read_headers(lines), {"White": "a", "UTCDate": "2020.05.03"})
+
+    def test_game_datetime_utc(self):
+        headers = {
+            "Date": "2020.05.02",
+            "Time": "23:00:00",
+            "UTCDate": "2020.05.03",
+            "UTCTime": "04:00:00",
+        }
+        self.assertEqual(game_datetime(headers), datetime(2020, 5, 3, 4))
+
+    def test_game_datetime_date(self):
+        self.assertEqual(game_datetime({"Date": "2020.05.02"}), datetime(2020, 5, 2))
+
+    def test_game_datetime_unknown(self):
+        self.assertIsNone(game_datetime({"Date": "????.??.??"}))
+        self.assertIsNone(game_datetime({}))
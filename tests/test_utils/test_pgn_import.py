@@ -0,0 +1,195 @@
+import bz2
+import gzip
+import hashlib
+import io
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import nullcontext
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import chess.engine
+import chess.pgn
+
+from betterchess.core.records import PgnRecord
+from betterchess.core.user import PrepareUsers, User
+from betterchess.utils.checkpoint import Checkpoint
+from betterchess.utils.database import Database
+from betterchess.utils.handlers import RunHandler
+from betterchess.utils.pgn_import import PgnImporter
+
+PATH_PGN = "./tests/test_utils/fixtures/test_import.pgn"
+
+
+class FakeEngine:
+    """Engine which scores every position as level and plays the first legal move."""
+
+    def analyse(self, board, limit, game=None):
+        info = {"score": chess.engine.PovScore(chess.engine.Cp(0), chess.WHITE)}
+        if any(board.legal_moves):
+            info["pv"] = [next(iter(board.legal_moves))]
+        return info
+
+    def play(self, board, limit, game=None):
+        return chess.engine.PlayResult(next(iter(board.legal_moves)), None)
+
+
+class TestPgnImporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database = Database(
+            MagicMock(db_type="sqlite"), os.path.join(self.tmp_dir.name, "test.db"), 2
+        )
+        with self.database.connection() as conn:
+            with open("./betterchess/utils/sql/sqlite/create_pgn_table.sql") as sql:
+                conn.execute(sql.read())
+        self.pgn_importer = PgnImporter(self.database, batch_size=1)
+
+    def tearDown(self):
+        self.database.close()
+        self.tmp_dir.cleanup()
+
+    def compressed_copy(self, module, suffix):
+        path = os.path.join(self.tmp_dir.name, f"games.pgn{suffix}")
+        with open(PATH_PGN, "rb") as pgn_file, module.open(path, "wb") as out_file:
+            shutil.copyfileobj(pgn_file, out_file)
+        return path
+
+    def test_import_file(self):
+        self.assertEqual(self.pgn_importer.import_file(PATH_PGN, "Ainceer"), (2, 0))
+        pgn_df = self.database.read_sql("select * from pgn_data")
+        self.assertEqual(pgn_df["username"].tolist(), ["Ainceer", "Ainceer"])
+        self.assertEqual(pgn_df["url_date"].tolist(), ["2021-02-01 00:00:00", None])
+        self.assertEqual(
+            pgn_df["game_id"].tolist()[0], "https://www.chess.com/game/live/1"
+        )
+        self.assertTrue(pgn_df["game_id"].tolist()[1].startswith("sha1:"))
+        self.assertEqual(
+            pgn_df["game_datetime"].tolist(), ["2021-02-22 19:35:47", None]
+        )
+
+    def test_import_file_twice(self):
+        self.pgn_importer.import_file(PATH_PGN, "Ainceer")
+        self.assertEqual(self.pgn_importer.import_file(PATH_PGN, "Ainceer"), (0, 2))
+        self.assertEqual(len(self.database.read_sql("select * from pgn_data")), 2)
+
+    def test_import_file_batches(self):
+        self.pgn_importer.export_batch = MagicMock(side_effect=len)
+        self.pgn_importer.batch_size = 1
+        self.assertEqual(self.pgn_importer.import_file(PATH_PGN, "Ainceer"), (2, 0))
+        self.assertEqual(self.pgn_importer.export_batch.call_count, 2)
+
+    def test_import_file_compressed(self):
+        for module, suffix in ((gzip, ".gz"), (bz2, ".bz2"), (lzma, ".xz")):
+            path = self.compressed_copy(module, suffix)
+            self.assertEqual(
+                self.pgn_importer.import_file(path, "Ainceer"), (2, 0)
+            )
+            with self.database.connection() as conn:
+                conn.execute("delete from pgn_data")
+
+    def test_imported_game_readable(self):
+        self.pgn_importer.import_file(PATH_PGN, "Ainceer")
+        game_data = self.database.read_sql("select game_data from pgn_data")
+        game_pgn = PrepareUsers().current_game(game_data["game_data"][0])
+        chess_game = chess.pgn.read_game(io.StringIO(game_pgn))
+        self.assertEqual(chess_game.headers["White"], "Ainceer")
+        self.assertEqual(len(list(chess_game.mainline_moves())), 7)
+
+    def test_read_games(self):
+        pgn_file = io.StringIO("\n\n" + open(PATH_PGN).read())
+        games = list(self.pgn_importer.read_games(pgn_file))
+        self.assertEqual(len(games), 3)
+        self.assertEqual(games[0][0], '[Event "Live Chess"]')
+        self.assertEqual(games[0][-1], "")
+        self.assertIn("[which starts with a bracket]} 3. Bc4 Nf6 4. Qxf7# 1-0", games[0])
+        self.assertEqual(games[2][-1], "1. d4 d5 1/2-1/2")
+
+    def test_read_games_generator(self):
+        games = self.pgn_importer.read_games(io.StringIO(open(PATH_PGN).read()))
+        self.assertEqual(next(games)[3], '[White "Ainceer"]')
+
+    def test_user_records(self):
+        games = [['[White "a"]', '[Black "b"]', '[Date "2020.05.03"]', "", "1. e4 *", ""]]
+        game_data = '[White "a"] ; [Black "b"] ; [Date "2020.05.03"] ;  ; 1. e4 *'
+        self.assertEqual(
+            list(self.pgn_importer.user_records(iter(games), "B")),
+            [
+                PgnRecord(
+                    "B",
+                    datetime(2020, 5, 1),
+                    f"sha1:{hashlib.sha1(game_data.encode()).hexdigest()}",
+                    datetime(2020, 5, 3),
+                    None,
+                    game_data,
+                )
+            ],
+        )
+        self.assertEqual(list(self.pgn_importer.user_records(iter(games), "c")), [])
+
+    def test_game_id(self):
+        self.assertEqual(self.pgn_importer.game_id({"Link": "link"}, "game"), "link")
+        self.assertEqual(
+            self.pgn_importer.game_id({}, "game"),
+            f"sha1:{hashlib.sha1(b'game').hexdigest()}",
+        )
+
+    def test_game_month(self):
+        self.assertEqual(
+            self.pgn_importer.game_month("2020.05.03"), datetime(2020, 5, 1)
+        )
+        self.assertIsNone(self.pgn_importer.game_month("????.??.??"))
+        self.assertIsNone(self.pgn_importer.game_month(None))
+
+
+class TestImportAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database = Database(
+            MagicMock(db_type="sqlite"), os.path.join(self.tmp_dir.name, "test.db"), 2
+        )
+        with self.database.connection() as conn:
+            for name in ("pgn", "game", "move", "checkpoint"):
+                with open(f"./betterchess/utils/sql/sqlite/create_{name}_table.sql") as sql:
+                    conn.execute(sql.read())
+            with open("./betterchess/utils/sql/sqlite/create_move_view.sql") as sql:
+                conn.execute(sql.read())
+
+    def tearDown(self):
+        self.database.close()
+        self.tmp_dir.cleanup()
+
+    @patch("builtins.print")
+    def test_import_then_analyse(self, mock_print):
+        PgnImporter(self.database).import_file(PATH_PGN, "Ainceer")
+        run_handler = RunHandler(
+            MagicMock(), database=self.database, checkpoint=Checkpoint(self.database)
+        )
+        run_handler.logger = MagicMock()
+        run_handler.engine_pool = MagicMock(size=1)
+        run_handler.engine_pool.acquire.side_effect = lambda: nullcontext(FakeEngine())
+        input_handler = MagicMock(
+            username="Ainceer", start_date=datetime(2021, 1, 1), edepth=1
+        )
+        env_handler = MagicMock(time_controls=[], eval_chaining=False)
+        User(input_handler, MagicMock(), run_handler, env_handler).run_analysis()
+        game_df = self.database.read_sql(
+            "select Game_number, Game_date, User_colour, User_rating, Termination from game_data order by Game_number"
+        )
+        self.assertEqual(
+            game_df.values.tolist(),
+            [
+                [1, "2021-02-22 19:35:47", "White", None, "Win"],
+                [2, None, "Black", None, "Draw"],
+            ],
+        )
+        move_df = self.database.read_sql(
+            "select Game_number, Move_time from move_data order by Game_number, Move_number"
+        )
+        self.assertEqual(move_df["Game_number"].tolist(), [1] * 7 + [2] * 2)
+        # The fixture has no TimeControl, so only Qh5 has a known clock before it.
+        self.assertEqual(move_df["Move_time"].count(), 1)
+        self.assertAlmostEqual(move_df["Move_time"][2], 2.7)
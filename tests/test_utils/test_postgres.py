@@ -0,0 +1,118 @@
+"""Runs against a local postgres database when `postgres_test_db` is set, e.g.
+
+    postgres_test_host=localhost postgres_test_user=postgres
+    postgres_test_password=postgres postgres_test_db=betterchess_test python -m pytest
+
+The betterchess tables in that database are dropped and recreated by each test.
+"""
+import os
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from betterchess.core.game import Game
+from betterchess.core.records import GameRecord, MoveRecord
+from betterchess.core.user import PrepareUsers
+from betterchess.data_manager.browse import TableBrowser
+from betterchess.data_manager.migration import SchemaMigration
+from betterchess.utils.checkpoint import Checkpoint
+from betterchess.utils.config import Config
+from betterchess.utils.database import Database
+from betterchess.utils.pgn_import import PgnImporter
+
+PATH_PGN = "./tests/test_utils/fixtures/test_import.pgn"
+TABLES = ("pgn", "game", "move", "checkpoint")
+
+
+@unittest.skipUnless(os.getenv("postgres_test_db"), "postgres_test_db is not set")
+class TestPostgres(unittest.TestCase):
+    def setUp(self):
+        env_handler = MagicMock(
+            db_type="postgres",
+            postgres_user=os.getenv("postgres_test_user"),
+            postgres_password=os.getenv("postgres_test_password"),
+            postgres_host=os.getenv("postgres_test_host"),
+            postgres_db=os.getenv("postgres_test_db"),
+        )
+        self.database = Database(env_handler, "", 2)
+        config = Config()
+        config.create_config()
+        self.config = config.conf.postgres
+        with self.database.connection() as conn:
+            curs = conn.cursor()
+            curs.execute(self.read_sql_file("drop_move_view"))
+            for table in TABLES:
+                curs.execute(self.read_sql_file(f"drop_{table}_table"))
+            for table in TABLES:
+                curs.execute(self.read_sql_file(f"create_{table}_table"))
+            curs.execute(self.read_sql_file("create_move_view"))
+            curs.execute(self.read_sql_file("create_pgn_index"))
+            curs.close()
+
+    def tearDown(self):
+        self.database.close()
+
+    def read_sql_file(self, name):
+        with open(self.config[name].file_path) as sql:
+            return sql.read()
+
+    def test_import_file_copy(self):
+        pgn_importer = PgnImporter(self.database)
+        self.assertEqual(pgn_importer.import_file(PATH_PGN, "Ainceer"), (2, 0))
+        self.assertEqual(pgn_importer.import_file(PATH_PGN, "Ainceer"), (0, 2))
+        pgn_df = self.database.read_sql(
+            "select id, game_datetime, game_data from pgn_data order by id"
+        )
+        self.assertEqual(pgn_df["id"].tolist(), [1, 2])
+        self.assertEqual(pgn_df["game_datetime"][0], datetime(2021, 2, 22, 19, 35, 47))
+        self.assertIn(" ; 1. e4 {[%clk 0:09:59.2]}", pgn_df["game_data"][0])
+
+    def test_export_game_data_copy(self):
+        values = dict.fromkeys(GameRecord._fields)
+        values.update(Username="Ainceer", Game_number=1, Engine_depth=8)
+        move_values = dict.fromkeys(MoveRecord._fields)
+        move_values.update(Username="Ainceer", Game_number=1, Move="e2e4")
+        move_rows = [
+            MoveRecord(**dict(move_values, Move_number=move_num))
+            for move_num in range(3)
+        ]
+        Game(None, None, None, None, {}).export_game_data(
+            GameRecord(**values), move_rows, self.database, Checkpoint(self.database)
+        )
+        move_df = self.database.read_sql("select move, move_time from move_data")
+        self.assertEqual(move_df["move"].tolist(), ["e2e4"] * 3)
+        self.assertTrue(move_df["move_time"].isna().all())
+        checkpoint_df = self.database.read_sql(
+            "select game_id from analysis_checkpoint where status = 'done'"
+        )
+        self.assertEqual(checkpoint_df["game_id"].tolist(), [1])
+
+    def test_users_games(self):
+        PgnImporter(self.database).import_file(PATH_PGN, "Ainceer")
+        users_games = PrepareUsers().users_games(
+            self.database, "Ainceer", datetime(2021, 1, 1), [], 8
+        )
+        # game 2 has no date, so it is analysed whatever the start date.
+        self.assertEqual([game_id for game_id, _ in users_games], [1, 2])
+
+    def test_browse_pages(self):
+        PgnImporter(self.database).import_file(PATH_PGN, "Ainceer")
+        conn = self.database.raw_connection()
+        browser = TableBrowser(conn, "%s", 1)
+        pages = list(browser.pages("pgn_data", "Ainceer", datetime(2021, 1, 1)))
+        conn.close()
+        self.assertEqual([[row[0] for row in rows] for rows in pages], [[1]])
+
+    def test_migrate(self):
+        PgnImporter(self.database).import_file(PATH_PGN, "Ainceer")
+        migration = SchemaMigration(self.database, self.config)
+        num_rows = migration.migrate()
+        self.assertEqual(num_rows["pgn_data"], 2)
+        self.assertEqual(migration.migrate(), num_rows)
+        with self.database.connection() as conn:
+            curs = conn.cursor()
+            curs.execute(
+                "insert into pgn_data (username, game_id) values ('x', 'y') returning id"
+            )
+            self.assertEqual(curs.fetchone()[0], 3)
+            curs.close()